@@ -7,9 +7,11 @@ Main script to execute the complete WILD token analysis and generate HTML dashbo
 import os
 import sys
 import json
+import argparse
 import logging
 from datetime import datetime
 from pathlib import Path
+from typing import Sequence
 
 # Add src to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
@@ -18,6 +20,8 @@ from titan_tracker import TitanTracker
 from analysis_functions import WilderAnalyzer
 from titan_dashboard import TitanDashboard
 from price_fetcher import PriceFetcher
+from portfolio_history import PortfolioHistory, lp_unit_value_usd
+from visualization import WilderVisualizer
 
 # Set up logging
 logging.basicConfig(
@@ -38,14 +42,55 @@ def load_existing_data():
         logger.warning(f"Could not load existing data: {e}")
     return None
 
-def run_titan_analysis():
-    """Run the complete Operation Titan analysis"""
+def update_wallet_visualizations(analyzer: WilderAnalyzer, all_data: dict, prices: dict,
+                                 lp_pair_state: dict = None, price_fetcher: PriceFetcher = None) -> str:
+    """
+    Extend the daily portfolio history and refresh the wallet chart pages
+    
+    Args:
+        analyzer: Analyzer holding the transaction table for all_data
+        all_data: Collected wallet data
+        prices: Current prices (WILD, ETH)
+        lp_pair_state: TitanTracker.get_lp_pair_state() output, used to value LP tokens today
+        price_fetcher: Price source for the daily WILD closes
+        
+    Returns:
+        Directory the chart pages were written to
+    """
+    lp_unit = lp_unit_value_usd(lp_pair_state, prices.get('WILD'), prices.get('ETH'))
+    history = PortfolioHistory(price_fetcher).update(analyzer, all_data, lp_unit_value_usd=lp_unit)
+    
+    visualizer = WilderVisualizer()
+    visualizer.save_all_visualizations(
+        analyzer.analyze_wild_token_holdings(all_data),
+        analyzer.analyze_nft_holdings(all_data),
+        analyzer.analyze_lp_positions(all_data),
+        analyzer.calculate_gas_costs(all_data),
+        analyzer.identify_inter_wallet_transfers(all_data),
+        all_data,
+        {**prices, 'LP_EST': lp_unit or 0},
+        portfolio_history=history
+    )
+    return visualizer.output_dir
+
+def run_titan_analysis(report_format: str = 'payload', image_formats: Sequence[str] = (),
+                       render_workers: int = 0):
+    """
+    Run the complete Operation Titan analysis
+    
+    Args:
+        report_format: 'payload' saves a compressed run payload for the report viewer;
+            'html' writes the full standalone dashboard and a JSON data dump
+        image_formats: Also export every chart as static images in these formats
+            (e.g. ['png', 'svg']) to titan_reports/images/<run>; needs kaleido
+        render_workers: Worker processes for rebuilding charts (0 renders in this process)
+    """
     logger.info("Starting Operation Titan Analysis...")
     
     # Initialize components
     tracker = TitanTracker()
     analyzer = WilderAnalyzer()
-    dashboard = TitanDashboard()
+    dashboard = TitanDashboard(render_workers=render_workers)
     price_fetcher = PriceFetcher()
     
     # Step 1: Collect Titan-specific data
@@ -54,6 +99,7 @@ def run_titan_analysis():
     
     # Step 2: Get current prices
     logger.info("Fetching current prices...")
+    current_prices = {}
     try:
         current_prices = price_fetcher.get_current_prices()
         if current_prices and 'WILD' in current_prices:
@@ -61,83 +107,70 @@ def run_titan_analysis():
             titan_data['current_wild_price'] = current_prices['WILD']
             logger.info(f"Current WILD price: ${current_prices['WILD']:.4f}")
     except Exception as e:
+        # The scenario engine falls back to the last historical close
         logger.warning(f"Could not fetch current prices: {e}")
-        titan_data['current_wild_price'] = 0.38  # Fallback price
     
     # Step 3: Load existing wallet data if available
     existing_data = load_existing_data()
+    lp_pair_state = None
     if existing_data:
         logger.info("Using existing wallet analysis data")
-        # Extract WILD balances from existing data
-        wild_balances = existing_data.get('wild_analysis', {})
-        portfolio_exposure = {
-            'total_wild_holdings': wild_balances.get('total_balance', 0),
-            'wild_by_wallet': wild_balances.get('balances_by_wallet', {}),
-            'lp_exposure': existing_data.get('lp_analysis', {}).get('total_lp_tokens', 0) * 0.5,  # 50% of LP is WILD
-            'total_exposure_wild': 0
-        }
-        portfolio_exposure['total_exposure_wild'] = (
-            portfolio_exposure['total_wild_holdings'] + 
-            portfolio_exposure['lp_exposure']
-        )
+        try:
+            lp_pair_state = tracker.get_lp_pair_state()
+            logger.info(f"LP pair reserves pinned at block {lp_pair_state['block']}")
+        except Exception as e:
+            logger.warning(f"Could not read LP pair reserves: {e}")
     else:
-        logger.warning("No existing wallet data found, using placeholder values")
-        portfolio_exposure = analyzer.calculate_portfolio_exposure()
+        logger.warning("No existing wallet data found, portfolio exposure will be empty")
     
     # Step 4: Run Titan impact analysis
     logger.info("Analyzing Operation Titan impact...")
-    titan_impact = analyzer.analyze_titan_impact(titan_data)
-    
-    # Update with actual portfolio data if available
-    if existing_data:
-        titan_impact['portfolio_exposure'] = portfolio_exposure
+    titan_impact = analyzer.analyze_titan_impact(titan_data, existing_data, lp_pair_state)
     
     # Step 5: Generate trading signals
     trading_signals = analyzer.generate_titan_trading_signals(titan_data)
     titan_impact['trading_signals'] = trading_signals
     
-    # Step 6: Update price targets with current price
-    price_targets = titan_impact.get('price_targets', {})
-    price_targets['current_price'] = titan_data.get('current_wild_price', 0.38)
-    
-    # Recalculate targets based on current price
-    current_price = price_targets['current_price']
-    price_impact_pct = titan_data.get('price_impact', {}).get('combined_impact_estimate', 0)
-    
-    price_targets.update({
-        'conservative': current_price * (1 + price_impact_pct / 100 * 0.5),
-        'base_case': current_price * (1 + price_impact_pct / 100),
-        'optimistic': current_price * (1 + price_impact_pct / 100 * 1.5),
-        '1_year_target': current_price * (1 + titan_impact.get('buyback_impact', {}).get('deflationary_rate', 0) / 100)
-    })
-    
-    # Step 7: Generate HTML dashboard
-    logger.info("Generating HTML dashboard...")
-    dashboard_path = dashboard.generate_dashboard(titan_data, titan_impact)
-    
-    # Step 8: Save analysis data
-    output_dir = Path(__file__).parent / 'output' / 'titan_reports'
-    output_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Save raw data
-    data_file = output_dir / f'titan_analysis_data_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
-    with open(data_file, 'w') as f:
-        json.dump({
-            'timestamp': datetime.now().isoformat(),
-            'titan_data': titan_data,
-            'titan_impact': titan_impact,
-            'current_prices': current_prices if 'current_prices' in locals() else {}
-        }, f, indent=2, default=str)
-    
-    # Also save latest version
-    latest_data = output_dir / 'titan_analysis_data_latest.json'
-    with open(latest_data, 'w') as f:
-        json.dump({
-            'timestamp': datetime.now().isoformat(),
-            'titan_data': titan_data,
-            'titan_impact': titan_impact,
-            'current_prices': current_prices if 'current_prices' in locals() else {}
-        }, f, indent=2, default=str)
+    # Step 6: Price targets come from the Monte Carlo scenarios in analyze_titan_impact
+    price_targets = titan_impact['price_targets']
+    
+    # Step 7: Save the report
+    if report_format == 'html':
+        logger.info("Generating HTML dashboard...")
+        dashboard_path = dashboard.generate_dashboard(titan_data, titan_impact)
+    
+        # Save analysis data
+        output_dir = Path(__file__).parent / 'output' / 'titan_reports'
+        output_dir.mkdir(parents=True, exist_ok=True)
+    
+        # Save raw data
+        data_file = output_dir / f'titan_analysis_data_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
+        with open(data_file, 'w') as f:
+            json.dump({
+                'timestamp': datetime.now().isoformat(),
+                'titan_data': titan_data,
+                'titan_impact': titan_impact,
+                'current_prices': current_prices if 'current_prices' in locals() else {}
+            }, f, indent=2, default=str)
+    else:
+        logger.info("Saving report payload...")
+        dashboard_path = dashboard.generate_payload(titan_data, titan_impact, {'current_prices': current_prices})
+    
+    # Step 8: Wallet charts, including the daily portfolio history
+    if existing_data:
+        try:
+            charts_dir = update_wallet_visualizations(analyzer, existing_data, current_prices, lp_pair_state, price_fetcher)
+            logger.info(f"Wallet visualizations saved to: {charts_dir}")
+        except Exception as e:
+            logger.warning(f"Could not update wallet visualizations: {e}")
+    
+    # Step 9: Static chart images for email and archive, exported in one batch
+    if image_formats:
+        try:
+            images = dashboard.export_images(titan_data, titan_impact, image_formats)
+            logger.info(f"Exported {len(images)} charts as {', '.join(image_formats)}")
+        except Exception as e:
+            logger.warning(f"Could not export chart images: {e}")
     
     logger.info(f"Analysis complete! Dashboard saved to: {dashboard_path}")
     
@@ -147,7 +180,7 @@ def run_titan_analysis():
     print("="*60)
     print(f"Current Phase: {titan_data['phase_status']['current_phase']}")
     print(f"Days Since Phase 2: {titan_data['phase_status']['days_since_phase2_greenlit']}")
-    print(f"Current WILD Price: ${titan_data.get('current_wild_price', 0.38):.4f}")
+    print(f"Current WILD Price: ${price_targets['current_price']:.4f}")
     print(f"\nPrice Targets:")
     print(f"  Conservative: ${price_targets['conservative']:.4f}")
     print(f"  Base Case: ${price_targets['base_case']:.4f}")
@@ -163,8 +196,17 @@ def run_titan_analysis():
     return dashboard_path
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the Operation Titan analysis")
+    parser.add_argument('--format', choices=['payload', 'html'], default='payload',
+                        help="Compressed payload for the report viewer (default) or a standalone HTML dashboard")
+    parser.add_argument('--images', nargs='+', choices=['png', 'jpeg', 'webp', 'svg', 'pdf'], default=[],
+                        metavar='FORMAT', help="Also export the charts as static images (png, jpeg, webp, svg, pdf)")
+    parser.add_argument('--render-workers', type=int, default=0, metavar='N',
+                        help="Rebuild charts in N worker processes when enough of them changed (default: in this process)")
+    args = parser.parse_args()
+    
     try:
-        dashboard_path = run_titan_analysis()
+        dashboard_path = run_titan_analysis(args.format, args.images, args.render_workers)
         print(f"\nOpen the dashboard in your browser:")
         print(f"file://{os.path.abspath(dashboard_path)}")
     except Exception as e:
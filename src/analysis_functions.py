@@ -4,13 +4,21 @@ Processes transaction data to extract insights and calculate metrics.
 """
 
 import os
+import sys
 import logging
 from typing import Dict, List, Optional, Tuple, Set, Any
 from datetime import datetime
 from collections import defaultdict
+import numpy as np
 import pandas as pd
 from dotenv import load_dotenv
 
+# Add src to path so sibling modules resolve when imported as src.<module>
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from scenario_engine import ScenarioEngine
+from cost_basis import CostBasisEngine
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -56,6 +64,17 @@ class WilderAnalyzer:
         
         # Reverse mapping for contract identification
         self.address_to_contract = {v: k for k, v in self.contracts.items()}
+        
+        # Monte Carlo price scenarios, created on first use
+        self.scenario_engine = None
+        
+        # WILD lots and PnL behind avg_purchase_price, created on first use
+        self.cost_basis_engine = None
+        
+        # Unified transaction table, rebuilt only when the transaction feeds change
+        self._table_key = None
+        self._table = None
+        self._table_source = None
     
     def is_inter_wallet_transfer(self, from_addr: str, to_addr: str) -> bool:
         """Check if a transfer is between owned wallets."""
@@ -79,8 +98,11 @@ class WilderAnalyzer:
         # Convert value from Wei to ETH
         df['value_eth'] = df['value'] / 1e18
         
-        # Calculate gas cost in ETH
-        df['gas_cost_eth'] = (df['gasUsed'] * df['gasPrice']) / 1e18
+        # Calculate gas cost in ETH (internal transactions carry no gas price of their own)
+        if 'gasUsed' in df.columns and 'gasPrice' in df.columns:
+            df['gas_cost_eth'] = (df['gasUsed'] * df['gasPrice']) / 1e18
+        else:
+            df['gas_cost_eth'] = 0
         
         # Convert timestamp to datetime
         df['timestamp'] = pd.to_datetime(df['timeStamp'], unit='s')
@@ -91,9 +113,8 @@ class WilderAnalyzer:
         df['to_lower'] = df['to'].str.lower()
         
         # Identify inter-wallet transfers
-        df['is_inter_wallet'] = df.apply(
-            lambda x: self.is_inter_wallet_transfer(x['from'], x['to']), axis=1
-        )
+        owned = list(self.wallets.values())
+        df['is_inter_wallet'] = df['from_lower'].isin(owned) & df['to_lower'].isin(owned)
         
         return df
     
@@ -118,9 +139,7 @@ class WilderAnalyzer:
         
         # Convert value based on token decimals
         if 'value' in df.columns:
-            df['value_token'] = df.apply(
-                lambda x: x['value'] / (10 ** x['tokenDecimal']) if pd.notna(x['value']) else 0, axis=1
-            )
+            df['value_token'] = (df['value'] / np.power(10.0, df['tokenDecimal'])).fillna(0)
         else:
             # For NFT transactions, set value_token to 1 (since it's 1 NFT)
             df['value_token'] = 1
@@ -144,28 +163,249 @@ class WilderAnalyzer:
         df['contract_type'] = df['contract_lower'].map(self.address_to_contract)
         
         # Identify inter-wallet transfers
-        df['is_inter_wallet'] = df.apply(
-            lambda x: self.is_inter_wallet_transfer(x['from'], x['to']), axis=1
-        )
+        owned = list(self.wallets.values())
+        df['is_inter_wallet'] = df['from_lower'].isin(owned) & df['to_lower'].isin(owned)
         
         return df
     
-    def analyze_wild_token_holdings(self, all_data: Dict) -> Dict[str, Dict]:
-        """Analyze WILD token holdings and transactions for all wallets."""
+    @staticmethod
+    def _collect_feed(lists: Dict[str, List[Dict]]) -> List[Dict]:
+        """Flatten feed lists, tagging each row with the feed it came from."""
+        rows = []
+        for feed, txns in lists.items():
+            rows.extend({**tx, '_feed': feed} for tx in txns or [])
+        return rows
+    
+    @staticmethod
+    def _dedupe_legs(df: pd.DataFrame, key: List[str]) -> pd.DataFrame:
+        """
+        Drop legs that appear in more than one feed.
+        
+        Identical legs inside one transaction are told apart by their occurrence
+        number within their feed, so a leg reported by several wallets' feeds (or
+        by both an 'all' and a per-contract list) is kept once, while genuinely
+        repeated legs survive.
+        """
+        if df.empty:
+            return df
+        df = df.copy()
+        df['_occurrence'] = df.groupby(['_feed'] + key, dropna=False).cumcount()
+        return df.drop_duplicates(subset=key + ['_occurrence']).drop(columns=['_feed', '_occurrence'])
+    
+    def build_transaction_table(self, all_data: Dict) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Join the normal, internal, ERC20 and ERC721 feeds of every wallet into one model.
+        
+        Returns:
+            (transactions, legs) where transactions is indexed by hash with exactly
+            one gas record per transaction, and legs holds every value transfer
+            (leg_type ETH, INTERNAL, ERC20 or ERC721) once, keyed back by hash
+        """
+        normal_rows, internal_rows, token_rows, nft_rows = [], [], [], []
+        for wallet_name, wallet_data in all_data.items():
+            normal_rows += self._collect_feed({f'{wallet_name}:normal': wallet_data.get('normal_txns', [])})
+            internal_rows += self._collect_feed({f'{wallet_name}:internal': wallet_data.get('internal_txns', [])})
+            token_rows += self._collect_feed({f'{wallet_name}:{name}': txns
+                                              for name, txns in wallet_data.get('token_txns', {}).items()})
+            nft_rows += self._collect_feed({f'{wallet_name}:{name}': txns
+                                            for name, txns in wallet_data.get('nft_txns', {}).items()})
+        
+        legs = []
+        normal = self.process_normal_transactions(normal_rows)
+        if not normal.empty:
+            normal = normal.drop_duplicates(subset=['hash'])
+            failed = normal['isError'].astype(str) == '1' if 'isError' in normal.columns else False
+            eth = normal[(normal['value_eth'] > 0) & ~failed].copy()
+            eth['leg_type'] = 'ETH'
+            eth['amount'] = eth['value_eth']
+            legs.append(eth)
+        
+        internal = self.process_normal_transactions(internal_rows)
+        if not internal.empty:
+            failed = internal['isError'].astype(str) == '1' if 'isError' in internal.columns else False
+            internal = internal[(internal['value_eth'] > 0) & ~failed].copy()
+            internal['gas_cost_eth'] = 0.0
+            internal['leg_type'] = 'INTERNAL'
+            internal['amount'] = internal['value_eth']
+            legs.append(self._dedupe_legs(internal, ['hash', 'from_lower', 'to_lower', 'value']))
+        
+        tokens = self.process_token_transactions(token_rows)
+        if not tokens.empty:
+            tokens['leg_type'] = 'ERC20'
+            tokens['amount'] = tokens['value_token']
+            legs.append(self._dedupe_legs(tokens, ['hash', 'contract_lower', 'from_lower', 'to_lower', 'value']))
+        
+        nfts = self.process_token_transactions(nft_rows, 'ERC721')
+        if not nfts.empty:
+            nfts['tokenID'] = nfts['tokenID'].astype(str)
+            nfts['leg_type'] = 'ERC721'
+            nfts['amount'] = 1.0
+            legs.append(self._dedupe_legs(nfts, ['hash', 'contract_lower', 'from_lower', 'to_lower', 'tokenID']))
+        
+        if not legs:
+            return pd.DataFrame(), pd.DataFrame()
+        
+        legs = pd.concat(legs, ignore_index=True).drop(columns=['_feed'], errors='ignore')
+        sort_keys = ['blockNumber', 'logIndex'] if 'logIndex' in legs.columns else ['blockNumber']
+        if 'logIndex' in legs.columns:
+            legs['logIndex'] = pd.to_numeric(legs['logIndex'], errors='coerce')
+        legs = legs.sort_values(sort_keys, kind='stable').reset_index(drop=True)
+        
+        # One gas record per hash: the sender's own txlist entry is authoritative. The
+        # RPC transfer source has no txlist but attaches each transaction's receipt
+        # (txFrom, gasUsed, gasPrice) to its transfer rows, which covers transactions
+        # an owned wallet sent with a transfer leg. Anything else was sent by someone
+        # else, so no owned wallet paid for it
+        leg_summary = legs.assign(
+            has_nft=legs['leg_type'] == 'ERC721',
+            has_token=legs['leg_type'] == 'ERC20'
+        ).groupby('hash').agg(
+            blockNumber=('blockNumber', 'first'),
+            timestamp=('timestamp', 'first'),
+            leg_count=('leg_type', 'size'),
+            has_nft=('has_nft', 'any'),
+            has_token=('has_token', 'any')
+        )
+        
+        gas_records = []
+        if not normal.empty:
+            gas_records.append(normal.set_index('hash')[['blockNumber', 'timestamp', 'from_lower', 'gas_cost_eth']]
+                               .rename(columns={'from_lower': 'gas_payer'}))
+        if 'txFrom' in legs.columns and 'gasUsed' in legs.columns:
+            sent = legs[legs['txFrom'].str.lower().isin(list(self.wallets.values())) & legs['gasUsed'].notna()]
+            receipts = sent.drop_duplicates(subset=['hash']).set_index('hash')
+            receipts = receipts.assign(gas_payer=receipts['txFrom'].str.lower())
+            receipts = receipts[['blockNumber', 'timestamp', 'gas_payer', 'gas_cost_eth']]
+            if gas_records:
+                receipts = receipts[~receipts.index.isin(gas_records[0].index)]
+            gas_records.append(receipts)
+        
+        if gas_records:
+            gas = pd.concat(gas_records)
+            transactions = gas.join(leg_summary[['leg_count', 'has_nft', 'has_token']], how='outer')
+            transactions = transactions.combine_first(leg_summary[['blockNumber', 'timestamp']])
+        else:
+            transactions = leg_summary.copy()
+            transactions['gas_payer'] = None
+            transactions['gas_cost_eth'] = 0.0
+        
+        transactions['gas_cost_eth'] = transactions['gas_cost_eth'].fillna(0.0)
+        transactions['leg_count'] = transactions['leg_count'].fillna(0).astype(int)
+        transactions['has_nft'] = transactions['has_nft'].fillna(False).astype(bool)
+        transactions['has_token'] = transactions['has_token'].fillna(False).astype(bool)
+        transactions['tx_type'] = np.select(
+            [transactions['has_nft'], transactions['has_token']], ['nft', 'token'], default='normal'
+        )
+        transactions['date'] = pd.to_datetime(transactions['timestamp']).dt.date
+        transactions.index.name = 'hash'
+        
+        return transactions.sort_values('blockNumber', kind='stable'), legs
+    
+    def get_transaction_table(self, all_data: Dict) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Return the unified (transactions, legs) tables, building them once per content of all_data.
+        
+        The memo is keyed on each feed list's identity, length and last hash, so
+        adding a wallet, replacing a feed or appending transactions rebuilds the
+        table without hashing every row on each call.
+        """
+        key = tuple(
+            (wallet_name, feed, self._feed_signature(wallet_data.get(feed)))
+            for wallet_name, wallet_data in all_data.items()
+            for feed in ('normal_txns', 'internal_txns', 'token_txns', 'nft_txns')
+        )
+        if self._table_key != key:
+            self._table = self.build_transaction_table(all_data)
+            self._table_key = key
+        self._table_source = all_data
+        return self._table
+    
+    @staticmethod
+    def _feed_signature(feed: Any) -> Tuple:
+        """Cheap change marker for a feed: (identity, length, last hash) of each of its lists."""
+        if isinstance(feed, dict):
+            return tuple((name, *WilderAnalyzer._feed_signature(txns)) for name, txns in feed.items())
+        if not feed:
+            return (id(feed), 0, None)
+        last = feed[-1]
+        return (id(feed), len(feed), (last.get('hash'), last.get('logIndex')) if isinstance(last, dict) else None)
+    
+    def _wallet_legs(self, legs: pd.DataFrame, wallet_address: str,
+                     leg_type: str, contract: Optional[str] = None) -> pd.DataFrame:
+        """Legs of one type (and optionally one contract) sent or received by a wallet."""
+        if legs.empty:
+            return legs
+        mask = (legs['leg_type'] == leg_type) & (
+            (legs['from_lower'] == wallet_address) | (legs['to_lower'] == wallet_address)
+        )
+        if contract is not None:
+            mask &= legs['contract_lower'] == contract
+        return legs[mask]
+    
+    def build_nft_ownership(self, legs: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Replay ERC721 legs into current owners and hold intervals in one pass.
+        
+        Transfers are sorted once by (block, transaction index, log index); each
+        transfer starts a hold interval for its recipient that ends at the next
+        transfer of the same (contract, tokenID), and the last transfer per token
+        gives its current owner. Intervals are complete for owned wallets; for
+        outside holders they span only between the transfers the feeds observed.
+        
+        Returns:
+            (owners, intervals) where owners has one row per (contract_lower, tokenID)
+        """
+        columns = ['contract_lower', 'contract_type', 'tokenID', 'holder', 'hash',
+                   'start_block', 'start', 'end_block', 'end', 'is_current', 'held_days']
+        nfts = legs[legs['leg_type'] == 'ERC721'].copy() if not legs.empty else pd.DataFrame()
+        if nfts.empty:
+            owners = pd.DataFrame(columns=['contract_lower', 'contract_type', 'tokenID', 'owner',
+                                           'hash', 'acquired_block', 'acquired_at'])
+            return owners, pd.DataFrame(columns=columns)
+        
+        order = [c for c in ('blockNumber', 'transactionIndex', 'logIndex') if c in nfts.columns]
+        for column in order:
+            nfts[column] = pd.to_numeric(nfts[column], errors='coerce')
+        nfts = nfts.sort_values(order, kind='stable')
+        
+        key = ['contract_lower', 'tokenID']
+        grouped = nfts.groupby(key, sort=False)
+        intervals = nfts[key + ['contract_type', 'to_lower', 'hash', 'blockNumber', 'timestamp']].rename(
+            columns={'to_lower': 'holder', 'blockNumber': 'start_block', 'timestamp': 'start'}
+        )
+        intervals['end_block'] = grouped['blockNumber'].shift(-1)
+        intervals['end'] = grouped['timestamp'].shift(-1)
+        intervals['is_current'] = intervals['end'].isna()
+        intervals['held_days'] = (
+            intervals['end'].fillna(pd.Timestamp.now()) - intervals['start']
+        ).dt.total_seconds() / 86400
+        intervals = intervals[columns].reset_index(drop=True)
+        
+        owners = grouped.tail(1)[key + ['contract_type', 'to_lower', 'hash', 'blockNumber', 'timestamp']].rename(
+            columns={'to_lower': 'owner', 'blockNumber': 'acquired_block', 'timestamp': 'acquired_at'}
+        ).reset_index(drop=True)
+        
+        return owners, intervals
+    
+    def analyze_wild_token_holdings(self, all_data: Dict, cost_basis: Optional[Dict[str, Dict]] = None) -> Dict[str, Dict]:
+        """
+        Analyze WILD token holdings and transactions for all wallets.
+        
+        Args:
+            all_data: Collected wallet data
+            cost_basis: CostBasisEngine.update() output; fills the average purchase
+                price and realized/unrealized PnL per wallet (computed if not given)
+        """
         results = {}
+        if cost_basis is None:
+            cost_basis = self.get_cost_basis(all_data)
+        _, legs = self.get_transaction_table(all_data)
         
-        for wallet_name, wallet_data in all_data.items():
+        for wallet_name in all_data:
             wallet_address = self.wallets[wallet_name]
+            df = self._wallet_legs(legs, wallet_address, 'ERC20', self.contracts['wild_token'])
             
-            # Get WILD token transactions
-            wild_txns = wallet_data.get('token_txns', {}).get('wild', [])
-            if not wild_txns:
-                # Try to find WILD transactions in all token transactions
-                all_token_txns = wallet_data.get('token_txns', {}).get('all', [])
-                wild_txns = [tx for tx in all_token_txns 
-                           if tx.get('contractAddress', '').lower() == self.contracts['wild_token']]
-            
-            if not wild_txns:
+            if df.empty:
                 results[wallet_name] = {
                     'current_balance': 0,
                     'total_received': 0,
@@ -177,16 +417,15 @@ class WilderAnalyzer:
                 }
                 continue
             
-            # Process transactions
-            df = self.process_token_transactions(wild_txns)
-            
             # Calculate flows
-            received = df[df['to_lower'] == wallet_address]['value_token'].sum()
-            sent = df[df['from_lower'] == wallet_address]['value_token'].sum()
+            incoming = df['to_lower'] == wallet_address
+            outgoing = df['from_lower'] == wallet_address
+            received = df.loc[incoming, 'value_token'].sum()
+            sent = df.loc[outgoing, 'value_token'].sum()
             
             # Exclude inter-wallet transfers from net calculations
-            external_received = df[(df['to_lower'] == wallet_address) & (~df['is_inter_wallet'])]['value_token'].sum()
-            external_sent = df[(df['from_lower'] == wallet_address) & (~df['is_inter_wallet'])]['value_token'].sum()
+            external_received = df.loc[incoming & ~df['is_inter_wallet'], 'value_token'].sum()
+            external_sent = df.loc[outgoing & ~df['is_inter_wallet'], 'value_token'].sum()
             
             results[wallet_name] = {
                 'current_balance': received - sent,
@@ -197,56 +436,66 @@ class WilderAnalyzer:
                 'net_flow': external_received - external_sent,
                 'transaction_count': len(df),
                 'inter_wallet_transfers': df['is_inter_wallet'].sum(),
+                'avg_purchase_price': cost_basis.get(wallet_name, {}).get('avg_purchase_price', 0),
                 'transactions': df
             }
+            
+            if wallet_name in cost_basis:
+                results[wallet_name]['realized_pnl'] = cost_basis[wallet_name]['realized_pnl']
+                results[wallet_name]['unrealized_pnl'] = cost_basis[wallet_name]['unrealized_pnl']
         
         return results
     
+    def get_cost_basis(self, all_data: Dict) -> Dict[str, Dict]:
+        """Bring the FIFO WILD cost basis up to date; empty if it cannot be computed."""
+        if self.cost_basis_engine is None:
+            self.cost_basis_engine = CostBasisEngine()
+        try:
+            return self.cost_basis_engine.update(self, all_data)
+        except Exception as e:
+            logger.warning(f"Could not compute WILD cost basis, purchase prices stay unknown: {e}")
+            return {}
+    
     def analyze_nft_holdings(self, all_data: Dict) -> Dict[str, Dict]:
         """Analyze NFT holdings and transactions for all wallets."""
         results = {}
+        transactions, legs = self.get_transaction_table(all_data)
+        owners, intervals = self.build_nft_ownership(legs)
         
-        for wallet_name, wallet_data in all_data.items():
+        for wallet_name in all_data:
             wallet_address = self.wallets[wallet_name]
             wallet_results = {}
             
-            # Process each NFT collection
-            nft_data = wallet_data.get('nft_txns', {})
-            
             for collection_name, collection_address in self.contracts.items():
-                if not collection_name.endswith('_token') and not collection_name == 'uniswap_lp':
-                    # Get transactions for this collection
-                    collection_txns = nft_data.get(collection_name, [])
-                    
-                    if not collection_txns:
-                        # Try to find in all NFT transactions
-                        all_nft_txns = nft_data.get('all', [])
-                        collection_txns = [tx for tx in all_nft_txns 
-                                         if tx.get('contractAddress', '').lower() == collection_address]
-                    
-                    if not collection_txns:
-                        continue
-                    
-                    # Process transactions
-                    df = self.process_token_transactions(collection_txns, 'ERC721')
-                    
-                    # Track token IDs
-                    received_tokens = set(df[df['to_lower'] == wallet_address]['tokenID'].unique())
-                    sent_tokens = set(df[df['from_lower'] == wallet_address]['tokenID'].unique())
-                    current_tokens = received_tokens - sent_tokens
-                    
-                    # Calculate gas costs
-                    gas_costs = df[df['to_lower'] == wallet_address]['gas_cost_eth'].sum()
-                    
-                    wallet_results[collection_name] = {
-                        'current_holdings': len(current_tokens),
-                        'token_ids': sorted(list(current_tokens)),
-                        'total_received': len(received_tokens),
-                        'total_sent': len(sent_tokens),
-                        'gas_cost_eth': gas_costs,
-                        'transaction_count': len(df),
-                        'transactions': df
-                    }
+                if collection_name.endswith('_token') or collection_name == 'uniswap_lp':
+                    continue
+                
+                df = self._wallet_legs(legs, wallet_address, 'ERC721', collection_address)
+                if df.empty:
+                    continue
+                
+                # Current holdings are the tokens whose last transfer went to this wallet
+                in_collection = owners['contract_lower'] == collection_address
+                current_tokens = owners.loc[in_collection & (owners['owner'] == wallet_address), 'tokenID']
+                received_tokens = df.loc[df['to_lower'] == wallet_address, 'tokenID'].unique()
+                sent_tokens = df.loc[df['from_lower'] == wallet_address, 'tokenID'].unique()
+                
+                # Gas is charged once per transaction that delivered tokens, when this wallet sent it
+                received_hashes = df.loc[df['to_lower'] == wallet_address, 'hash'].unique()
+                paid = transactions.loc[received_hashes]
+                gas_costs = paid.loc[paid['gas_payer'] == wallet_address, 'gas_cost_eth'].sum()
+                
+                wallet_results[collection_name] = {
+                    'current_holdings': len(current_tokens),
+                    'token_ids': sorted(current_tokens.tolist()),
+                    'total_received': len(received_tokens),
+                    'total_sent': len(sent_tokens),
+                    'gas_cost_eth': gas_costs,
+                    'transaction_count': len(df),
+                    'hold_intervals': intervals[(intervals['contract_lower'] == collection_address) &
+                                                (intervals['holder'] == wallet_address)],
+                    'transactions': df
+                }
             
             results[wallet_name] = wallet_results
         
@@ -255,19 +504,13 @@ class WilderAnalyzer:
     def analyze_lp_positions(self, all_data: Dict) -> Dict[str, Dict]:
         """Analyze Uniswap LP token positions for all wallets."""
         results = {}
+        _, legs = self.get_transaction_table(all_data)
         
-        for wallet_name, wallet_data in all_data.items():
+        for wallet_name in all_data:
             wallet_address = self.wallets[wallet_name]
+            df = self._wallet_legs(legs, wallet_address, 'ERC20', self.contracts['uniswap_lp'])
             
-            # Get LP token transactions
-            lp_txns = wallet_data.get('token_txns', {}).get('uniswap_lp', [])
-            if not lp_txns:
-                # Try to find LP transactions in all token transactions
-                all_token_txns = wallet_data.get('token_txns', {}).get('all', [])
-                lp_txns = [tx for tx in all_token_txns 
-                         if tx.get('contractAddress', '').lower() == self.contracts['uniswap_lp']]
-            
-            if not lp_txns:
+            if df.empty:
                 results[wallet_name] = {
                     'current_balance': 0,
                     'total_minted': 0,
@@ -278,12 +521,9 @@ class WilderAnalyzer:
                 }
                 continue
             
-            # Process transactions
-            df = self.process_token_transactions(lp_txns)
-            
             # Calculate flows
-            minted = df[df['to_lower'] == wallet_address]['value_token'].sum()
-            burned = df[df['from_lower'] == wallet_address]['value_token'].sum()
+            minted = df.loc[df['to_lower'] == wallet_address, 'value_token'].sum()
+            burned = df.loc[df['from_lower'] == wallet_address, 'value_token'].sum()
             
             results[wallet_name] = {
                 'current_balance': minted - burned,
@@ -297,37 +537,43 @@ class WilderAnalyzer:
         return results
     
     def calculate_gas_costs(self, all_data: Dict) -> Dict[str, Dict]:
-        """Calculate total gas costs by wallet and transaction type."""
+        """
+        Calculate total gas costs by wallet and transaction type.
+        
+        Each transaction is charged once, to the wallet that sent it, under the
+        type of its richest leg (an NFT leg makes it 'nft_txns', else a token leg
+        makes it 'token_txns', else 'normal_txns').
+        
+        Gas comes from the normal txlist, or for the RPC source from the receipts
+        attached to its transfer rows. A wallet with transfers but neither (e.g. a
+        transfer cache written before receipts were kept) gets gas_known False
+        rather than a silent zero.
+        """
         results = {}
+        transactions, _ = self.get_transaction_table(all_data)
         
-        for wallet_name, wallet_data in all_data.items():
+        by_payer = pd.Series(dtype=float)
+        if not transactions.empty:
+            by_payer = transactions.groupby(['gas_payer', 'tx_type'])['gas_cost_eth'].sum()
+        
+        for wallet_name in all_data:
+            wallet_address = self.wallets[wallet_name]
             gas_costs = {
-                'normal_txns': 0,
-                'token_txns': 0,
-                'nft_txns': 0,
-                'total': 0
+                'normal_txns': float(by_payer.get((wallet_address, 'normal'), 0)),
+                'token_txns': float(by_payer.get((wallet_address, 'token'), 0)),
+                'nft_txns': float(by_payer.get((wallet_address, 'nft'), 0))
             }
+            gas_costs['total'] = sum(gas_costs.values())
             
-            # Normal transactions
-            normal_txns = wallet_data.get('normal_txns', [])
-            if normal_txns:
-                df = self.process_normal_transactions(normal_txns)
-                # Only count gas for transactions from this wallet
-                gas_costs['normal_txns'] = df[df['from_lower'] == self.wallets[wallet_name]]['gas_cost_eth'].sum()
-            
-            # Token transactions
-            all_token_txns = wallet_data.get('token_txns', {}).get('all', [])
-            if all_token_txns:
-                df = self.process_token_transactions(all_token_txns)
-                gas_costs['token_txns'] = df[df['from_lower'] == self.wallets[wallet_name]]['gas_cost_eth'].sum()
-            
-            # NFT transactions
-            all_nft_txns = wallet_data.get('nft_txns', {}).get('all', [])
-            if all_nft_txns:
-                df = self.process_token_transactions(all_nft_txns, 'ERC721')
-                gas_costs['nft_txns'] = df[df['from_lower'] == self.wallets[wallet_name]]['gas_cost_eth'].sum()
-            
-            gas_costs['total'] = sum([gas_costs['normal_txns'], gas_costs['token_txns'], gas_costs['nft_txns']])
+            wallet_data = all_data[wallet_name]
+            transfer_rows = [tx for feed in ('token_txns', 'nft_txns')
+                             for tx in wallet_data.get(feed, {}).get('all', [])]
+            has_receipts = bool(transfer_rows) and all('txFrom' in tx and 'gasUsed' in tx for tx in transfer_rows)
+            has_transfers = bool(transfer_rows) or bool(wallet_data.get('internal_txns'))
+            gas_costs['gas_known'] = bool(wallet_data.get('normal_txns')) or has_receipts or not has_transfers
+            if not gas_costs['gas_known']:
+                logger.warning(f"No normal transactions or receipts for {wallet_name}; "
+                               f"its gas costs are unknown, not zero")
             
             results[wallet_name] = gas_costs
         
@@ -335,43 +581,28 @@ class WilderAnalyzer:
     
     def identify_inter_wallet_transfers(self, all_data: Dict) -> pd.DataFrame:
         """Identify all transfers between owned wallets."""
-        inter_wallet_txns = []
+        _, legs = self.get_transaction_table(all_data)
+        if legs.empty:
+            return pd.DataFrame()
         
-        for wallet_name, wallet_data in all_data.items():
-            # Check normal transactions
-            normal_txns = wallet_data.get('normal_txns', [])
-            if normal_txns:
-                df = self.process_normal_transactions(normal_txns)
-                inter_wallet = df[df['is_inter_wallet']].copy()
-                inter_wallet['transfer_type'] = 'ETH'
-                inter_wallet['value'] = inter_wallet['value_eth']
-                inter_wallet_txns.append(inter_wallet[['hash', 'from', 'to', 'value', 'transfer_type', 'timestamp']])
-            
-            # Check token transactions
-            all_token_txns = wallet_data.get('token_txns', {}).get('all', [])
-            if all_token_txns:
-                df = self.process_token_transactions(all_token_txns)
-                inter_wallet = df[df['is_inter_wallet']].copy()
-                inter_wallet['transfer_type'] = df['tokenSymbol'].fillna('Unknown Token')
-                inter_wallet['value'] = inter_wallet['value_token']
-                inter_wallet_txns.append(inter_wallet[['hash', 'from', 'to', 'value', 'transfer_type', 'timestamp']])
-            
-            # Check NFT transactions
-            all_nft_txns = wallet_data.get('nft_txns', {}).get('all', [])
-            if all_nft_txns:
-                df = self.process_token_transactions(all_nft_txns, 'ERC721')
-                inter_wallet = df[df['is_inter_wallet']].copy()
-                inter_wallet['transfer_type'] = 'NFT: ' + df['tokenName'].fillna('Unknown')
-                inter_wallet['value'] = inter_wallet['tokenID']
-                inter_wallet_txns.append(inter_wallet[['hash', 'from', 'to', 'value', 'transfer_type', 'timestamp']])
-        
-        if inter_wallet_txns:
-            result = pd.concat(inter_wallet_txns, ignore_index=True)
-            # Remove duplicates (same transaction appears in multiple wallet data)
-            result = result.drop_duplicates(subset=['hash'])
-            return result.sort_values('timestamp')
-        
-        return pd.DataFrame()
+        inter_wallet = legs[legs['is_inter_wallet']].copy()
+        if inter_wallet.empty:
+            return pd.DataFrame()
+        
+        # Legs are already unique, so several transfers within one transaction are all kept
+        is_eth = inter_wallet['leg_type'].isin(['ETH', 'INTERNAL'])
+        is_nft = inter_wallet['leg_type'] == 'ERC721'
+        symbols = inter_wallet.get('tokenSymbol', pd.Series(index=inter_wallet.index, dtype=object))
+        names = inter_wallet.get('tokenName', pd.Series(index=inter_wallet.index, dtype=object))
+        
+        inter_wallet['transfer_type'] = np.where(
+            is_eth, 'ETH', np.where(is_nft, 'NFT: ' + names.fillna('Unknown'), symbols.fillna('Unknown Token'))
+        )
+        inter_wallet['value'] = inter_wallet['amount'].astype(object)
+        if 'tokenID' in inter_wallet.columns:
+            inter_wallet.loc[is_nft, 'value'] = inter_wallet.loc[is_nft, 'tokenID']
+        
+        return inter_wallet[['hash', 'from', 'to', 'value', 'transfer_type', 'timestamp']].sort_values('timestamp')
     
     def create_summary_report(self, all_data: Dict, wild_holdings: Dict, 
                             nft_holdings: Dict, lp_positions: Dict, 
@@ -414,10 +645,11 @@ class WilderAnalyzer:
         
         return summary
     
-    def analyze_titan_impact(self, titan_data: Dict[str, Any]) -> Dict[str, Any]:
+    def analyze_titan_impact(self, titan_data: Dict[str, Any], all_data: Optional[Dict] = None,
+                             lp_pair_state: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Analyze Operation Titan's impact on WILD token and portfolio"""
         analysis = {
-            'portfolio_exposure': self.calculate_portfolio_exposure(),
+            'portfolio_exposure': self.calculate_portfolio_exposure(all_data, lp_pair_state),
             'buyback_impact': self.assess_buyback_impact(titan_data),
             'price_targets': self.calculate_price_targets(titan_data),
             'risk_assessment': self.assess_titan_risks(titan_data)
@@ -425,25 +657,59 @@ class WilderAnalyzer:
         
         return analysis
     
-    def calculate_portfolio_exposure(self) -> Dict[str, Any]:
-        """Calculate portfolio's exposure to WILD token across all wallets"""
+    def calculate_portfolio_exposure(self, all_data: Optional[Dict] = None,
+                                     lp_pair_state: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Calculate the portfolio's exposure to WILD across all wallets.
+        
+        Each wallet's LP tokens are decomposed into their share of the pair's
+        WILD and ETH reserves (share = LP balance / LP totalSupply).
+        
+        Args:
+            all_data: Collected wallet data (defaults to the data behind the cached transaction table)
+            lp_pair_state: TitanTracker.get_lp_pair_state() output; without it LP tokens are not decomposed
+        """
         exposure = {
             'total_wild_holdings': 0,
             'wild_by_wallet': {},
             'lp_exposure': 0,
+            'lp_underlying_eth': 0,
+            'lp_by_wallet': {},
+            'lp_pair_block': lp_pair_state.get('block') if lp_pair_state else None,
             'total_exposure_wild': 0
         }
         
-        # Get current WILD holdings from previous analysis
-        for wallet_name, wallet_addr in self.wallets.items():
-            # This would use cached data from analyze_wild_token_transactions
-            wild_balance = 0  # Placeholder - would get from actual data
+        all_data = all_data if all_data is not None else self._table_source
+        if all_data is None:
+            logger.warning("No wallet data available for portfolio exposure")
+            return exposure
+        
+        wild_holdings = self.analyze_wild_token_holdings(all_data)
+        lp_positions = self.analyze_lp_positions(all_data)
+        
+        for wallet_name in all_data:
+            wild_balance = wild_holdings[wallet_name]['current_balance']
             exposure['wild_by_wallet'][wallet_name] = wild_balance
             exposure['total_wild_holdings'] += wild_balance
+            
+            lp_balance = lp_positions[wallet_name]['current_balance']
+            pool_share = 0.0
+            if lp_pair_state and lp_pair_state['total_supply'] > 0:
+                pool_share = lp_balance / lp_pair_state['total_supply']
+            
+            position = {
+                'lp_tokens': lp_balance,
+                'pool_share': pool_share,
+                'underlying_wild': pool_share * lp_pair_state['wild_reserve'] if lp_pair_state else 0,
+                'underlying_eth': pool_share * lp_pair_state['eth_reserve'] if lp_pair_state else 0
+            }
+            exposure['lp_by_wallet'][wallet_name] = position
+            exposure['lp_exposure'] += position['underlying_wild']
+            exposure['lp_underlying_eth'] += position['underlying_eth']
+        
+        if lp_pair_state is None and any(p['lp_tokens'] > 0 for p in exposure['lp_by_wallet'].values()):
+            logger.warning("LP pair state not supplied; LP tokens excluded from WILD exposure")
         
-        # Add LP token exposure (50% of LP value is WILD)
-        # This would calculate from LP positions
-        exposure['lp_exposure'] = 0  # Placeholder
         exposure['total_exposure_wild'] = exposure['total_wild_holdings'] + exposure['lp_exposure']
         
         return exposure
@@ -490,26 +756,36 @@ class WilderAnalyzer:
         
         return completion
     
-    def calculate_price_targets(self, titan_data: Dict[str, Any]) -> Dict[str, float]:
-        """Calculate potential price targets based on Operation Titan mechanics"""
-        current_price = 0.38  # Would get from price data
-        
-        # Conservative, base, and optimistic scenarios
-        price_impact_pct = titan_data.get('price_impact', {}).get('combined_impact_estimate', 0)
-        
-        targets = {
-            'current_price': current_price,
-            'conservative': current_price * (1 + price_impact_pct / 100 * 0.5),
-            'base_case': current_price * (1 + price_impact_pct / 100),
-            'optimistic': current_price * (1 + price_impact_pct / 100 * 1.5),
-            'methodology': 'Based on supply reduction and estimated market impact'
+    def calculate_price_targets(self, titan_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Calculate price targets from Monte Carlo scenarios of Operation Titan mechanics.
+        
+        Conservative, base and optimistic are the 25th, 50th and 75th percentile
+        prices at the first horizon (the buyback execution window); the 1 year
+        target is the median at 365 days.
+        """
+        if self.scenario_engine is None:
+            self.scenario_engine = ScenarioEngine()
+        
+        completion = self.calculate_buyback_completion(titan_data).get('overall', 0)
+        simulation = self.scenario_engine.price_targets(
+            titan_data, current_price=titan_data.get('current_wild_price'), completion_pct=completion
+        )
+        scenarios = simulation['scenarios']
+        near = scenarios[min(scenarios)]['percentiles']
+        year = scenarios.get(365, scenarios[max(scenarios)])['percentiles']
+        
+        return {
+            'current_price': simulation['current_price'],
+            'conservative': near['p25'],
+            'base_case': near['p50'],
+            'optimistic': near['p75'],
+            '1_year_target': year['p50'],
+            'scenarios': scenarios,
+            'buyback_impact_pct': simulation['buyback_impact_pct'],
+            'methodology': (f"{simulation['n_paths']:,} bootstrapped historical return paths "
+                            f"plus remaining buyback impact (seed {simulation['seed']})")
         }
-        
-        # Add longer-term targets based on deflationary mechanics
-        annual_deflation = self.calculate_deflationary_rate(titan_data.get('supply_dynamics', {}))
-        targets['1_year_target'] = current_price * (1 + annual_deflation / 100)
-        
-        return targets
     
     def assess_titan_risks(self, titan_data: Dict[str, Any]) -> Dict[str, Any]:
         """Assess risks related to Operation Titan execution"""
@@ -0,0 +1,238 @@
+"""
+Historical backtester for the Operation Titan trading signals.
+Replays the bundled daily WILD price history and evaluates the accumulate rule
+of WilderAnalyzer.generate_titan_trading_signals (price below the conservative
+target while buybacks are incomplete) for every point of a parameter grid.
+Signals are evaluated as NumPy matrices (days x parameter sets) and grid chunks
+are spread over a process pool.
+"""
+
+import os
+import sys
+import logging
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Add src to path so sibling modules resolve when imported as src.<module>
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from price_fetcher import PriceFetcher
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Titan buyback program from the first OTC purchase to the Phase 2 deadline (TitanTracker.phase_dates)
+BUYBACK_SCHEDULE = (datetime(2024, 1, 1), datetime(2024, 8, 4))
+
+PARAMETERS = ['discount', 'lookback', 'completion_level', 'hold_days']
+
+METRICS = ['total_return', 'annualized_return', 'max_drawdown', 'hit_rate', 'trades', 'exposure']
+
+# Price history shared with pool workers, set once per process by _init_worker
+_close: Optional[np.ndarray] = None
+_completion: Optional[np.ndarray] = None
+
+
+def _init_worker(close: np.ndarray, completion: np.ndarray):
+    """Receive the price history once per worker instead of once per chunk."""
+    global _close, _completion
+    _close, _completion = close, completion
+
+
+def _rolling_mean(close: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean over window days (NaN until the window is full)."""
+    prefix = np.concatenate([[0.0], np.cumsum(close)])
+    out = np.full(len(close), np.nan)
+    out[window - 1:] = (prefix[window:] - prefix[:-window]) / window
+    return out
+
+
+def evaluate_grid(close: np.ndarray, completion: np.ndarray, params: np.ndarray) -> np.ndarray:
+    """
+    Evaluate the accumulate rule for a block of parameter sets.
+
+    A day signals 'accumulate' when the close is below the trailing mean less the
+    discount (the conservative target) and modeled buyback completion is below the
+    completion level. Each signal keeps the position long for hold_days; the
+    position taken at a close earns the next day's return.
+
+    Args:
+        close: Daily closes
+        completion: Modeled buyback completion (percent) for each day
+        params: Rows of (discount, lookback, completion_level, hold_days)
+
+    Returns:
+        Array with one row of METRICS per parameter set
+    """
+    n_days, n_sets = len(close), len(params)
+    discount, lookback, level, hold = params[:, 0], params[:, 1].astype(int), params[:, 2], params[:, 3].astype(int)
+
+    # Conservative target per (day, set); the trailing mean is computed once per distinct lookback
+    target = np.empty((n_days, n_sets))
+    for window in np.unique(lookback):
+        columns = lookback == window
+        target[:, columns] = _rolling_mean(close, window)[:, None] * (1 - discount[columns])
+    with np.errstate(invalid='ignore'):
+        signal = (close[:, None] < target) & (completion[:, None] < level)
+
+    # Long while any signal fired within the last hold_days days
+    fired = np.vstack([np.zeros((1, n_sets)), np.cumsum(signal, axis=0)])
+    rows = np.arange(1, n_days + 1)[:, None]
+    position = fired[rows, np.arange(n_sets)] - fired[np.maximum(rows - hold, 0), np.arange(n_sets)] > 0
+
+    daily_return = np.diff(close) / close[:-1]
+    strategy = position[:-1] * daily_return[:, None]
+    equity = np.cumprod(1 + strategy, axis=0)
+    drawdown = equity / np.maximum.accumulate(np.maximum(equity, 1.0), axis=0) - 1
+
+    # Hit rate: signals followed by a higher close hold_days later
+    ahead = np.minimum(np.arange(n_days)[:, None] + hold, n_days - 1)
+    forward = close[ahead] / close[:, None] - 1
+    scored = signal & (np.arange(n_days)[:, None] + hold < n_days)
+    hits = (scored & (forward > 0)).sum(axis=0)
+    signals = scored.sum(axis=0)
+
+    total = equity[-1] - 1
+    years = (n_days - 1) / 365
+    entries = position & ~np.vstack([np.zeros((1, n_sets), dtype=bool), position[:-1]])
+
+    return np.column_stack([
+        total,
+        np.power(1 + total, 1 / years) - 1 if years > 0 else total,
+        drawdown.min(axis=0),
+        np.divide(hits, signals, out=np.full(n_sets, np.nan), where=signals > 0),
+        entries.sum(axis=0),
+        position.mean(axis=0)
+    ])
+
+
+def _evaluate_chunk(params: np.ndarray) -> np.ndarray:
+    """Pool entry point: evaluate a chunk against the worker's price history."""
+    return evaluate_grid(_close, _completion, params)
+
+
+class SignalBacktester:
+    """Sweeps the Titan accumulate rule over a parameter grid on historical prices."""
+
+    def __init__(self, price_fetcher: Optional[PriceFetcher] = None,
+                 schedule: Tuple[datetime, datetime] = BUYBACK_SCHEDULE,
+                 max_workers: Optional[int] = None, chunk_size: int = 250):
+        """
+        Initialize the backtester.
+
+        Args:
+            price_fetcher: Source of the bundled daily WILD history
+            schedule: Buyback start and end; completion is modeled as linear in between
+            max_workers: Process pool size (defaults to the CPU count)
+            chunk_size: Parameter sets per pool task
+        """
+        self.price_fetcher = price_fetcher or PriceFetcher()
+        self.schedule = schedule
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+
+    def load_history(self) -> pd.Series:
+        """Daily WILD closes from the bundled history."""
+        series = self.price_fetcher.load_price_series('WILD')
+        return series.resample('D').last().dropna()
+
+    def completion_curve(self, index: pd.DatetimeIndex) -> np.ndarray:
+        """Modeled buyback completion (percent) on each day of the index.
+
+        There is no per-day record of historical DAO purchases, so completion is
+        assumed to rise linearly from 0 at the schedule start to 100 at its end.
+        """
+        start, end = (pd.Timestamp(d) for d in self.schedule)
+        elapsed = (index - start) / (end - start)
+        return np.clip(np.asarray(elapsed, dtype=float), 0, 1) * 100
+
+    @staticmethod
+    def parameter_grid(discounts: Sequence[float] = tuple(np.round(np.arange(0, 0.31, 0.02), 2)),
+                       lookbacks: Sequence[int] = (7, 14, 21, 30, 45, 60, 90, 120),
+                       completion_levels: Sequence[float] = (25, 50, 75, 100, 101),
+                       hold_days: Sequence[int] = (1, 3, 7, 14, 30, 60)) -> pd.DataFrame:
+        """
+        Cartesian product of rule parameters.
+
+        Args:
+            discounts: Fraction below the trailing mean that counts as below the conservative target
+            lookbacks: Trailing mean windows in days
+            completion_levels: Accumulate only while completion is below this percent
+                (101 ignores completion entirely)
+            hold_days: Days a signal keeps the position open
+        """
+        return pd.DataFrame(list(itertools.product(discounts, lookbacks, completion_levels, hold_days)),
+                            columns=PARAMETERS)
+
+    def run(self, grid: Optional[pd.DataFrame] = None, start: Optional[str] = None,
+            end: Optional[str] = None) -> pd.DataFrame:
+        """
+        Backtest every parameter set in the grid.
+
+        Args:
+            grid: Parameter sets (defaults to parameter_grid())
+            start: First day of the replay
+            end: Last day of the replay
+
+        Returns:
+            Grid with METRICS columns, best total return first; the buy-and-hold
+            return for the same period is in the 'benchmark_return' attribute
+        """
+        grid = self.parameter_grid() if grid is None else grid
+        history = self.load_history().loc[start:end]
+        if len(history) < 2:
+            raise ValueError("Not enough price history to backtest")
+
+        close = history.to_numpy(dtype=float)
+        completion = self.completion_curve(history.index)
+        params = grid[PARAMETERS].to_numpy(dtype=float)
+        chunks = [params[i:i + self.chunk_size] for i in range(0, len(params), self.chunk_size)]
+
+        if self.max_workers > 1 and len(chunks) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.max_workers, len(chunks)),
+                                     initializer=_init_worker, initargs=(close, completion)) as pool:
+                metrics = np.vstack(list(pool.map(_evaluate_chunk, chunks)))
+        else:
+            metrics = np.vstack([evaluate_grid(close, completion, chunk) for chunk in chunks])
+
+        results = grid.reset_index(drop=True).copy()
+        results[METRICS] = metrics
+        results['trades'] = results['trades'].astype(int)
+        results = results.sort_values('total_return', ascending=False).reset_index(drop=True)
+        results.attrs['benchmark_return'] = float(close[-1] / close[0] - 1)
+        results.attrs['period'] = (history.index[0].date().isoformat(), history.index[-1].date().isoformat())
+
+        logger.info(f"Backtested {len(results):,} parameter sets over {len(close)} days "
+                    f"({results.attrs['period'][0]} to {results.attrs['period'][1]})")
+        return results
+
+    def summary(self, results: pd.DataFrame, top_n: int = 10) -> Dict[str, Any]:
+        """Best parameter sets and grid-wide statistics."""
+        return {
+            'period': results.attrs.get('period'),
+            'benchmark_return': results.attrs.get('benchmark_return'),
+            'parameter_sets': len(results),
+            'beat_benchmark_pct': float((results['total_return'] > results.attrs.get('benchmark_return', 0)).mean() * 100),
+            'median_return': float(results['total_return'].median()),
+            'median_max_drawdown': float(results['max_drawdown'].median()),
+            'top': results.head(top_n).to_dict('records')
+        }
+
+
+if __name__ == "__main__":
+    backtester = SignalBacktester()
+    results = backtester.run()
+    summary = backtester.summary(results, top_n=5)
+    print(f"Period: {summary['period'][0]} to {summary['period'][1]}")
+    print(f"Buy and hold: {summary['benchmark_return']:.1%}")
+    print(f"Parameter sets beating buy and hold: {summary['beat_benchmark_pct']:.1f}%")
+    print(results.head(10).to_string())
@@ -0,0 +1,240 @@
+"""
+Fingerprint-keyed cache for rendered chart fragments.
+Each chart is keyed by a stable hash of its builder's code and of the inputs it
+is given; the rendered HTML is kept on disk, so a refresh only rebuilds charts
+whose inputs actually changed.
+"""
+
+import os
+import types
+import hashlib
+import logging
+from concurrent.futures import Executor
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def _feed(digest: 'hashlib._Hash', obj: Any):
+    """Feed a canonical serialization of obj into the digest."""
+    if isinstance(obj, (np.generic,)):
+        obj = obj.item()
+
+    if obj is None or isinstance(obj, (bool, int, str)):
+        digest.update(f"{type(obj).__name__}:{obj!r};".encode())
+    elif isinstance(obj, float):
+        digest.update(f"float:{obj!r};".encode())
+    elif isinstance(obj, (datetime, date)):
+        digest.update(f"time:{obj.isoformat()};".encode())
+    elif isinstance(obj, dict):
+        digest.update(f"dict:{len(obj)}{{".encode())
+        for key in sorted(obj, key=str):
+            _feed(digest, str(key))
+            _feed(digest, obj[key])
+        digest.update(b"}")
+    elif isinstance(obj, (list, tuple)):
+        digest.update(f"seq:{len(obj)}[".encode())
+        for item in obj:
+            _feed(digest, item)
+        digest.update(b"]")
+    elif isinstance(obj, (set, frozenset)):
+        _feed(digest, sorted(obj, key=repr))
+    elif isinstance(obj, (pd.DataFrame, pd.Series)):
+        frame = obj.to_frame() if isinstance(obj, pd.Series) else obj
+        digest.update(f"frame:{list(map(str, frame.columns))}:{list(map(str, frame.dtypes))};".encode())
+        try:
+            digest.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+        except TypeError:
+            # Cells holding lists or dicts are not hashable by pandas
+            digest.update(frame.to_json(date_format='iso', default_handler=str).encode())
+    elif isinstance(obj, np.ndarray):
+        if obj.dtype == object:
+            _feed(digest, obj.tolist())
+        else:
+            digest.update(f"array:{obj.dtype}:{obj.shape};".encode())
+            digest.update(np.ascontiguousarray(obj).tobytes())
+    else:
+        digest.update(f"{type(obj).__name__}:{obj!r};".encode())
+
+
+def _feed_code(digest: 'hashlib._Hash', code: types.CodeType):
+    """Feed a function's bytecode and constants, recursing into nested code objects."""
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _feed_code(digest, const)
+        else:
+            digest.update(repr(const).encode())
+
+
+def fingerprint(*parts: Any) -> str:
+    """Stable hex digest of arbitrary nested inputs."""
+    digest = hashlib.sha256()
+    for part in parts:
+        _feed(digest, part)
+    return digest.hexdigest()
+
+
+def builder_fingerprint(builder: Callable) -> str:
+    """Digest of a chart builder's code, so editing a builder invalidates its entries."""
+    function = getattr(builder, '__func__', builder)
+    digest = hashlib.sha256(function.__qualname__.encode())
+    _feed_code(digest, function.__code__)
+    return digest.hexdigest()
+
+
+def _serialize(result: Any, name: str, html_options: Optional[Dict[str, Any]]) -> str:
+    """
+    Builders return HTML directly or a figure to serialize with to_html(**html_options).
+    Fragments (full_html=False) get the chart name as their div id unless one is given.
+    """
+    if html_options is None:
+        return result
+    if html_options.get('full_html') is False:
+        html_options = {'div_id': name, **html_options}
+    return result.to_html(**html_options)
+
+
+# Fewer misses than this build in-process even when an executor is given. A single
+# miss gains nothing from a worker; from two on, whether the pool pays off depends
+# on the cores available, which is why callers keep it off unless asked for
+PARALLEL_MIN_MISSES = 2
+
+# Chart owners rebuilt inside pool workers, one per (class, output_dir)
+_worker_owners: Dict[Tuple[type, str], Any] = {}
+
+
+def build_fragment(owner_cls: type, output_dir: str, name: str, method: str, args: Tuple[Any, ...],
+                   html_options: Optional[Dict[str, Any]] = None) -> str:
+    """Pool entry point: build one chart in a worker and return its serialized fragment."""
+    owner = _worker_owners.get((owner_cls, output_dir))
+    if owner is None:
+        owner = _worker_owners[(owner_cls, output_dir)] = owner_cls(output_dir)
+    return _serialize(getattr(owner, method)(*args), name, html_options)
+
+
+class ChartCache:
+    """On-disk store of rendered chart fragments keyed by input fingerprint."""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_entries: int = 500):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory for rendered fragments
+            max_entries: Fragments kept by prune(), least recently used dropped first
+        """
+        if cache_dir is None:
+            cache_dir = Path(__file__).parent.parent / 'data' / 'cache' / 'charts'
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def key(self, name: str, builder: Callable, args: Sequence[Any], extra: Sequence[Any] = ()) -> str:
+        """Cache key for a chart built by builder(*args); extra covers implicit inputs."""
+        return fingerprint(name, builder_fingerprint(builder), list(args), list(extra))
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.html"
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a cached fragment, marking it as recently used."""
+        path = self._path(key)
+        try:
+            html = path.read_text(encoding='utf-8')
+        except FileNotFoundError:
+            return None
+        os.utime(path)
+        return html
+
+    def put(self, key: str, html: str):
+        """Store a fragment atomically."""
+        path = self._path(key)
+        partial = path.with_suffix('.tmp')
+        partial.write_text(html, encoding='utf-8')
+        os.replace(partial, path)
+
+    def render(self, name: str, builder: Callable, args: Sequence[Any], extra: Sequence[Any] = (),
+               html_options: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Return the fragment for builder(*args), building it only on a cache miss.
+
+        Args:
+            name: Chart name (part of the key)
+            builder: Chart builder
+            args: Builder arguments; everything the chart depends on
+            extra: Implicit inputs such as today's date or the color scheme
+            html_options: to_html() keyword arguments when the builder returns a figure
+        """
+        return self.render_many([(name, builder, args, extra)], html_options)[name]
+
+    def render_many(self, charts: Sequence[Tuple[str, Callable, Sequence[Any], Sequence[Any]]],
+                    html_options: Optional[Dict[str, Any]] = None,
+                    executor: Optional[Executor] = None,
+                    min_parallel: int = PARALLEL_MIN_MISSES) -> Dict[str, str]:
+        """
+        Render several charts, building the cache misses on an executor when one is
+        given and there are at least min_parallel of them.
+
+        Builders must be methods of an object constructible as type(owner)(owner.output_dir),
+        which is how worker processes rebuild them; only the chart name, method name and
+        arguments cross the process boundary, and the serialized fragment comes back.
+
+        Args:
+            charts: (name, builder, args, extra) tuples as for render()
+            html_options: to_html() keyword arguments when builders return figures
+            executor: Process pool for the misses (built in this process when None)
+            min_parallel: Fewest misses worth sending to the executor
+
+        Returns:
+            Fragments by chart name, in input order
+        """
+        keys, fragments, pending, misses = {}, {}, {}, []
+        for name, builder, args, extra in charts:
+            # Serialization options shape the fragment too
+            keys[name] = self.key(name, builder, args, [extra, html_options])
+            html = self.get(keys[name])
+            if html is not None:
+                self.stats['hits'] += 1
+                fragments[name] = html
+            else:
+                misses.append((name, builder, args))
+
+        self.stats['misses'] += len(misses)
+        # A threshold above the chart count still lets a full rebuild use the pool
+        if len(misses) < min(min_parallel, len(charts)):
+            executor = None
+        for name, builder, args in misses:
+            if executor is None:
+                fragments[name] = _serialize(builder(*args), name, html_options)
+                self.put(keys[name], fragments[name])
+                logger.info(f"Rendered chart {name}")
+            else:
+                owner = builder.__self__
+                pending[name] = executor.submit(build_fragment, type(owner), owner.output_dir, name,
+                                                builder.__name__, tuple(args), html_options)
+
+        for name, future in pending.items():
+            fragments[name] = future.result()
+            self.put(keys[name], fragments[name])
+            logger.info(f"Rendered chart {name} in a worker process")
+
+        return {name: fragments[name] for name, *_ in charts}
+
+    def prune(self):
+        """Drop the least recently used fragments beyond max_entries."""
+        entries = sorted(self.cache_dir.glob('*.html'), key=lambda p: p.stat().st_mtime, reverse=True)
+        for path in entries[self.max_entries:]:
+            path.unlink(missing_ok=True)
@@ -0,0 +1,473 @@
+"""
+WILD cost basis and PnL engine.
+Matches external WILD inflows (lots) against outflows with FIFO, LIFO or
+average cost, per wallet and for the portfolio as a whole, valuing each
+transfer at the WILD price at its timestamp. Moves between owned wallets carry
+their lots from sender to receiver. Open lots are persisted so new
+transfers are matched against them without replaying history.
+"""
+
+import os
+import sys
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Optional, Any, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Add src to path so sibling modules resolve when imported as src.<module>
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from price_fetcher import PriceFetcher
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+COST_BASIS_METHODS = ('fifo', 'lifo', 'average')
+
+# Book holding every owned wallet together; inter-wallet moves never touch it
+PORTFOLIO_BOOK = 'portfolio'
+
+# State entry recording which wallets had books, so lot moves are replayed when that changes
+WALLET_BOOKS_KEY = '_wallet_books'
+
+
+def match_fifo(lots: np.ndarray, quantity: np.ndarray, is_inflow: np.ndarray,
+               price: np.ndarray) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    First-in-first-out lot matching without a per-event loop.
+
+    Every lot, in acquisition order, occupies a slice of the cumulative inflow
+    axis, and the cost of the first X units acquired is a piecewise-linear
+    function of X. Each outflow consumes the slice between the previous and the
+    new cumulative outflow, so its cost is a difference of two np.interp
+    lookups. An outflow larger than the units held at that point is topped up
+    with zero-cost units of unknown basis.
+
+    Args:
+        lots: Open lots carried in, shape (n, 2) of (quantity, unit_cost)
+        quantity: Event quantities (positive)
+        is_inflow: True for inflows, False for outflows
+        price: Unit price at each event (cost for inflows)
+
+    Returns:
+        (cost_of_sold per event, remaining lots, unknown-basis quantity)
+    """
+    inflow_qty = np.where(is_inflow, quantity, 0.0)
+    outflow_qty = np.where(is_inflow, 0.0, quantity)
+
+    # Units available before each outflow vs units sold up to it
+    held_before = lots[:, 0].sum() + np.cumsum(inflow_qty)
+    sold = np.cumsum(outflow_qty)
+    shortfall = np.maximum.accumulate(np.maximum(np.where(is_inflow, 0.0, sold - held_before), 0.0))
+    injected = np.diff(shortfall, prepend=0.0)
+
+    # Lot axis: carried lots, then each event's inflow or zero-cost top-up, in event order
+    item_qty = np.concatenate([lots[:, 0], np.where(is_inflow, quantity, injected)])
+    item_cost = np.concatenate([lots[:, 1], np.where(is_inflow, price, 0.0)])
+    axis = np.concatenate([[0.0], np.cumsum(item_qty)])
+    cost_axis = np.concatenate([[0.0], np.cumsum(item_qty * item_cost)])
+
+    consumed = np.interp(np.concatenate([[0.0], sold]), axis, cost_axis)
+    cost_of_sold = np.where(is_inflow, 0.0, np.diff(consumed))
+
+    # Lots (partly) beyond the total sold stay open
+    total_sold = sold[-1] if len(sold) else 0.0
+    remaining = axis[1:] - np.maximum(axis[:-1], total_sold)
+    keep = remaining > 1e-12
+    open_lots = np.column_stack([remaining[keep], item_cost[keep]])
+
+    return cost_of_sold, open_lots, float(shortfall[-1]) if len(shortfall) else 0.0
+
+
+def match_lifo(lots: np.ndarray, quantity: np.ndarray, is_inflow: np.ndarray,
+               price: np.ndarray) -> Tuple[np.ndarray, np.ndarray, float]:
+    """Last-in-first-out lot matching (same contract as match_fifo)."""
+    stack = [list(lot) for lot in lots]
+    cost_of_sold = np.zeros(len(quantity))
+    unknown = 0.0
+
+    for i in range(len(quantity)):
+        if is_inflow[i]:
+            stack.append([quantity[i], price[i]])
+            continue
+        remaining = quantity[i]
+        while remaining > 1e-12 and stack:
+            take = min(remaining, stack[-1][0])
+            cost_of_sold[i] += take * stack[-1][1]
+            stack[-1][0] -= take
+            remaining -= take
+            if stack[-1][0] <= 1e-12:
+                stack.pop()
+        unknown += remaining
+
+    return cost_of_sold, np.array(stack, dtype=float).reshape(-1, 2), unknown
+
+
+def match_average(lots: np.ndarray, quantity: np.ndarray, is_inflow: np.ndarray,
+                  price: np.ndarray) -> Tuple[np.ndarray, np.ndarray, float]:
+    """Average-cost matching; the open position is returned as a single lot."""
+    held = lots[:, 0].sum()
+    cost = (lots[:, 0] * lots[:, 1]).sum()
+    cost_of_sold = np.zeros(len(quantity))
+    unknown = 0.0
+
+    for i in range(len(quantity)):
+        if is_inflow[i]:
+            held += quantity[i]
+            cost += quantity[i] * price[i]
+            continue
+        matched = min(quantity[i], held)
+        if held > 0:
+            cost_of_sold[i] = cost * matched / held
+            cost -= cost_of_sold[i]
+        held -= matched
+        unknown += quantity[i] - matched
+
+    open_lots = np.array([[held, cost / held]]) if held > 1e-12 else np.zeros((0, 2))
+    return cost_of_sold, open_lots, unknown
+
+
+MATCHERS = {'fifo': match_fifo, 'lifo': match_lifo, 'average': match_average}
+
+
+def take_lots(lots: np.ndarray, quantity: float, method: str) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    Remove quantity units from open lots in the order the method sells them.
+
+    Args:
+        lots: Open lots, shape (n, 2) of (quantity, unit_cost)
+        quantity: Units to remove
+        method: One of COST_BASIS_METHODS
+
+    Returns:
+        (lots taken with their unit costs, lots left, quantity not covered by any lot),
+        both lot arrays in acquisition order
+    """
+    if method == 'average':
+        held = lots[:, 0].sum()
+        if held <= 1e-12:
+            return np.zeros((0, 2)), np.zeros((0, 2)), quantity
+        unit_cost = (lots[:, 0] * lots[:, 1]).sum() / held
+        taken = min(quantity, held)
+        left = np.array([[held - taken, unit_cost]]) if held - taken > 1e-12 else np.zeros((0, 2))
+        return np.array([[taken, unit_cost]]), left, quantity - taken
+
+    # FIFO sells the oldest lots first, LIFO the newest
+    order = list(lots) if method == 'fifo' else list(lots[::-1])
+    taken, remaining = [], quantity
+    while remaining > 1e-12 and order:
+        lot_qty, unit_cost = order[0]
+        take = min(remaining, lot_qty)
+        taken.append([take, unit_cost])
+        remaining -= take
+        if lot_qty - take > 1e-12:
+            order[0] = np.array([lot_qty - take, unit_cost])
+        else:
+            order.pop(0)
+    if method == 'lifo':
+        # Keep both sides in acquisition order
+        order, taken = order[::-1], taken[::-1]
+    left = np.array(order, dtype=float).reshape(-1, 2)
+    return np.array(taken, dtype=float).reshape(-1, 2), left, remaining
+
+
+class CostBasisEngine:
+    """Maintains WILD lots and realized PnL per wallet and for the portfolio."""
+
+    def __init__(self, method: str = 'fifo', price_fetcher: Optional[PriceFetcher] = None,
+                 state_file: Optional[str] = None, price_method: str = 'backward',
+                 backfill_prices: bool = True):
+        """
+        Initialize the engine.
+
+        Args:
+            method: Lot matching method: 'fifo', 'lifo' or 'average'
+            price_fetcher: Price source for the timestamp join
+            state_file: Where open lots and realized totals are persisted
+            price_method: Interpolation passed to PriceFetcher.attach_usd_values
+            backfill_prices: Fetch CoinGecko daily prices for transfers the local series does not cover
+        """
+        if method not in COST_BASIS_METHODS:
+            raise ValueError(f"Unknown cost basis method: {method}")
+        self.method = method
+        self.matcher = MATCHERS[method]
+        self.price_fetcher = price_fetcher or PriceFetcher()
+        self.price_method = price_method
+        self.backfill_prices = backfill_prices
+
+        if state_file is None:
+            state_file = Path(__file__).parent.parent / 'data' / 'cache' / f'cost_basis_{method}.json'
+        self.state_file = Path(state_file)
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        self.state = self._load_state()
+
+    def _load_state(self) -> Dict[str, Dict[str, Any]]:
+        """Load persisted books."""
+        if self.state_file.exists():
+            with open(self.state_file, 'r') as f:
+                return json.load(f)
+        return {}
+
+    def _save_state(self):
+        """Persist books."""
+        with open(self.state_file, 'w') as f:
+            json.dump(self.state, f, indent=2)
+
+    @staticmethod
+    def _empty_book() -> Dict[str, Any]:
+        return {
+            'processed_count': 0,
+            'last_timestamp': None,
+            'lots': [],
+            'realized_pnl': 0.0,
+            'proceeds': 0.0,
+            'cost_of_sold': 0.0,
+            'quantity_sold': 0.0,
+            'unknown_basis_qty': 0.0
+        }
+
+    def build_events(self, analyzer: Any, all_data: Dict) -> Dict[str, pd.DataFrame]:
+        """
+        Turn the analyzer's WILD legs into priced lot events per book.
+
+        Inter-wallet moves never appear in the portfolio book, since they neither
+        acquire nor dispose of WILD. In wallet books they carry the other wallet's
+        name in counterparty, and update() moves the matched lots and their basis
+        from sender to receiver; a move to or from an owned wallet without a book
+        of its own is treated as an external transfer.
+
+        Transfers the local price series does not cover are backfilled from
+        CoinGecko daily prices; any still unpriced keep a NaN price, and update()
+        leaves them out of the books and reports their quantity.
+
+        Returns:
+            Mapping of book name (wallet name or 'portfolio') to events sorted by
+            time, with quantity, is_inflow, price and counterparty columns
+        """
+        _, legs = analyzer.get_transaction_table(all_data)
+        wild = analyzer.contracts['wild_token']
+        if legs.empty:
+            return {}
+
+        legs = legs[(legs['leg_type'] == 'ERC20') & (legs['contract_lower'] == wild) &
+                    (legs['from_lower'] != legs['to_lower'])]
+        legs = self.price_fetcher.attach_usd_values(legs, method=self.price_method)
+        if self.backfill_prices and legs['wild_price_usd'].isna().any():
+            legs = self._backfill(legs)
+        order = [c for c in ('timestamp', 'blockNumber', 'logIndex') if c in legs.columns]
+        legs = legs.sort_values(order, kind='stable')
+
+        events = {}
+        owned = set(analyzer.wallets.values())
+        booked = {analyzer.wallets[wallet_name]: wallet_name for wallet_name in all_data}
+        portfolio = []
+        for wallet_name in all_data:
+            address = analyzer.wallets[wallet_name]
+            book = legs[(legs['to_lower'] == address) | (legs['from_lower'] == address)]
+            is_inflow = (book['to_lower'] == address).values
+            other_side = np.where(is_inflow, book['from_lower'], book['to_lower'])
+            frame = pd.DataFrame({
+                'timestamp': book['timestamp'],
+                'hash': book['hash'],
+                'quantity': book['value_token'].astype(float),
+                'is_inflow': is_inflow,
+                'price': book['wild_price_usd'].astype(float),
+                'counterparty': pd.Series(other_side, index=book.index).map(booked)
+            })
+            events[wallet_name] = frame.reset_index(drop=True)
+
+            # Portfolio view: only the owned side of each external leg
+            external = ~book['is_inter_wallet']
+            portfolio.append(frame[external & ((book['to_lower'].isin(owned) & frame['is_inflow']) |
+                                               (book['from_lower'].isin(owned) & ~frame['is_inflow']))])
+
+        if portfolio:
+            combined = pd.concat(portfolio).sort_values('timestamp', kind='stable')
+            events[PORTFOLIO_BOOK] = combined.reset_index(drop=True)
+        return events
+
+    def _backfill(self, legs: pd.DataFrame) -> pd.DataFrame:
+        """Fetch daily WILD prices for the unpriced transfer dates and re-attach prices."""
+        dates = sorted(set(pd.to_datetime(legs.loc[legs['wild_price_usd'].isna(), 'timestamp']).dt.strftime('%Y-%m-%d')))
+        logger.info(f"Backfilling WILD prices for {len(dates)} transfer dates")
+        fetched = [date for date in dates if self.price_fetcher.get_historical_price('WILD', date) is not None]
+        if not fetched:
+            return legs
+        # Fetched prices land in the price cache, which the series is rebuilt from
+        self.price_fetcher.load_price_series('WILD', refresh=True)
+        return self.price_fetcher.attach_usd_values(legs, method=self.price_method)
+
+    def _new_events(self, book: Dict[str, Any], events: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """Return the events appended since the book was last updated, or None if history changed."""
+        count = book['processed_count']
+        if count == 0:
+            return events
+        if len(events) < count or str(events['timestamp'].iloc[count - 1]) != book['last_timestamp']:
+            return None
+        if len(events) > count and events['timestamp'].iloc[count] < events['timestamp'].iloc[count - 1]:
+            return None
+        return events.iloc[count:]
+
+    def _apply(self, book: Dict[str, Any], events: pd.DataFrame):
+        """Match new events against the book's open lots and accumulate realized totals."""
+        if events.empty:
+            return
+        self._match(book, events)
+        book['processed_count'] += len(events)
+        book['last_timestamp'] = str(events['timestamp'].iloc[-1])
+
+    def _match(self, book: Dict[str, Any], events: pd.DataFrame):
+        """Match acquisitions and disposals against the book's open lots."""
+        if events.empty:
+            return
+
+        lots = np.array(book['lots'], dtype=float).reshape(-1, 2)
+        quantity = events['quantity'].to_numpy(dtype=float)
+        is_inflow = events['is_inflow'].to_numpy(dtype=bool)
+        price = events['price'].to_numpy(dtype=float)
+
+        cost_of_sold, open_lots, unknown = self.matcher(lots, quantity, is_inflow, price)
+        proceeds = np.where(is_inflow, 0.0, quantity * price).sum()
+
+        book['lots'] = open_lots.tolist()
+        book['proceeds'] += float(proceeds)
+        book['cost_of_sold'] += float(cost_of_sold.sum())
+        book['realized_pnl'] = book['proceeds'] - book['cost_of_sold']
+        book['quantity_sold'] += float(quantity[~is_inflow].sum())
+        book['unknown_basis_qty'] += unknown
+
+    def _move(self, sender: Dict[str, Any], receiver: Dict[str, Any], quantity: float):
+        """Move quantity units and their basis from one wallet book to another."""
+        lots = np.array(sender['lots'], dtype=float).reshape(-1, 2)
+        taken, left, uncovered = take_lots(lots, quantity, self.method)
+        if uncovered > 1e-12:
+            # The sender's history does not cover the move; the receiver gets units of unknown basis
+            taken = np.vstack([taken, [[uncovered, 0.0]]])
+            receiver['unknown_basis_qty'] += uncovered
+        sender['lots'] = left.tolist()
+        receiver['lots'] = receiver['lots'] + taken.tolist()
+
+    def _apply_wallets(self, books: Dict[str, Dict[str, Any]], events: Dict[str, pd.DataFrame]):
+        """
+        Apply new wallet-book events in time order across wallets.
+
+        Events between two inter-wallet moves are matched per book in one
+        vectorized pass; each move then hands the sender's lots to the receiver.
+        """
+        frames = [frame.assign(book=name) for name, frame in events.items() if not frame.empty]
+        if not frames:
+            return
+        # At equal timestamps the sending side of a move runs before what follows it
+        merged = pd.concat(frames, ignore_index=True).sort_values(['timestamp', 'is_inflow'], kind='stable')
+        is_move = merged['counterparty'].notna().to_numpy()
+        move_out = is_move & ~merged['is_inflow'].to_numpy()
+
+        start = 0
+        for position in list(np.flatnonzero(move_out)) + [len(merged)]:
+            segment = merged.iloc[start:position]
+            segment = segment[~is_move[start:position]]
+            for name, book_events in segment.groupby('book', sort=False):
+                self._match(books[name], book_events)
+            if position < len(merged):
+                move = merged.iloc[position]
+                self._move(books[move['book']], books[move['counterparty']], float(move['quantity']))
+            start = position + 1
+
+        for name, frame in events.items():
+            if not frame.empty:
+                books[name]['processed_count'] += len(frame)
+                books[name]['last_timestamp'] = str(frame['timestamp'].iloc[-1])
+
+    def update(self, analyzer: Any, all_data: Dict, current_price: Optional[float] = None) -> Dict[str, Dict]:
+        """
+        Bring every book up to date and report PnL.
+
+        Only transfers appended since the last update are matched; a book whose
+        earlier history changed (for example after a backfill) is replayed.
+
+        Args:
+            analyzer: WilderAnalyzer providing the transaction table
+            all_data: Collected wallet data
+            current_price: WILD price for unrealized PnL (defaults to the latest known price)
+
+        Returns:
+            Per-book dictionary with position, cost basis and PnL figures
+        """
+        events = self.build_events(analyzer, all_data)
+        if current_price is None:
+            series = self.price_fetcher.load_price_series('WILD')
+            current_price = float(series.iloc[-1]) if not series.empty else 0.0
+
+        # Unpriced transfers are reported, not booked at a $0 cost or $0 proceeds; moves
+        # between booked wallets carry lots, not a price, so they are always kept
+        unpriced = {name: book_events['price'].isna() & book_events['counterparty'].isna()
+                    for name, book_events in events.items()}
+        priced = {name: book_events[~unpriced[name]].reset_index(drop=True) for name, book_events in events.items()}
+
+        portfolio = priced.pop(PORTFOLIO_BOOK, None)
+        if portfolio is not None:
+            book = self.state.setdefault(PORTFOLIO_BOOK, self._empty_book())
+            new_events = self._new_events(book, portfolio)
+            if new_events is None:
+                logger.info(f"Earlier {PORTFOLIO_BOOK} transfers changed, replaying its cost basis")
+                book = self.state[PORTFOLIO_BOOK] = self._empty_book()
+                new_events = portfolio
+            self._apply(book, new_events)
+
+        # Lot moves tie the wallet books together, so they are replayed together
+        books = {name: self.state.setdefault(name, self._empty_book()) for name in priced}
+        new_events = {name: self._new_events(books[name], book_events) for name, book_events in priced.items()}
+        if self.state.get(WALLET_BOOKS_KEY) != sorted(priced) or any(new is None for new in new_events.values()):
+            if any(book['processed_count'] for book in books.values()):
+                logger.info("Wallet set or earlier transfers changed, replaying the wallet cost bases")
+            books = {name: self._empty_book() for name in priced}
+            self.state.update(books)
+            new_events = priced
+        self.state[WALLET_BOOKS_KEY] = sorted(priced)
+        self._apply_wallets(books, new_events)
+
+        results = {}
+        for name in events:
+            results[name] = self.summarize(self.state[name], current_price)
+            book_unpriced = unpriced[name]
+            results[name]['unpriced_inflow_qty'] = float(events[name].loc[book_unpriced & events[name]['is_inflow'], 'quantity'].sum())
+            results[name]['unpriced_outflow_qty'] = float(events[name].loc[book_unpriced & ~events[name]['is_inflow'], 'quantity'].sum())
+            if book_unpriced.any():
+                logger.warning(f"{name}: {book_unpriced.sum()} WILD transfers have no price and are left out of the "
+                               f"cost basis ({results[name]['unpriced_inflow_qty']:,.0f} in, "
+                               f"{results[name]['unpriced_outflow_qty']:,.0f} out)")
+
+        self._save_state()
+        return results
+
+    def summarize(self, book: Dict[str, Any], current_price: float) -> Dict[str, Any]:
+        """Position and PnL figures for one book."""
+        lots = np.array(book['lots'], dtype=float).reshape(-1, 2)
+        open_qty = float(lots[:, 0].sum())
+        open_cost = float((lots[:, 0] * lots[:, 1]).sum())
+        return {
+            'method': self.method,
+            'open_quantity': open_qty,
+            'open_cost_usd': open_cost,
+            'avg_purchase_price': open_cost / open_qty if open_qty > 0 else 0,
+            'market_value_usd': open_qty * current_price,
+            'unrealized_pnl': open_qty * current_price - open_cost,
+            'realized_pnl': book['realized_pnl'],
+            'proceeds_usd': book['proceeds'],
+            'cost_of_sold_usd': book['cost_of_sold'],
+            'quantity_sold': book['quantity_sold'],
+            'unknown_basis_qty': book['unknown_basis_qty'],
+            'open_lots': len(lots)
+        }
+
+    def reset(self):
+        """Forget all books so the next update replays everything."""
+        self.state = {}
+        self._save_state()
@@ -0,0 +1,273 @@
+"""
+Event-driven DAO monitoring for Operation Titan.
+Subscribes over WebSocket to new heads and to WILD Transfer logs touching the
+DAO wallets, evaluating alert rules as soon as a block is included. After a
+disconnect it reconnects with backoff and catches up on the missed block range
+with eth_getLogs before resuming the stream.
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import websockets
+from dotenv import load_dotenv
+
+# Add src to path so sibling modules resolve when imported as src.<module>
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from rpc_client import RPCError, LOCAL_RPC_URL
+from log_indexer import TRANSFER_TOPIC, address_to_topic, topic_to_address
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Load environment variables
+load_dotenv(Path(__file__).parent.parent / 'config' / '.env')
+
+# Local dev chains (anvil, hardhat) serve WebSocket on the same port as HTTP
+LOCAL_WS_URL = LOCAL_RPC_URL.replace('http://', 'ws://')
+
+
+class DAOStreamMonitor:
+    """Streams new heads and DAO WILD Transfers and raises alerts as they land."""
+
+    def __init__(self, tracker: Any, alert_callback: Callable[[List[Dict[str, Any]]], None],
+                 ws_url: Optional[str] = None, eth_threshold: float = 10,
+                 wild_threshold: float = 100000, start_block: Optional[int] = None,
+                 checkpoint_callback: Optional[Callable[[int], None]] = None,
+                 min_reconnect_delay: float = 1.0, max_reconnect_delay: float = 60.0):
+        """
+        Initialize the monitor.
+
+        Args:
+            tracker: TitanTracker supplying the DAO wallets, WILD token, RPC pool and log indexer
+            alert_callback: Called with each list of new alerts
+            ws_url: WebSocket endpoint (defaults to ETH_WS_URL, then a local node)
+            eth_threshold: ETH balance drop between heads that raises a dao_eth_outflow alert
+            wild_threshold: WILD Transfer size that raises a DAO inflow/outflow alert
+            start_block: Last block already processed; missed blocks after it are caught up on connect
+            checkpoint_callback: Called with each fully processed head block number
+            min_reconnect_delay: First reconnect delay in seconds, doubled per failed attempt
+            max_reconnect_delay: Upper bound on the reconnect delay
+        """
+        self.tracker = tracker
+        self.alert_callback = alert_callback
+        self.ws_url = ws_url or os.getenv('ETH_WS_URL') or LOCAL_WS_URL
+        self.eth_threshold = eth_threshold
+        self.wild_threshold = wild_threshold
+        self.checkpoint_callback = checkpoint_callback
+        self.min_reconnect_delay = min_reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+
+        self.wild_token = tracker.wild_token.lower()
+        self.daos = {info['address'].lower(): name for name, info in tracker.dao_wallets.items()}
+
+        self.last_block = start_block
+        self.eth_balances: Dict[str, float] = {}
+
+        # Recently handled (txhash, logIndex) pairs; catch-up and the live stream can overlap
+        self.seen_logs = set()
+        self.seen_order = deque(maxlen=10000)
+
+    def _log_filters(self) -> List[Dict[str, Any]]:
+        """WILD Transfer filters for DAO senders and DAO recipients."""
+        dao_topics = [address_to_topic(address) for address in self.daos]
+        return [
+            {'address': self.wild_token, 'topics': [TRANSFER_TOPIC, dao_topics]},
+            {'address': self.wild_token, 'topics': [TRANSFER_TOPIC, None, dao_topics]}
+        ]
+
+    def _remember_log(self, log: Dict[str, Any]) -> bool:
+        """Mark a log as handled; returns False if it was already handled."""
+        key = (log['transactionHash'], log['logIndex'])
+        if key in self.seen_logs:
+            return False
+        if len(self.seen_order) == self.seen_order.maxlen:
+            self.seen_logs.discard(self.seen_order[0])
+        self.seen_order.append(key)
+        self.seen_logs.add(key)
+        return True
+
+    def evaluate_transfer(self, log: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Apply the Transfer alert rules to one WILD log."""
+        if log.get('removed') or len(log.get('topics', [])) < 3 or not self._remember_log(log):
+            return []
+
+        sender = topic_to_address(log['topics'][1])
+        receiver = topic_to_address(log['topics'][2])
+        amount = int(log['data'], 16) / 1e18 if log.get('data') not in (None, '0x') else 0.0
+        if amount < self.wild_threshold:
+            return []
+
+        block = int(log['blockNumber'], 16)
+        alerts = []
+        if receiver in self.daos:
+            alerts.append({
+                'type': 'dao_wild_inflow',
+                'severity': 'medium',
+                'dao': self.daos[receiver],
+                'amount_wild': amount,
+                'hash': log['transactionHash'],
+                'block': block,
+                'message': f"{self.daos[receiver]} received {amount:,.0f} WILD tokens",
+                'timestamp': datetime.now()
+            })
+        if sender in self.daos:
+            alerts.append({
+                'type': 'dao_wild_outflow',
+                'severity': 'medium',
+                'dao': self.daos[sender],
+                'amount_wild': amount,
+                'hash': log['transactionHash'],
+                'block': block,
+                'message': f"{self.daos[sender]} sent {amount:,.0f} WILD tokens",
+                'timestamp': datetime.now()
+            })
+        return alerts
+
+    def evaluate_head(self, block: int) -> List[Dict[str, Any]]:
+        """Read every DAO's ETH balance at a new head in one batch and flag large drops."""
+        addresses = list(self.daos)
+        results = self.tracker.rpc_pool.batch([('eth_getBalance', [address, hex(block)]) for address in addresses])
+
+        alerts = []
+        for address, result in zip(addresses, results):
+            balance = int(result, 16) / 1e18
+            previous = self.eth_balances.get(address)
+            self.eth_balances[address] = balance
+
+            if previous is not None and previous - balance >= self.eth_threshold:
+                eth_change = previous - balance
+                alerts.append({
+                    'type': 'dao_eth_outflow',
+                    'severity': 'high',
+                    'dao': self.daos[address],
+                    'amount_eth': eth_change,
+                    'block': block,
+                    'message': f"{self.daos[address]} sent {eth_change:.2f} ETH (potential buyback)",
+                    'timestamp': datetime.now()
+                })
+        return alerts
+
+    def _dispatch(self, alerts: List[Dict[str, Any]]):
+        """Hand alerts to the callback."""
+        if alerts:
+            logger.info(f"Stream monitor raised {len(alerts)} alerts")
+            self.alert_callback(alerts)
+
+    def _checkpoint(self, block: int):
+        """Record a processed head; the checkpoint never moves backwards."""
+        self.last_block = block if self.last_block is None else max(self.last_block, block)
+        if self.checkpoint_callback:
+            self.checkpoint_callback(self.last_block)
+
+    def handle_head(self, head: Dict[str, Any]):
+        """Process a newHeads notification."""
+        block = int(head['number'], 16)
+        if self.last_block is not None and block <= self.last_block:
+            # Buffered during catch-up, which already covered this block
+            return
+        self._dispatch(self.evaluate_head(block))
+        self._checkpoint(block)
+
+    def handle_logs(self, logs: List[Dict[str, Any]]):
+        """Process WILD Transfer logs from the stream or from catch-up."""
+        alerts = []
+        for log in logs:
+            alerts.extend(self.evaluate_transfer(log))
+        self._dispatch(alerts)
+
+    def catch_up(self):
+        """Replay DAO Transfers from blocks missed while disconnected."""
+        head = self.tracker.rpc_pool.block_number()
+        if self.last_block is None:
+            # First run: nothing to replay, just seed the ETH balance baseline
+            self.evaluate_head(head)
+            self._checkpoint(head)
+            return
+
+        if head > self.last_block:
+            logger.info(f"Catching up on blocks {self.last_block + 1}-{head}")
+            logs = self.tracker.log_indexer.fetch_transfer_logs(
+                list(self.daos), self.last_block + 1, head, contracts=[self.wild_token]
+            )
+            self.handle_logs(logs)
+            self.handle_head({'number': hex(head)})
+
+    async def _subscribe(self, ws) -> Dict[str, str]:
+        """Open the newHeads and log subscriptions; returns subscription id -> kind."""
+        requests = [('heads', ['newHeads'])] + [('logs', ['logs', f]) for f in self._log_filters()]
+        for request_id, (_, params) in enumerate(requests, start=1):
+            await ws.send(json.dumps({'jsonrpc': '2.0', 'id': request_id, 'method': 'eth_subscribe',
+                                      'params': params}))
+
+        subscriptions = {}
+        while len(subscriptions) < len(requests):
+            reply = json.loads(await asyncio.wait_for(ws.recv(), timeout=30))
+            if 'id' not in reply:
+                # Notification for a subscription opened earlier on this socket; catch-up covers it
+                continue
+            if reply.get('error'):
+                raise RPCError(f"eth_subscribe failed: {reply['error']}", reply['error'].get('code'))
+            subscriptions[reply['result']] = requests[reply['id'] - 1][0]
+
+        return subscriptions
+
+    async def _session(self):
+        """Run one WebSocket session until the connection drops."""
+        loop = asyncio.get_running_loop()
+        async with websockets.connect(self.ws_url, ping_interval=20, max_size=None) as ws:
+            subscriptions = await self._subscribe(ws)
+            logger.info(f"Subscribed to new heads and DAO WILD Transfers on {self.ws_url}")
+
+            # Subscribe first so nothing between catch-up and the live stream is lost
+            await loop.run_in_executor(None, self.catch_up)
+            self.reconnect_delay = self.min_reconnect_delay
+
+            async for message in ws:
+                notification = json.loads(message)
+                if notification.get('method') != 'eth_subscription':
+                    continue
+                params = notification['params']
+                kind = subscriptions.get(params['subscription'])
+                if kind == 'heads':
+                    await loop.run_in_executor(None, self.handle_head, params['result'])
+                elif kind == 'logs':
+                    await loop.run_in_executor(None, self.handle_logs, [params['result']])
+
+    async def run_async(self, duration: Optional[float] = None):
+        """Stream until cancelled (or for duration seconds), reconnecting with backoff."""
+        deadline = time.monotonic() + duration if duration else None
+        self.reconnect_delay = self.min_reconnect_delay
+
+        while deadline is None or time.monotonic() < deadline:
+            try:
+                timeout = deadline - time.monotonic() if deadline else None
+                await asyncio.wait_for(self._session(), timeout=timeout)
+                logger.warning("WebSocket stream closed by server")
+            except asyncio.TimeoutError:
+                if deadline and time.monotonic() >= deadline:
+                    break
+                logger.warning("WebSocket stream timed out")
+            except (OSError, websockets.WebSocketException, RPCError) as e:
+                logger.warning(f"WebSocket stream error: {e}")
+
+            logger.info(f"Reconnecting to {self.ws_url} in {self.reconnect_delay:.0f}s")
+            await asyncio.sleep(self.reconnect_delay)
+            self.reconnect_delay = min(self.max_reconnect_delay, self.reconnect_delay * 2)
+
+    def run(self, duration: Optional[float] = None):
+        """Blocking entry point."""
+        asyncio.run(self.run_async(duration))
@@ -4,6 +4,7 @@ Handles fetching transaction data from Etherscan API with rate limiting.
 """
 
 import os
+import sys
 import json
 import time
 import logging
@@ -14,6 +15,12 @@ from datetime import datetime
 from etherscan import Etherscan
 from dotenv import load_dotenv
 
+# Add src to path so sibling modules resolve when imported as src.<module>
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from rpc_client import JsonRpcClient
+from log_indexer import TransferLogIndexer
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -27,16 +34,35 @@ load_dotenv(Path(__file__).parent.parent / 'config' / '.env')
 class WilderDataCollector:
     """Collects Ethereum blockchain data for Wilder World analysis."""
     
-    def __init__(self, cache_dir: Optional[str] = None):
-        """Initialize the data collector with API credentials and cache directory."""
+    def __init__(self, cache_dir: Optional[str] = None, source: Optional[str] = None):
+        """
+        Initialize the data collector with API credentials and cache directory.
+        
+        Args:
+            cache_dir: Directory for cached responses
+            source: Transfer data source, 'etherscan' (default) or 'rpc' to read
+                Transfer logs straight from the node at ETH_RPC_URL
+        """
+        self.source = (source or os.getenv('TRANSFER_DATA_SOURCE', 'etherscan')).lower()
+        if self.source not in ('etherscan', 'rpc'):
+            raise ValueError(f"Unknown transfer data source: {self.source}")
+        
         self.api_key = os.getenv('ETHERSCAN_API_KEY')
-        if not self.api_key:
+        if not self.api_key and self.source == 'etherscan':
             raise ValueError("ETHERSCAN_API_KEY not found in environment variables")
         
-        self.eth = Etherscan(self.api_key)
+        # Etherscan is still used for normal/internal transactions when a key is set
+        self.eth = Etherscan(self.api_key) if self.api_key else None
         self.rate_limit = int(os.getenv('ETHERSCAN_RATE_LIMIT', 5))
         self.last_request_time = 0
         
+        # JSON-RPC Transfer log indexer (any node or local dev chain)
+        self.log_indexer = None
+        self.rpc_start_block = int(os.getenv('RPC_START_BLOCK', 0))
+        self._rpc_transfers = {}
+        if self.source == 'rpc':
+            self.log_indexer = TransferLogIndexer(JsonRpcClient(os.getenv('ETH_RPC_URL')))
+        
         # Set up cache directory
         if cache_dir is None:
             cache_dir = Path(__file__).parent.parent / 'data' / 'raw'
@@ -97,6 +123,27 @@ class WilderDataCollector:
                 return json.load(f)
         return None
     
+    def _fetch_rpc_transfers(self, wallet_name: str, token_type: str,
+                             contract_address: Optional[str] = None) -> List[Dict]:
+        """Fetch Transfer logs for a wallet from the RPC node.
+        
+        All contracts are indexed in one pass per wallet and filtered locally, so
+        the WILD, LP and per-collection fetches share a single log scan.
+        """
+        if wallet_name not in self._rpc_transfers:
+            logger.info(f"Indexing Transfer logs via RPC for {wallet_name} wallet")
+            self._rpc_transfers[wallet_name] = self.log_indexer.fetch_transfers(
+                [self.wallets[wallet_name]],
+                from_block=self.rpc_start_block,
+                include_gas=True
+            )
+        
+        transactions = self._rpc_transfers[wallet_name][token_type]
+        if contract_address:
+            transactions = [tx for tx in transactions
+                            if tx['contractAddress'] == contract_address.lower()]
+        return transactions
+    
     def fetch_normal_transactions(self, wallet_name: str, force_refresh: bool = False) -> List[Dict]:
         """Fetch normal ETH transactions for a wallet."""
         wallet_address = self.wallets[wallet_name]
@@ -107,6 +154,10 @@ class WilderDataCollector:
             if cached_data:
                 return cached_data
         
+        if self.eth is None:
+            logger.warning("Normal transactions require ETHERSCAN_API_KEY; Transfer logs do not include them")
+            return []
+        
         logger.info(f"Fetching normal transactions for {wallet_name} wallet: {wallet_address}")
         self._rate_limit_wait()
         
@@ -139,9 +190,14 @@ class WilderDataCollector:
                 return cached_data
         
         logger.info(f"Fetching token transactions for {wallet_name} wallet: {wallet_address}")
-        self._rate_limit_wait()
         
         try:
+            if self.source == 'rpc':
+                transactions = self._fetch_rpc_transfers(wallet_name, 'erc20', contract_address)
+                self._cache_response(cache_filename, transactions)
+                return transactions
+            
+            self._rate_limit_wait()
             if contract_address:
                 transactions = self.eth.get_erc20_token_transfer_events_by_address(
                     address=wallet_address,
@@ -180,9 +236,14 @@ class WilderDataCollector:
                 return cached_data
         
         logger.info(f"Fetching NFT transactions for {wallet_name} wallet: {wallet_address}")
-        self._rate_limit_wait()
         
         try:
+            if self.source == 'rpc':
+                transactions = self._fetch_rpc_transfers(wallet_name, 'erc721', contract_address)
+                self._cache_response(cache_filename, transactions)
+                return transactions
+            
+            self._rate_limit_wait()
             if contract_address:
                 transactions = self.eth.get_erc721_token_transfer_events_by_address(
                     address=wallet_address,
@@ -215,6 +276,10 @@ class WilderDataCollector:
             if cached_data:
                 return cached_data
         
+        if self.eth is None:
+            logger.warning("Internal transactions require ETHERSCAN_API_KEY; Transfer logs do not include them")
+            return []
+        
         logger.info(f"Fetching internal transactions for {wallet_name} wallet: {wallet_address}")
         self._rate_limit_wait()
         
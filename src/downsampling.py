@@ -0,0 +1,242 @@
+"""
+Point-budget downsampling for large plotly time series.
+Aggregates raw events into time buckets, thins series above a point budget with
+largest-triangle-three-buckets (LTTB), and switches to WebGL traces. Each
+downsampled trace carries precomputed resolution levels in the figure's
+layout.meta; RELAYOUT_SCRIPT swaps in the finest level that fits the budget for
+the visible range, so zooming reveals more detail.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Points a single trace may draw before it is thinned and drawn with WebGL
+POINT_BUDGET = 2000
+
+# Each resolution level keeps about 1/LEVEL_FACTOR of the points of the next finer one
+LEVEL_FACTOR = 4
+
+# The finest level embedded in the figure holds at most this many point budgets;
+# the full series is never embedded, so a downsampled figure stays smaller than a plain one
+MAX_LEVEL_MULTIPLE = 4
+
+
+def bucket_counts(timestamps: pd.Series, freq: str = 'D') -> pd.Series:
+    """Number of events per time bucket, indexed by bucket start."""
+    timestamps = pd.to_datetime(pd.Series(timestamps))
+    if timestamps.empty:
+        return pd.Series(dtype=int)
+    return timestamps.dt.floor(freq).value_counts().sort_index()
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Indices of the points kept by largest-triangle-three-buckets.
+
+    The first and last points are always kept; the rest of the series is split
+    into threshold - 2 buckets and from each the point forming the largest
+    triangle with the previously kept point and the next bucket's mean is kept.
+
+    Args:
+        x: Monotonic x values
+        y: Values
+        threshold: Number of points to keep
+
+    Returns:
+        Sorted indices into x and y
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    selected = np.empty(threshold, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+
+    anchor = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_x, next_y = x[edges[i + 1]:edges[i + 2]].mean(), y[edges[i + 1]:edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+
+        area = np.abs((x[anchor] - next_x) * (y[start:end] - y[anchor])
+                      - (x[anchor] - x[start:end]) * (next_y - y[anchor]))
+        anchor = start + int(np.argmax(area))
+        selected[i + 1] = anchor
+
+    return selected
+
+
+def _axis_values(x: Any) -> np.ndarray:
+    """x as numbers: datetimes become epoch milliseconds, which plotly date axes accept."""
+    values = pd.Series(x)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return (values.astype('int64') // 10**6).to_numpy()
+    return values.to_numpy(dtype=float)
+
+
+def _compact(values: np.ndarray) -> Tuple[Any, Any, np.ndarray]:
+    """
+    Encode values as (origin, step, offsets) with value = origin + step * offset.
+
+    Integer values (epoch milliseconds, counts) get the largest step dividing every
+    offset, so daily buckets serialize as day numbers rather than 13-digit timestamps.
+    """
+    origin = values[0]
+    offsets = values - origin
+    if not np.all(np.mod(offsets, 1) == 0):
+        return origin.item(), 1, offsets
+    offsets = offsets.astype(np.int64)
+    step = int(np.gcd.reduce(offsets)) or 1
+    return int(origin), step, offsets // step
+
+
+def _plain(values: np.ndarray) -> list:
+    """Values as a JSON list, written as integers when they all are."""
+    if np.all(np.mod(values, 1) == 0):
+        return values.astype(np.int64).tolist()
+    return values.tolist()
+
+
+def resolution_levels(x: Any, y: Any, budget: int = POINT_BUDGET, factor: int = LEVEL_FACTOR,
+                      max_multiple: int = MAX_LEVEL_MULTIPLE) -> Dict[str, Any]:
+    """
+    LTTB levels of a series above budget, finest first, coarsest (budget points) last.
+
+    Levels grow by factor from the budget while they stay below the series length
+    and within max_multiple budgets. x is stored compactly as integer offsets:
+    a level's axis values are x0 + dx * offset (epoch milliseconds for datetimes).
+
+    Args:
+        x: Series x values (datetimes or numbers)
+        y: Series values
+        budget: Points the coarsest level may hold
+        factor: Reduction between consecutive levels
+        max_multiple: Budgets the finest level may hold
+
+    Returns:
+        {'x0': ..., 'dx': ..., 'levels': [{'x': [...], 'y': [...]}, ...]}
+    """
+    # LTTB always keeps both endpoints and at least one point between them
+    budget = max(budget, 3)
+    xs = _axis_values(x)
+    ys = np.asarray(y, dtype=float)
+    x0, dx, offsets = _compact(xs)
+
+    sizes = [budget]
+    while sizes[-1] * factor < len(xs) and sizes[-1] * factor <= budget * max_multiple:
+        sizes.append(sizes[-1] * factor)
+
+    levels = []
+    for size in reversed(sizes):
+        keep = lttb(xs, ys, size)
+        levels.append({'x': _plain(offsets[keep]), 'y': _plain(ys[keep])})
+    return {'x0': x0, 'dx': dx, 'levels': levels}
+
+
+def add_downsampled_trace(fig: go.Figure, x: Any, y: Any, budget: int = POINT_BUDGET,
+                          row: Optional[int] = None, col: Optional[int] = None, **trace_kwargs) -> go.Figure:
+    """
+    Add a scatter trace, thinned and drawn with WebGL when it exceeds the point budget.
+
+    Series within budget are added unchanged as go.Scatter. Larger ones are added as
+    go.Scattergl holding their coarsest level, and the levels are recorded under
+    layout.meta['resolution_levels'] for RELAYOUT_SCRIPT.
+
+    Args:
+        fig: Figure to add to
+        x: Series x values
+        y: Series values
+        budget: Points drawn before downsampling
+        row: Subplot row, for figures made with make_subplots
+        col: Subplot column
+        **trace_kwargs: Scatter properties (mode, name, marker, ...)
+    """
+    subplot = {'row': row, 'col': col} if row is not None else {}
+    if len(x) <= max(budget, 3):
+        return fig.add_trace(go.Scatter(x=x, y=y, **trace_kwargs), **subplot)
+
+    encoded = resolution_levels(x, y, budget)
+    coarsest = encoded['levels'][-1]
+    initial_x = encoded['x0'] + encoded['dx'] * np.asarray(coarsest['x'])
+    if pd.api.types.is_datetime64_any_dtype(pd.Series(x)):
+        # Draw dates so the axis is typed as a date axis; later levels are swapped in as epoch ms
+        initial_x = pd.to_datetime(initial_x, unit='ms')
+    fig.add_trace(go.Scattergl(x=initial_x, y=coarsest['y'], **trace_kwargs), **subplot)
+
+    meta = dict(fig.layout.meta or {})
+    meta.setdefault('resolution_levels', {})[str(len(fig.data) - 1)] = encoded
+    meta['point_budget'] = budget
+    fig.update_layout(meta=meta)
+    logger.info(f"Downsampled trace {trace_kwargs.get('name', len(fig.data) - 1)} "
+                f"from {len(x):,} to {len(coarsest['x']):,} points ({len(encoded['levels'])} levels)")
+    return fig
+
+
+# post_script for fig.to_html: on zoom, show the finest level whose visible points fit the budget
+RELAYOUT_SCRIPT = """
+var gd = document.getElementById('{plot_id}');
+var meta = (gd.layout && gd.layout.meta) || {};
+var levels = meta.resolution_levels;
+if (levels) {
+    var budget = meta.point_budget;
+    var toNumber = function(value) {
+        if (typeof value === 'number') { return value; }
+        var text = String(value).replace(' ', 'T');
+        if (text.length <= 10) { text += 'T00:00'; }
+        return Date.parse(text + 'Z');
+    };
+    var rangeOf = function(update) {
+        for (var key in update) {
+            var match = key.match(/^(xaxis\\d*)\\.range\\[0\\]$/);
+            if (match) { return [toNumber(update[key]), toNumber(update[match[1] + '.range[1]'])]; }
+            match = key.match(/^xaxis\\d*\\.range$/);
+            if (match) { return [toNumber(update[key][0]), toNumber(update[key][1])]; }
+        }
+        return null;
+    };
+    // Levels store x as offsets: the axis value is x0 + dx * offset
+    var slice = function(trace, level, lo, hi) {
+        var x = [], y = [];
+        for (var i = 0; i < level.x.length; i++) {
+            var value = trace.x0 + trace.dx * level.x[i];
+            if (value >= lo && value <= hi) { x.push(value); y.push(level.y[i]); }
+        }
+        return {x: x, y: y};
+    };
+    gd.on('plotly_relayout', function(update) {
+        var range = rangeOf(update);
+        var indices = Object.keys(levels).map(Number);
+        var xs = [], ys = [];
+        indices.forEach(function(index) {
+            var trace = levels[index];
+            var traceLevels = trace.levels;
+            var chosen = slice(trace, traceLevels[traceLevels.length - 1], -Infinity, Infinity);
+            if (range) {
+                for (var k = 0; k < traceLevels.length; k++) {
+                    var visible = slice(trace, traceLevels[k], range[0], range[1]);
+                    if (visible.x.length <= budget) { chosen = visible; break; }
+                }
+            }
+            xs.push(chosen.x);
+            ys.push(chosen.y);
+        });
+        Plotly.restyle(gd, {x: xs, y: ys}, indices);
+    });
+}
+"""
@@ -0,0 +1,295 @@
+"""
+WILD holder balance index.
+Replays every WILD Transfer since deployment into a compact address->balance
+table: addresses are interned to integer ids and balances live in int64 arrays,
+checkpointed by block so each refresh only applies new logs.
+"""
+
+import os
+import sys
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterable
+
+import numpy as np
+from dotenv import load_dotenv
+
+# Add src to path so sibling modules resolve when imported as src.<module>
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from rpc_client import JsonRpcClient
+from log_indexer import TransferLogIndexer, TRANSFER_TOPIC, topic_to_address
+from supply_tracker import ZERO_ADDRESS, DEAD_ADDRESS, deploy_block
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Load environment variables
+load_dotenv(Path(__file__).parent.parent / 'config' / '.env')
+
+# Balances are stored as whole WILD plus a wei remainder (0 <= frac < 1e18) so
+# they stay exact in int64. Deltas are accumulated in 1e9-wei limbs to avoid
+# overflow when many transfers hit the same address in one batch.
+WEI_PER_TOKEN = 10 ** 18
+LIMB = 10 ** 9
+
+
+class HolderIndex:
+    """Compact, incrementally maintained WILD balance table."""
+
+    def __init__(self, token_address: str, client: Optional[JsonRpcClient] = None,
+                 cache_dir: Optional[str] = None, start_block: Optional[int] = None,
+                 confirmations: int = 12, window_blocks: int = 100000,
+                 whale_threshold: float = 1000000):
+        """
+        Initialize the index, loading the last checkpoint if present.
+
+        Args:
+            token_address: WILD token contract
+            client: JSON-RPC client (defaults to ETH_RPC_URL / Infura / local node)
+            cache_dir: Directory for the checkpoint files
+            start_block: First block to replay (defaults to the token's creation block)
+            confirmations: Blocks behind head to stop at
+            window_blocks: Blocks applied between checkpoints during a refresh
+            whale_threshold: Transfers of at least this many WILD are kept as whale moves
+        """
+        self.token = token_address.lower()
+        self.client = client or JsonRpcClient()
+        self.indexer = TransferLogIndexer(self.client)
+        # Resolved (and cached) when the table is first reset
+        self.start_block = start_block
+        self.confirmations = confirmations
+        self.window_blocks = window_blocks
+        self.whale_threshold = whale_threshold
+
+        if cache_dir is None:
+            cache_dir = Path(__file__).parent.parent / 'data' / 'cache'
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.checkpoint_file = self.cache_dir / 'holder_index.npz'
+        self.whale_file = self.cache_dir / 'holder_index_whales.json'
+
+        self._reset()
+        self._load_checkpoint()
+
+    def _reset(self):
+        """Start from an empty table."""
+        self.address_ids: Dict[str, int] = {}
+        self.addresses: List[str] = []
+        self.whole = np.zeros(1024, dtype=np.int64)
+        self.frac = np.zeros(1024, dtype=np.int64)
+        if self.start_block is None:
+            self.start_block = deploy_block(self.client, self.token, self.cache_dir)
+        self.last_block = self.start_block - 1
+        self.whale_moves: List[Dict[str, Any]] = []
+
+    def _load_checkpoint(self):
+        """Restore the table from the last checkpoint."""
+        if not self.checkpoint_file.exists():
+            return
+
+        with np.load(self.checkpoint_file, allow_pickle=False) as data:
+            if str(data['token']) != self.token:
+                logger.info("Holder index checkpoint is for another token, starting over")
+                return
+            self.addresses = data['addresses'].tolist()
+            self.whole = data['whole'].copy()
+            self.frac = data['frac'].copy()
+            self.last_block = int(data['last_block'])
+
+        self.address_ids = {address: i for i, address in enumerate(self.addresses)}
+        if self.whale_file.exists():
+            with open(self.whale_file, 'r') as f:
+                self.whale_moves = json.load(f)
+
+        logger.info(f"Loaded holder index with {len(self.addresses)} addresses at block {self.last_block}")
+
+    def _save_checkpoint(self):
+        """Persist the table and its block checkpoint."""
+        size = len(self.addresses)
+        np.savez_compressed(
+            self.checkpoint_file,
+            token=np.array(self.token),
+            addresses=np.array(self.addresses, dtype='U42'),
+            whole=self.whole[:size],
+            frac=self.frac[:size],
+            last_block=np.array(self.last_block)
+        )
+        with open(self.whale_file, 'w') as f:
+            json.dump(self.whale_moves, f, indent=2)
+
+    def _intern(self, addresses: Iterable[str]) -> np.ndarray:
+        """Map addresses to integer ids, growing the balance arrays as needed."""
+        ids = []
+        for address in addresses:
+            address_id = self.address_ids.get(address)
+            if address_id is None:
+                address_id = len(self.addresses)
+                self.address_ids[address] = address_id
+                self.addresses.append(address)
+            ids.append(address_id)
+
+        if len(self.addresses) > len(self.whole):
+            capacity = max(len(self.addresses), len(self.whole) * 2)
+            self.whole = np.concatenate([self.whole, np.zeros(capacity - len(self.whole), dtype=np.int64)])
+            self.frac = np.concatenate([self.frac, np.zeros(capacity - len(self.frac), dtype=np.int64)])
+
+        return np.array(ids, dtype=np.int64)
+
+    def apply_transfers(self, senders: List[str], receivers: List[str], amounts: List[int]):
+        """Apply a batch of transfers (amounts in wei) to the balance table."""
+        if not amounts:
+            return
+
+        n = len(amounts)
+        whole = np.fromiter((a // WEI_PER_TOKEN for a in amounts), dtype=np.int64, count=n)
+        high = np.fromiter((a % WEI_PER_TOKEN // LIMB for a in amounts), dtype=np.int64, count=n)
+        low = np.fromiter((a % LIMB for a in amounts), dtype=np.int64, count=n)
+
+        ids = np.concatenate([self._intern(receivers), self._intern(senders)])
+        touched, slots = np.unique(ids, return_inverse=True)
+
+        acc_whole = np.zeros(len(touched), dtype=np.int64)
+        acc_high = np.zeros(len(touched), dtype=np.int64)
+        acc_low = np.zeros(len(touched), dtype=np.int64)
+        np.add.at(acc_whole, slots, np.concatenate([whole, -whole]))
+        np.add.at(acc_high, slots, np.concatenate([high, -high]))
+        np.add.at(acc_low, slots, np.concatenate([low, -low]))
+
+        # Normalise limbs (floor division keeps remainders non-negative for debits)
+        carry = acc_low // LIMB
+        acc_high += carry
+        acc_low -= carry * LIMB
+        carry = acc_high // LIMB
+        acc_whole += carry
+        acc_high -= carry * LIMB
+
+        frac = self.frac[touched] + acc_high * LIMB + acc_low
+        carry = frac // WEI_PER_TOKEN
+        self.whole[touched] += acc_whole + carry
+        self.frac[touched] = frac - carry * WEI_PER_TOKEN
+
+    def refresh(self, to_block: Optional[int] = None) -> int:
+        """
+        Apply Transfers from blocks after the checkpoint, saving after each window.
+
+        Returns:
+            Number of Transfer logs applied
+        """
+        if to_block is None:
+            to_block = self.client.block_number() - self.confirmations
+
+        applied = 0
+        while self.last_block < to_block:
+            start = self.last_block + 1
+            end = min(start + self.window_blocks - 1, to_block)
+
+            logs = self.indexer.get_logs(start, end, self.token, [TRANSFER_TOPIC])
+            senders, receivers, amounts = [], [], []
+            for log in logs:
+                if len(log['topics']) < 3:
+                    continue
+                amount = int(log['data'], 16) if log.get('data') not in (None, '0x') else 0
+                senders.append(topic_to_address(log['topics'][1]))
+                receivers.append(topic_to_address(log['topics'][2]))
+                amounts.append(amount)
+
+                if amount >= self.whale_threshold * WEI_PER_TOKEN:
+                    self.whale_moves.append({
+                        'block': int(log['blockNumber'], 16),
+                        'hash': log['transactionHash'],
+                        'from': senders[-1],
+                        'to': receivers[-1],
+                        'amount': amount / WEI_PER_TOKEN
+                    })
+
+            self.apply_transfers(senders, receivers, amounts)
+            self.last_block = end
+            self._save_checkpoint()
+            applied += len(amounts)
+            logger.info(f"Holder index applied {len(amounts)} transfers from blocks {start}-{end}")
+
+        return applied
+
+    def balances(self) -> np.ndarray:
+        """Return balances in whole WILD as a float64 array aligned with address ids."""
+        size = len(self.addresses)
+        return self.whole[:size] + self.frac[:size] / WEI_PER_TOKEN
+
+    def balance_of(self, address: str) -> float:
+        """Return the indexed balance of an address in whole WILD."""
+        address_id = self.address_ids.get(address.lower())
+        if address_id is None:
+            return 0.0
+        return self.whole[address_id] + self.frac[address_id] / WEI_PER_TOKEN
+
+    def _holder_balances(self, exclude: Optional[Iterable[str]] = None):
+        """Return (ids, balances) of positive holders, skipping zero/dead and excluded addresses."""
+        balances = self.balances()
+        mask = balances > 0
+        for address in [ZERO_ADDRESS, DEAD_ADDRESS] + [a.lower() for a in (exclude or [])]:
+            address_id = self.address_ids.get(address)
+            if address_id is not None:
+                mask[address_id] = False
+        ids = np.flatnonzero(mask)
+        return ids, balances[ids]
+
+    def holder_count(self, exclude: Optional[Iterable[str]] = None) -> int:
+        """Number of addresses with a positive balance."""
+        return len(self._holder_balances(exclude)[0])
+
+    def top_holders(self, n: int = 20, exclude: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Return the n largest holders with balance and share of held supply."""
+        ids, balances = self._holder_balances(exclude)
+        if len(ids) == 0:
+            return []
+
+        n = min(n, len(ids))
+        top = np.argpartition(balances, -n)[-n:]
+        top = top[np.argsort(balances[top])[::-1]]
+        total = balances.sum()
+
+        return [{
+            'rank': rank + 1,
+            'address': self.addresses[ids[i]],
+            'balance': float(balances[i]),
+            'share_pct': float(balances[i] / total * 100)
+        } for rank, i in enumerate(top)]
+
+    def concentration_metrics(self, exclude: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Compute holder concentration metrics over positive balances."""
+        ids, balances = self._holder_balances(exclude)
+        if len(balances) == 0:
+            return {'holder_count': 0, 'as_of_block': self.last_block}
+
+        ordered = np.sort(balances)[::-1]
+        total = ordered.sum()
+        shares = ordered / total
+        cumulative = np.cumsum(shares)
+
+        # Gini over ascending balances
+        ascending = ordered[::-1]
+        n = len(ascending)
+        gini = (2 * np.sum(np.arange(1, n + 1) * ascending) / (n * total)) - (n + 1) / n
+
+        return {
+            'as_of_block': self.last_block,
+            'holder_count': n,
+            'held_supply': float(total),
+            'top10_share_pct': float(cumulative[min(10, n) - 1] * 100),
+            'top50_share_pct': float(cumulative[min(50, n) - 1] * 100),
+            'top100_share_pct': float(cumulative[min(100, n) - 1] * 100),
+            'hhi': float(np.sum(shares ** 2) * 10000),
+            'gini': float(gini),
+            'holders_for_majority': int(np.searchsorted(cumulative, 0.5) + 1)
+        }
+
+    def get_whale_moves(self, from_block: int = 0, to_block: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return recorded transfers above the whale threshold within a block range."""
+        to_block = self.last_block if to_block is None else to_block
+        return [move for move in self.whale_moves if from_block <= move['block'] <= to_block]
@@ -0,0 +1,214 @@
+"""
+Batch static image export for plotly figures.
+One kaleido renderer process is started and warmed up per exporter and kept
+running; figures are fed to it through a bounded queue from a single worker
+thread, so a run's charts export in one pass instead of paying the renderer
+startup per image.
+"""
+
+import os
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple, Union
+
+import plotly
+import plotly.graph_objects as go
+
+try:
+    from kaleido.scopes.plotly import PlotlyScope
+except ImportError:
+    # Static export is optional; HTML reports and payloads do not need it
+    PlotlyScope = None
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+MIME_TYPES = {
+    'png': 'image/png',
+    'jpeg': 'image/jpeg',
+    'webp': 'image/webp',
+    'svg': 'image/svg+xml',
+    'pdf': 'application/pdf'
+}
+
+# Figures waiting for the renderer before submitters block
+QUEUE_SIZE = 8
+
+_STOP = object()
+
+Figures = Union[Dict[str, Any], Iterable[Tuple[str, Any]]]
+
+
+def kaleido_available() -> bool:
+    return PlotlyScope is not None
+
+
+class ImageExporter:
+    """Persistent kaleido renderer fed through a bounded queue."""
+
+    def __init__(self, width: Optional[int] = None, height: Optional[int] = None,
+                 scale: float = 1, queue_size: int = QUEUE_SIZE):
+        """
+        Initialize the exporter; the renderer starts on start() or first use.
+
+        Args:
+            width: Image width in layout pixels (defaults to each figure's layout width)
+            height: Image height in layout pixels (defaults to each figure's layout height)
+            scale: Pixel density multiplier for raster formats
+            queue_size: Figures buffered for the renderer before submit() blocks
+        """
+        if PlotlyScope is None:
+            raise RuntimeError("Static image export needs kaleido (pip install kaleido==0.2.1)")
+        self.width = width
+        self.height = height
+        self.scale = scale
+        self.jobs = queue.Queue(maxsize=queue_size)
+        self.ready = threading.Event()
+        self.startup_error = None
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def start(self) -> 'ImageExporter':
+        """Launch and warm up the renderer process in the worker thread."""
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name='image-export', daemon=True)
+                self.thread.start()
+        self.ready.wait()
+        if self.startup_error is not None:
+            raise RuntimeError(f"Could not start the kaleido renderer: {self.startup_error}")
+        return self
+
+    def _run(self):
+        try:
+            # Render with the plotly.js bundled with plotly, as fig.write_image does
+            scope = PlotlyScope(plotlyjs=os.path.join(os.path.dirname(plotly.__file__), 'package_data', 'plotly.min.js'))
+            # The first transform launches the renderer; pay that once, before any real figure waits on it
+            scope.transform(go.Figure().to_dict(), format='png', width=10, height=10)
+        except Exception as e:
+            self.startup_error = e
+            self.ready.set()
+            return
+        self.ready.set()
+        logger.info("Image renderer ready")
+
+        try:
+            while True:
+                job = self.jobs.get()
+                if job is _STOP:
+                    break
+                spec, fmt, future = job
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    future.set_result(scope.transform(spec, format=fmt, width=self.width,
+                                                      height=self.height, scale=self.scale))
+                except Exception as e:
+                    future.set_exception(e)
+        finally:
+            scope._shutdown_kaleido()
+
+    def submit(self, fig: Any, fmt: str = 'png') -> Future:
+        """
+        Queue one figure for rendering.
+
+        Blocks while the queue is full, so a producer building figures never runs
+        far ahead of the renderer.
+
+        Args:
+            fig: Figure or figure dict
+            fmt: One of MIME_TYPES
+
+        Returns:
+            Future resolving to the image bytes
+        """
+        if fmt not in MIME_TYPES:
+            raise ValueError(f"Unsupported image format {fmt!r}; expected one of {sorted(MIME_TYPES)}")
+        self.start()
+        spec = fig.to_dict() if isinstance(fig, go.Figure) else fig
+        future = Future()
+        self.jobs.put((spec, fmt, future))
+        return future
+
+    def to_images(self, figures: Figures, fmt: str = 'png') -> Dict[str, bytes]:
+        """
+        Render a batch of figures.
+
+        Args:
+            figures: Figures by name, or (name, figure) pairs; a generator lets
+                building the next figure overlap rendering the previous one
+            fmt: Image format
+
+        Returns:
+            Image bytes by figure name; figures that failed to render are left out
+        """
+        futures = {name: self.submit(fig, fmt) for name, fig in _items(figures)}
+        images = {}
+        for name, future in futures.items():
+            try:
+                images[name] = future.result()
+            except Exception as e:
+                logger.error(f"Could not export chart {name} as {fmt}: {e}")
+        return images
+
+    def write_images(self, figures: Figures, directory: Union[str, Path],
+                     formats: Sequence[str] = ('png',)) -> Dict[str, Dict[str, Path]]:
+        """
+        Render a batch of figures to <directory>/<name>.<format> files.
+
+        Args:
+            figures: Figures by name, or (name, figure) pairs
+            directory: Output directory (created if missing)
+            formats: Image formats written for every figure
+
+        Returns:
+            Written paths by figure name and format
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        futures = []
+        for name, fig in _items(figures):
+            spec = fig.to_dict() if isinstance(fig, go.Figure) else fig
+            futures.extend((name, fmt, self.submit(spec, fmt)) for fmt in formats)
+
+        written: Dict[str, Dict[str, Path]] = {}
+        for name, fmt, future in futures:
+            try:
+                image = future.result()
+            except Exception as e:
+                logger.error(f"Could not export chart {name} as {fmt}: {e}")
+                continue
+            path = directory / f'{name}.{fmt}'
+            partial = path.with_name(path.name + '.tmp')
+            partial.write_bytes(image)
+            os.replace(partial, path)
+            written.setdefault(name, {})[fmt] = path
+        logger.info(f"Exported {sum(len(paths) for paths in written.values())} images to {directory}")
+        return written
+
+    def close(self):
+        """Finish queued figures and shut the renderer down."""
+        with self.lock:
+            thread, self.thread = self.thread, None
+        if thread is not None:
+            if self.startup_error is None:
+                self.jobs.put(_STOP)
+            thread.join()
+            self.ready.clear()
+
+    def __enter__(self) -> 'ImageExporter':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _items(figures: Figures) -> Iterable[Tuple[str, Any]]:
+    return figures.items() if isinstance(figures, dict) else figures
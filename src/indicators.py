@@ -0,0 +1,395 @@
+"""
+Incremental technical indicators for WILD and ETH.
+SMA, EMA, RSI, Bollinger Bands and ATR are kept as running state and updated in
+O(1) per new candle. The state is persisted between runs, so a dashboard refresh
+only folds in the candles that closed since the last one.
+"""
+
+import os
+import sys
+import json
+import math
+import logging
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import pandas as pd
+
+# Add src to path so sibling modules resolve when imported as src.<module>
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from price_fetcher import PriceFetcher
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# (coin, interval) series kept up to date by default
+DEFAULT_SERIES = (('WILD', '1d'), ('ETH', '1d'), ('WILD', '1h'), ('ETH', '1h'))
+
+# Candle length per supported interval
+INTERVALS = {'1d': pd.Timedelta(days=1), '1h': pd.Timedelta(hours=1)}
+
+
+class SMA:
+    """Simple moving average over a fixed window, with a running sum."""
+
+    def __init__(self, period: int = 20):
+        self.period = period
+        self.window = deque(maxlen=period)
+        self.total = 0.0
+
+    def update(self, value: float) -> Optional[float]:
+        if len(self.window) == self.period:
+            self.total -= self.window[0]
+        self.window.append(value)
+        self.total += value
+        return self.value
+
+    @property
+    def value(self) -> Optional[float]:
+        return self.total / self.period if len(self.window) == self.period else None
+
+    def to_state(self) -> Dict[str, Any]:
+        return {'period': self.period, 'window': list(self.window)}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'SMA':
+        indicator = cls(state['period'])
+        for value in state['window']:
+            indicator.update(value)
+        return indicator
+
+
+class EMA:
+    """Exponential moving average, seeded with the SMA of the first period values."""
+
+    def __init__(self, period: int = 50):
+        self.period = period
+        self.alpha = 2 / (period + 1)
+        self.count = 0
+        self.current: Optional[float] = None
+
+    def update(self, value: float) -> Optional[float]:
+        self.count += 1
+        if self.count <= self.period:
+            # Running mean until the seed window is complete
+            self.current = value if self.current is None else self.current + (value - self.current) / self.count
+        else:
+            self.current += self.alpha * (value - self.current)
+        return self.value
+
+    @property
+    def value(self) -> Optional[float]:
+        return self.current if self.count >= self.period else None
+
+    def to_state(self) -> Dict[str, Any]:
+        return {'period': self.period, 'count': self.count, 'current': self.current}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'EMA':
+        indicator = cls(state['period'])
+        indicator.count, indicator.current = state['count'], state['current']
+        return indicator
+
+
+class RSI:
+    """Relative Strength Index with Wilder smoothing."""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.count = 0
+        self.previous: Optional[float] = None
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+
+    def update(self, value: float) -> Optional[float]:
+        if self.previous is not None:
+            change = value - self.previous
+            gain, loss = max(change, 0.0), max(-change, 0.0)
+            self.count += 1
+            if self.count <= self.period:
+                self.avg_gain += (gain - self.avg_gain) / self.count
+                self.avg_loss += (loss - self.avg_loss) / self.count
+            else:
+                self.avg_gain = (self.avg_gain * (self.period - 1) + gain) / self.period
+                self.avg_loss = (self.avg_loss * (self.period - 1) + loss) / self.period
+        self.previous = value
+        return self.value
+
+    @property
+    def value(self) -> Optional[float]:
+        if self.count < self.period:
+            return None
+        if self.avg_loss == 0:
+            return 100.0
+        return 100 - 100 / (1 + self.avg_gain / self.avg_loss)
+
+    def to_state(self) -> Dict[str, Any]:
+        return {'period': self.period, 'count': self.count, 'previous': self.previous,
+                'avg_gain': self.avg_gain, 'avg_loss': self.avg_loss}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'RSI':
+        indicator = cls(state['period'])
+        indicator.count, indicator.previous = state['count'], state['previous']
+        indicator.avg_gain, indicator.avg_loss = state['avg_gain'], state['avg_loss']
+        return indicator
+
+
+class Bollinger:
+    """Bollinger Bands from running sums of the window and its squares."""
+
+    def __init__(self, period: int = 20, width: float = 2.0):
+        self.period = period
+        self.width = width
+        self.window = deque(maxlen=period)
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def update(self, value: float) -> Optional[Tuple[float, float, float]]:
+        if len(self.window) == self.period:
+            oldest = self.window[0]
+            self.total -= oldest
+            self.total_sq -= oldest * oldest
+        self.window.append(value)
+        self.total += value
+        self.total_sq += value * value
+        return self.value
+
+    @property
+    def value(self) -> Optional[Tuple[float, float, float]]:
+        """(lower, middle, upper) using the population standard deviation."""
+        if len(self.window) < self.period:
+            return None
+        mean = self.total / self.period
+        std = math.sqrt(max(self.total_sq / self.period - mean * mean, 0.0))
+        return mean - self.width * std, mean, mean + self.width * std
+
+    def to_state(self) -> Dict[str, Any]:
+        return {'period': self.period, 'width': self.width, 'window': list(self.window)}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'Bollinger':
+        indicator = cls(state['period'], state['width'])
+        for value in state['window']:
+            indicator.update(value)
+        return indicator
+
+
+class ATR:
+    """Average True Range with Wilder smoothing."""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.count = 0
+        self.previous_close: Optional[float] = None
+        self.current = 0.0
+
+    def update(self, high: float, low: float, close: float) -> Optional[float]:
+        if self.previous_close is None:
+            true_range = high - low
+        else:
+            true_range = max(high - low, abs(high - self.previous_close), abs(low - self.previous_close))
+        self.count += 1
+        if self.count <= self.period:
+            self.current += (true_range - self.current) / self.count
+        else:
+            self.current = (self.current * (self.period - 1) + true_range) / self.period
+        self.previous_close = close
+        return self.value
+
+    @property
+    def value(self) -> Optional[float]:
+        return self.current if self.count >= self.period else None
+
+    def to_state(self) -> Dict[str, Any]:
+        return {'period': self.period, 'count': self.count,
+                'previous_close': self.previous_close, 'current': self.current}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'ATR':
+        indicator = cls(state['period'])
+        indicator.count, indicator.previous_close = state['count'], state['previous_close']
+        indicator.current = state['current']
+        return indicator
+
+
+class IndicatorSet:
+    """All indicators for one (coin, interval) series plus a bounded tail of their values."""
+
+    COLUMNS = ['time', 'open', 'high', 'low', 'close', 'volume', 'sma', 'ema', 'rsi',
+               'bb_lower', 'bb_middle', 'bb_upper', 'atr']
+
+    def __init__(self, sma_period: int = 20, ema_period: int = 50, rsi_period: int = 14,
+                 bb_period: int = 20, bb_width: float = 2.0, atr_period: int = 14,
+                 history_size: int = 500):
+        self.sma = SMA(sma_period)
+        self.ema = EMA(ema_period)
+        self.rsi = RSI(rsi_period)
+        self.bollinger = Bollinger(bb_period, bb_width)
+        self.atr = ATR(atr_period)
+        self.last_time: Optional[pd.Timestamp] = None
+        self.history = deque(maxlen=history_size)
+
+    def update(self, time: pd.Timestamp, bar: Dict[str, float]) -> Dict[str, Any]:
+        """Fold one closed candle into every indicator."""
+        close = bar['close']
+        bands = self.bollinger.update(close) or (None, None, None)
+        row = {
+            'time': time.isoformat(),
+            'open': bar['open'], 'high': bar['high'], 'low': bar['low'], 'close': close,
+            'volume': None if pd.isna(bar.get('volume')) else bar.get('volume'),
+            'sma': self.sma.update(close),
+            'ema': self.ema.update(close),
+            'rsi': self.rsi.update(close),
+            'bb_lower': bands[0], 'bb_middle': bands[1], 'bb_upper': bands[2],
+            'atr': self.atr.update(bar['high'], bar['low'], close)
+        }
+        self.last_time = time
+        self.history.append(row)
+        return row
+
+    def fold(self, candles: pd.DataFrame) -> int:
+        """Fold in every candle newer than the last one seen; returns how many were new."""
+        if self.last_time is not None:
+            candles = candles[candles.index > self.last_time]
+        for time, bar in zip(candles.index, candles.to_dict('records')):
+            self.update(time, bar)
+        return len(candles)
+
+    def frame(self) -> pd.DataFrame:
+        """Recent candles with their indicator values."""
+        frame = pd.DataFrame(list(self.history), columns=self.COLUMNS)
+        frame['time'] = pd.to_datetime(frame['time'])
+        return frame.set_index('time')
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            'sma': self.sma.to_state(), 'ema': self.ema.to_state(), 'rsi': self.rsi.to_state(),
+            'bollinger': self.bollinger.to_state(), 'atr': self.atr.to_state(),
+            'last_time': self.last_time.isoformat() if self.last_time is not None else None,
+            'history_size': self.history.maxlen, 'history': list(self.history)
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'IndicatorSet':
+        indicators = cls(history_size=state['history_size'])
+        indicators.sma = SMA.from_state(state['sma'])
+        indicators.ema = EMA.from_state(state['ema'])
+        indicators.rsi = RSI.from_state(state['rsi'])
+        indicators.bollinger = Bollinger.from_state(state['bollinger'])
+        indicators.atr = ATR.from_state(state['atr'])
+        indicators.last_time = pd.Timestamp(state['last_time']) if state['last_time'] else None
+        indicators.history.extend(state['history'])
+        return indicators
+
+
+class IndicatorEngine:
+    """Keeps indicator state for several price series and persists it between runs."""
+
+    def __init__(self, price_fetcher: Optional[PriceFetcher] = None, state_file: Optional[str] = None,
+                 series: Sequence[Tuple[str, str]] = DEFAULT_SERIES, hourly_days: int = 7):
+        """
+        Initialize the engine.
+
+        Args:
+            price_fetcher: Source of daily (bundled) and hourly (CoinGecko) candles
+            state_file: JSON file holding the indicator state
+            series: (coin, interval) pairs to maintain; interval is '1d' or '1h'
+            hourly_days: Days of hourly candles requested per refresh
+        """
+        self.price_fetcher = price_fetcher or PriceFetcher()
+        if state_file is None:
+            state_file = Path(__file__).parent.parent / 'data' / 'cache' / 'indicator_state.json'
+        self.state_file = Path(state_file)
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        self.series = list(series)
+        self.hourly_days = hourly_days
+        self.sets = self._load_state()
+
+    @staticmethod
+    def key(coin: str, interval: str) -> str:
+        return f"{coin}:{interval}"
+
+    def _load_state(self) -> Dict[str, IndicatorSet]:
+        """Restore indicator state from disk."""
+        if not self.state_file.exists():
+            return {}
+        try:
+            with open(self.state_file, 'r') as f:
+                return {key: IndicatorSet.from_state(state) for key, state in json.load(f).items()}
+        except (json.JSONDecodeError, KeyError) as e:
+            logger.warning(f"Discarding unreadable indicator state: {e}")
+            return {}
+
+    def save_state(self):
+        """Persist indicator state."""
+        with open(self.state_file, 'w') as f:
+            json.dump({key: indicators.to_state() for key, indicators in self.sets.items()}, f)
+
+    def candles(self, coin: str, interval: str) -> pd.DataFrame:
+        """Closed candles for a series."""
+        if interval == '1d':
+            return self.price_fetcher.load_ohlcv(coin)
+        if interval == '1h':
+            return self.price_fetcher.get_hourly_candles(coin, days=self.hourly_days)
+        raise ValueError(f"Unsupported interval: {interval}")
+
+    def due(self, coin: str, interval: str) -> bool:
+        """Whether a candle newer than the last folded one can have closed yet."""
+        if interval not in INTERVALS:
+            raise ValueError(f"Unsupported interval: {interval}")
+        indicators = self.sets.get(self.key(coin, interval))
+        if indicators is None or indicators.last_time is None:
+            return True
+        # Candles are indexed by open time, so the next one closes two lengths after the last
+        now = pd.Timestamp.now('UTC').tz_localize(None)
+        return now >= indicators.last_time + 2 * INTERVALS[interval]
+
+    def refresh(self, force: bool = False) -> Dict[str, int]:
+        """
+        Fold new candles into every series and save the state.
+
+        Series whose next candle cannot have closed yet are skipped without
+        loading anything, so repeated refreshes within one candle are free.
+
+        Args:
+            force: Load every series even if no new candle is due
+
+        Returns:
+            Number of new candles per series that was loaded
+        """
+        folded = {}
+        for coin, interval in self.series:
+            key = self.key(coin, interval)
+            if not force and not self.due(coin, interval):
+                continue
+            try:
+                candles = self.candles(coin, interval)
+            except Exception as e:
+                logger.warning(f"Could not load {key} candles: {e}")
+                continue
+            indicators = self.sets.setdefault(key, IndicatorSet())
+            folded[key] = indicators.fold(candles)
+
+        if any(folded.values()):
+            self.save_state()
+            logger.info(f"Folded new candles into indicators: {folded}")
+        return folded
+
+    def frame(self, coin: str, interval: str = '1d') -> pd.DataFrame:
+        """Recent candles and indicator values for a series."""
+        indicators = self.sets.get(self.key(coin, interval))
+        if indicators is None:
+            return pd.DataFrame(columns=IndicatorSet.COLUMNS[1:])
+        return indicators.frame()
+
+    def latest(self, coin: str, interval: str = '1d') -> Dict[str, Any]:
+        """Most recent candle and indicator values for a series."""
+        indicators = self.sets.get(self.key(coin, interval))
+        return dict(indicators.history[-1]) if indicators and indicators.history else {}
@@ -0,0 +1,323 @@
+"""
+Local live dashboard server.
+Keeps the latest tracker and analyzer results in memory, serves them as JSON
+with ETags, and pushes changed sections to open pages over server-sent events,
+so the overview updates without regenerating any files.
+"""
+
+import json
+import queue
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Seconds between keep-alive comments on idle event streams
+HEARTBEAT_SECONDS = 15
+
+# Updates buffered per event stream before a stalled client is dropped
+SUBSCRIBER_BUFFER = 100
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, default=str, sort_keys=True, separators=(',', ':'))
+
+
+class LiveState:
+    """Versioned in-memory dashboard state with change notification."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = 0
+        self.sections: Dict[str, Any] = {}
+        self._encoded: Dict[str, str] = {}
+        self._subscribers: List[queue.Queue] = []
+
+    def update(self, changes: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Merge new section values and notify subscribers of the ones that changed.
+
+        Args:
+            changes: New values by section name
+
+        Returns:
+            The sections whose content actually changed (empty if none did)
+        """
+        with self.lock:
+            delta = {}
+            for section, value in changes.items():
+                encoded = _dumps(value)
+                if self._encoded.get(section) != encoded:
+                    self._encoded[section] = encoded
+                    self.sections[section] = json.loads(encoded)
+                    delta[section] = self.sections[section]
+            if not delta:
+                return delta
+
+            self.version += 1
+            event = _dumps({'version': self.version, 'changes': delta})
+            for subscriber in list(self._subscribers):
+                try:
+                    subscriber.put_nowait((self.version, event))
+                except queue.Full:
+                    # Drop a client that stopped reading; its handler sees this and closes the stream
+                    self._subscribers.remove(subscriber)
+            return delta
+
+    def snapshot(self, section: Optional[str] = None) -> Tuple[str, str]:
+        """JSON body and ETag for the whole state or for one section."""
+        with self.lock:
+            if section is None:
+                body = _dumps({'version': self.version, 'sections': self.sections})
+            elif section in self._encoded:
+                body = self._encoded[section]
+            else:
+                raise KeyError(section)
+        # Hash the content rather than use the version, which restarts with each process
+        return body, f'"{hashlib.sha1(body.encode()).hexdigest()[:16]}"'
+
+    def subscribe(self) -> Tuple[queue.Queue, str, int]:
+        """Register an event stream; returns its queue and the state it starts from."""
+        subscriber = queue.Queue(maxsize=SUBSCRIBER_BUFFER)
+        with self.lock:
+            self._subscribers.append(subscriber)
+            initial = _dumps({'version': self.version, 'changes': self.sections})
+            return subscriber, initial, self.version
+
+    def unsubscribe(self, subscriber: queue.Queue):
+        with self.lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+    def is_subscribed(self, subscriber: queue.Queue) -> bool:
+        with self.lock:
+            return subscriber in self._subscribers
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Routes: / (overview page), /api/state[/<section>] (JSON), /events (SSE)."""
+
+    state: LiveState = None
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format: str, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0].rstrip('/') or '/'
+        if path == '/':
+            self._send(HTTPStatus.OK, OVERVIEW_PAGE.encode('utf-8'), 'text/html; charset=utf-8')
+        elif path == '/api/state':
+            self._send_json(*self.state.snapshot())
+        elif path.startswith('/api/state/'):
+            try:
+                self._send_json(*self.state.snapshot(path[len('/api/state/'):]))
+            except KeyError:
+                self._send(HTTPStatus.NOT_FOUND, b'{"error":"unknown section"}', 'application/json')
+        elif path == '/events':
+            self._stream_events()
+        else:
+            self._send(HTTPStatus.NOT_FOUND, b'{"error":"not found"}', 'application/json')
+
+    def _send(self, status: HTTPStatus, body: bytes, content_type: str, headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def _send_json(self, body: str, etag: str):
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        if self.headers.get('If-None-Match') == etag:
+            self._send(HTTPStatus.NOT_MODIFIED, b'', 'application/json', headers)
+        else:
+            self._send(HTTPStatus.OK, body.encode('utf-8'), 'application/json', headers)
+
+    def _stream_events(self):
+        subscriber, initial, version = self.state.subscribe()
+        try:
+            self.send_response(HTTPStatus.OK)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Connection', 'keep-alive')
+            self.end_headers()
+
+            # A fresh stream starts from the full state; later events carry only changed sections
+            self._write_event(version, initial, 'state')
+            while self.state.is_subscribed(subscriber):
+                try:
+                    version, event = subscriber.get(timeout=HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    self.wfile.write(b': keep-alive\n\n')
+                    self.wfile.flush()
+                    continue
+                self._write_event(version, event, 'delta')
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            self.state.unsubscribe(subscriber)
+            self.close_connection = True
+
+    def _write_event(self, version: int, data: str, event: str):
+        self.wfile.write(f'id: {version}\nevent: {event}\ndata: {data}\n\n'.encode('utf-8'))
+        self.wfile.flush()
+
+
+class LiveDashboardServer:
+    """Threaded HTTP server publishing a LiveState on localhost."""
+
+    def __init__(self, state: Optional[LiveState] = None, host: str = '127.0.0.1', port: int = 8050):
+        """
+        Initialize the server.
+
+        Args:
+            state: State to serve (a new empty one by default)
+            host: Interface to bind; keep it local, there is no authentication
+            port: TCP port (0 picks a free one)
+        """
+        self.state = state or LiveState()
+        handler = type('LiveDashboardHandler', (_Handler,), {'state': self.state})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}/'
+
+    def publish(self, changes: Dict[str, Any]) -> Dict[str, Any]:
+        """Update the served state; open pages receive the changed sections."""
+        changes = {**changes, 'updated_at': datetime.now().isoformat(timespec='seconds')}
+        delta = self.state.update(changes)
+        logger.info(f"Published live update v{self.state.version}: {sorted(delta)}")
+        return delta
+
+    def start(self) -> 'LiveDashboardServer':
+        """Serve in a background thread."""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name='live-dashboard', daemon=True)
+        self.thread.start()
+        logger.info(f"Live dashboard at {self.url}")
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+OVERVIEW_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Operation Titan Live</title>
+    <style>
+        body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+               background-color: #0a0a0a; color: #ffffff; margin: 0; line-height: 1.6; }
+        .container { max-width: 1400px; margin: 0 auto; padding: 20px; }
+        .header { background: linear-gradient(135deg, #2a3bff 0%, #00d4ff 100%); padding: 30px 40px;
+                  border-radius: 16px; margin-bottom: 30px; }
+        .header h1 { margin: 0; font-size: 2.2em; }
+        .status { color: rgba(255, 255, 255, 0.8); }
+        .metrics { display: grid; grid-template-columns: repeat(auto-fit, minmax(220px, 1fr)); gap: 20px;
+                   margin-bottom: 30px; }
+        .metric { background: #1a1a1a; border-radius: 12px; padding: 20px; border: 1px solid #333;
+                  transition: border-color 0.5s ease; }
+        .metric.changed { border-color: #00d4ff; }
+        .metric .label { color: #999; font-size: 0.9em; }
+        .metric .value { font-size: 1.6em; font-weight: bold; color: #00d4ff; }
+        .alerts { background: #1a1a1a; border-radius: 12px; padding: 20px; border: 1px solid #333; }
+        .alert { padding: 8px 0; border-bottom: 1px solid #333; }
+        .alert.high { color: #ff3b3b; }
+        .alert.medium { color: #ffb700; }
+    </style>
+</head>
+<body>
+<div class="container">
+    <div class="header">
+        <h1>Operation Titan Live</h1>
+        <div id="status" class="status">Connecting...</div>
+    </div>
+    <div id="metrics" class="metrics"></div>
+    <div class="alerts"><h2>Recent Alerts</h2><div id="alerts">None</div></div>
+</div>
+<script>
+var state = {};
+var shown = {};
+
+function money(value, digits) {
+    return typeof value === 'number' ? '$' + value.toFixed(digits) : 'n/a';
+}
+
+function metrics() {
+    var prices = state.prices || {};
+    var titan = state.titan || {};
+    var signals = state.trading_signals || {};
+    var phase = titan.phase_status || {};
+    return [
+        ['WILD Price', money(prices.WILD, 4)],
+        ['ETH Price', money(prices.ETH, 2)],
+        ['Current Phase', phase.current_phase || 'n/a'],
+        ['Buyback Completion', typeof (state.completion || {}).overall === 'number'
+            ? state.completion.overall.toFixed(1) + '%' : 'n/a'],
+        ['Signal', signals.action ? signals.action.toUpperCase() : 'n/a'],
+        ['Last Check', (state.last_check || 'n/a').replace('T', ' ').slice(0, 19)]
+    ];
+}
+
+function render() {
+    var container = document.getElementById('metrics');
+    metrics().forEach(function(item) {
+        var id = 'metric-' + item[0].replace(/\\W+/g, '-');
+        var card = document.getElementById(id);
+        if (!card) {
+            card = document.createElement('div');
+            card.className = 'metric';
+            card.id = id;
+            card.innerHTML = '<div class="label">' + item[0] + '</div><div class="value"></div>';
+            container.appendChild(card);
+        }
+        if (shown[id] !== undefined && shown[id] !== item[1]) {
+            card.classList.add('changed');
+            setTimeout(function() { card.classList.remove('changed'); }, 1500);
+        }
+        shown[id] = item[1];
+        card.querySelector('.value').textContent = item[1];
+    });
+
+    var alerts = state.alerts || [];
+    document.getElementById('alerts').innerHTML = alerts.length ? alerts.slice().reverse().map(function(alert) {
+        var div = document.createElement('div');
+        div.textContent = String(alert.timestamp).replace('T', ' ').slice(0, 19) + '  ' + alert.message;
+        return '<div class="alert ' + alert.severity + '">' + div.innerHTML + '</div>';
+    }).join('') : 'None';
+    document.getElementById('status').textContent = 'Live' + (state.updated_at ? ' - updated ' + state.updated_at.replace('T', ' ') : '');
+}
+
+function apply(event) {
+    var message = JSON.parse(event.data);
+    Object.keys(message.changes).forEach(function(section) { state[section] = message.changes[section]; });
+    render();
+}
+
+var source = new EventSource('/events');
+source.addEventListener('state', function(event) { state = {}; apply(event); });
+source.addEventListener('delta', apply);
+source.onerror = function() { document.getElementById('status').textContent = 'Reconnecting...'; };
+</script>
+</body>
+</html>
+"""
@@ -0,0 +1,312 @@
+"""
+Transfer log indexer for Wilder World analysis.
+Pulls ERC20/ERC721 Transfer logs straight from a JSON-RPC node with eth_getLogs
+and decodes them into the same row schema Etherscan's token endpoints return,
+so WilderAnalyzer can consume either source unchanged.
+"""
+
+import os
+import sys
+import logging
+from typing import Dict, Iterable, List, Optional, Any
+
+from eth_abi import decode as abi_decode
+
+# Add src to path so sibling modules resolve when imported as src.<module>
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from rpc_client import JsonRpcClient, RPCError, is_rate_limited
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# keccak256('Transfer(address,address,uint256)') - shared by ERC20 and ERC721
+TRANSFER_TOPIC = '0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef'
+
+# Function selectors for token metadata
+NAME_SELECTOR = '0x06fdde03'
+SYMBOL_SELECTOR = '0x95d89b41'
+DECIMALS_SELECTOR = '0x313ce567'
+
+# Error fragments nodes use for a hard cap on the blocks one getLogs call may span
+BLOCK_RANGE_HINTS = (
+    'block range', 'range too large', 'range is too large', 'blocks range', 'range limit', 'max range',
+    'is limited to'
+)
+
+# Error fragments for a range that was too dense or too slow this time; a sparser range may pass
+RESULT_LIMIT_HINTS = (
+    'query returned more', 'too many results', 'too many logs', 'response size', 'result window',
+    'timeout', 'timed out'
+)
+
+
+def address_to_topic(address: str) -> str:
+    """Left-pad an address to a 32-byte log topic."""
+    return '0x' + '0' * 24 + address.lower().replace('0x', '')
+
+
+def topic_to_address(topic: str) -> str:
+    """Extract the address from a 32-byte log topic."""
+    return '0x' + topic[-40:].lower()
+
+
+class TransferLogIndexer:
+    """Indexes Transfer logs over block ranges with adaptive chunk sizing."""
+
+    def __init__(self, client: Optional[JsonRpcClient] = None, initial_chunk: int = 5000,
+                 min_chunk: int = 10, max_chunk: int = 200000, batch_size: int = 100):
+        """Initialize the indexer with an RPC client and chunking limits."""
+        self.client = client or JsonRpcClient()
+        self.chunk_size = initial_chunk
+        self.min_chunk = min_chunk
+        self.max_chunk = max_chunk
+
+        # Largest range known to be accepted; lowered whenever the node rejects one
+        self.chunk_ceiling = max_chunk
+        self.batch_size = batch_size
+
+        # Target logs per getLogs response; the chunk grows while responses stay below this
+        self.target_logs = 5000
+
+        # Per-run lookups shared across decode batches
+        self.block_timestamps: Dict[int, int] = {}
+        self.token_metadata: Dict[str, Dict[str, Any]] = {}
+
+    @staticmethod
+    def _is_block_range_limit(error: RPCError) -> bool:
+        """Check whether an RPC error is the node's fixed limit on the blocks per request."""
+        message = str(error).lower()
+        return any(hint in message for hint in BLOCK_RANGE_HINTS)
+
+    @staticmethod
+    def _is_result_limit(error: RPCError) -> bool:
+        """Check whether an RPC error means this range matched too many logs or took too long."""
+        message = str(error).lower()
+        return error.code == -32005 or any(hint in message for hint in RESULT_LIMIT_HINTS)
+
+    def get_logs(self, from_block: int, to_block: int, address: Optional[Any] = None,
+                 topics: Optional[List[Any]] = None) -> List[Dict]:
+        """
+        Fetch raw logs between two blocks (inclusive), splitting the range adaptively.
+
+        The chunk is halved whenever the node rejects a range and doubled after
+        responses well under the target size. Only an explicit block-range limit
+        caps later growth; a range rejected for its result count or for timing
+        out shrinks the chunk for now, and sparser ranges grow it back. Rate
+        limits are left to the client's backoff and propagate. The learned size
+        carries over to subsequent calls.
+
+        Args:
+            from_block: First block to scan
+            to_block: Last block to scan
+            address: Contract address or list of addresses to restrict to
+            topics: Topic filter list as accepted by eth_getLogs
+
+        Returns:
+            Raw log objects in block order
+        """
+        logs = []
+        start = from_block
+
+        while start <= to_block:
+            end = min(start + self.chunk_size - 1, to_block)
+            log_filter = {'fromBlock': hex(start), 'toBlock': hex(end)}
+            if address:
+                log_filter['address'] = address
+            if topics:
+                log_filter['topics'] = topics
+
+            try:
+                chunk_logs = self.client.call('eth_getLogs', [log_filter])
+            except RPCError as e:
+                if is_rate_limited(e) or self.chunk_size <= self.min_chunk:
+                    raise
+                if self._is_result_limit(e):
+                    self.chunk_size = max(self.min_chunk, self.chunk_size // 2)
+                elif self._is_block_range_limit(e):
+                    self.chunk_size = max(self.min_chunk, self.chunk_size // 2)
+                    self.chunk_ceiling = self.chunk_size
+                else:
+                    raise
+                logger.debug(f"Range {start}-{end} rejected, shrinking chunk to {self.chunk_size}")
+                continue
+
+            logs.extend(chunk_logs)
+            logger.debug(f"Blocks {start}-{end}: {len(chunk_logs)} logs")
+
+            if len(chunk_logs) < self.target_logs // 4:
+                self.chunk_size = min(self.chunk_ceiling, self.chunk_size * 2)
+            start = end + 1
+
+        return logs
+
+    def fetch_transfer_logs(self, addresses: Iterable[str], from_block: int = 0,
+                            to_block: Optional[int] = None,
+                            contracts: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Fetch raw Transfer logs sent from or received by any of the given addresses.
+
+        eth_getLogs cannot OR across topic positions, so one filter matches the
+        sender topic and one the recipient topic; both take the full address list.
+        """
+        if to_block is None:
+            to_block = self.client.block_number()
+
+        address_topics = [address_to_topic(a) for a in addresses]
+        contract_filter = [c.lower() for c in contracts] if contracts else None
+
+        sent = self.get_logs(from_block, to_block, contract_filter, [TRANSFER_TOPIC, address_topics])
+        received = self.get_logs(from_block, to_block, contract_filter, [TRANSFER_TOPIC, None, address_topics])
+
+        # Self-transfers and transfers between two tracked addresses match both filters
+        unique = {}
+        for log in sent + received:
+            unique[(log['transactionHash'], log['logIndex'])] = log
+
+        return sorted(unique.values(), key=lambda x: (int(x['blockNumber'], 16), int(x['logIndex'], 16)))
+
+    def _chunks(self, items: List[Any]) -> Iterable[List[Any]]:
+        """Yield items in RPC batch-sized slices."""
+        for i in range(0, len(items), self.batch_size):
+            yield items[i:i + self.batch_size]
+
+    def _load_block_timestamps(self, block_numbers: Iterable[int]) -> None:
+        """Batch-fetch timestamps for blocks not seen yet."""
+        missing = sorted(set(block_numbers) - set(self.block_timestamps))
+        for chunk in self._chunks(missing):
+            blocks = self.client.batch([('eth_getBlockByNumber', [hex(n), False]) for n in chunk])
+            for number, block in zip(chunk, blocks):
+                if block:
+                    self.block_timestamps[number] = int(block['timestamp'], 16)
+
+    @staticmethod
+    def _decode_string(result: Optional[str]) -> str:
+        """Decode an ABI string return value, tolerating bytes32-style tokens."""
+        if not result or result == '0x':
+            return ''
+        raw = bytes.fromhex(result[2:])
+        try:
+            return abi_decode(['string'], raw)[0]
+        except Exception:
+            return raw.rstrip(b'\x00').decode('utf-8', errors='ignore')
+
+    def _load_token_metadata(self, contracts: Iterable[str]) -> None:
+        """Batch-fetch name, symbol and decimals for contracts not seen yet."""
+        missing = sorted(set(contracts) - set(self.token_metadata))
+        for contract in missing:
+            calls = [('eth_call', [{'to': contract, 'data': selector}, 'latest'])
+                     for selector in (NAME_SELECTOR, SYMBOL_SELECTOR, DECIMALS_SELECTOR)]
+            try:
+                name, symbol, decimals = self.client.batch(calls)
+            except RPCError:
+                # ERC721 contracts commonly revert on decimals()
+                name, symbol, decimals = None, None, None
+                try:
+                    name, symbol = self.client.batch(calls[:2])
+                except RPCError as e:
+                    logger.debug(f"No metadata for {contract}: {e}")
+
+            self.token_metadata[contract] = {
+                'tokenName': self._decode_string(name),
+                'tokenSymbol': self._decode_string(symbol),
+                'tokenDecimal': str(int(decimals, 16)) if decimals and decimals != '0x' else '0'
+            }
+
+    def _load_receipts(self, tx_hashes: List[str]) -> Dict[str, Dict]:
+        """Batch-fetch receipts for gas accounting."""
+        receipts = {}
+        for chunk in self._chunks(tx_hashes):
+            results = self.client.batch([('eth_getTransactionReceipt', [h]) for h in chunk])
+            for tx_hash, receipt in zip(chunk, results):
+                if receipt:
+                    receipts[tx_hash] = receipt
+        return receipts
+
+    def decode_logs(self, logs: List[Dict], include_gas: bool = False) -> List[Dict]:
+        """
+        Decode raw Transfer logs into Etherscan-style token transfer rows.
+
+        Block timestamps, token metadata and (optionally) receipts are fetched with
+        batched RPC calls per decode batch rather than per log.
+
+        Args:
+            logs: Raw Transfer logs
+            include_gas: Also fetch receipts to fill gasUsed and gasPrice
+
+        Returns:
+            Rows with the same keys as Etherscan's tokentx/tokennfttx results plus
+            logIndex and tokenType ('ERC20' or 'ERC721')
+        """
+        rows = []
+
+        for batch in self._chunks(logs):
+            transfers = [log for log in batch
+                         if log.get('topics') and log['topics'][0].lower() == TRANSFER_TOPIC
+                         and len(log['topics']) >= 3]
+
+            self._load_block_timestamps(int(log['blockNumber'], 16) for log in transfers)
+            self._load_token_metadata(log['address'].lower() for log in transfers)
+            receipts = self._load_receipts(sorted({log['transactionHash'] for log in transfers})) if include_gas else {}
+
+            for log in transfers:
+                block_number = int(log['blockNumber'], 16)
+                contract = log['address'].lower()
+                metadata = self.token_metadata.get(contract, {})
+                row = {
+                    'blockNumber': str(block_number),
+                    'timeStamp': str(self.block_timestamps.get(block_number, 0)),
+                    'hash': log['transactionHash'],
+                    'blockHash': log.get('blockHash'),
+                    'transactionIndex': str(int(log['transactionIndex'], 16)),
+                    'logIndex': str(int(log['logIndex'], 16)),
+                    'from': topic_to_address(log['topics'][1]),
+                    'to': topic_to_address(log['topics'][2]),
+                    'contractAddress': contract,
+                    'tokenName': metadata.get('tokenName', ''),
+                    'tokenSymbol': metadata.get('tokenSymbol', '')
+                }
+
+                if len(log['topics']) == 4:
+                    # ERC721: tokenId is the third indexed argument
+                    row['tokenID'] = str(int(log['topics'][3], 16))
+                    row['tokenDecimal'] = '0'
+                    row['tokenType'] = 'ERC721'
+                else:
+                    data = log.get('data') or '0x'
+                    row['value'] = str(int(data, 16)) if data != '0x' else '0'
+                    row['tokenDecimal'] = metadata.get('tokenDecimal', '18')
+                    row['tokenType'] = 'ERC20'
+
+                receipt = receipts.get(log['transactionHash'])
+                if receipt:
+                    # The sender pays the gas; Transfer 'from' is only the token sender
+                    row['txFrom'] = (receipt.get('from') or '').lower()
+                    row['gasUsed'] = str(int(receipt['gasUsed'], 16))
+                    row['gasPrice'] = str(int(receipt.get('effectiveGasPrice', '0x0'), 16))
+
+                rows.append(row)
+
+        return rows
+
+    def fetch_transfers(self, addresses: Iterable[str], from_block: int = 0,
+                        to_block: Optional[int] = None, contracts: Optional[List[str]] = None,
+                        include_gas: bool = False) -> Dict[str, List[Dict]]:
+        """
+        Fetch and decode all Transfers touching the given addresses.
+
+        Returns:
+            Dictionary with 'erc20' and 'erc721' row lists in ascending block order
+        """
+        logs = self.fetch_transfer_logs(addresses, from_block, to_block, contracts)
+        rows = self.decode_logs(logs, include_gas=include_gas)
+        logger.info(f"Decoded {len(rows)} Transfer logs between blocks {from_block} and {to_block or 'head'}")
+
+        return {
+            'erc20': [row for row in rows if row['tokenType'] == 'ERC20'],
+            'erc721': [row for row in rows if row['tokenType'] == 'ERC721']
+        }
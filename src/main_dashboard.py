@@ -4,13 +4,21 @@ Main Dashboard Generator - Creates an index.html hub for all crypto dashboards
 """
 
 import os
+import sys
 import json
 import glob
+import argparse
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Set, Tuple, Optional
 import logging
 
+# Add src to path so sibling modules resolve when imported as src.<module>
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from report_manifest import MANIFEST_FILE, ReportManifest
+from templating import get_template, render_to_file
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -18,13 +26,26 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Page template under src/templates
+INDEX_TEMPLATE = 'main_dashboard.html'
+
 class MainDashboard:
     """Generates the main index dashboard for Wilder World crypto analysis"""
     
-    def __init__(self, output_dir: str = None):
-        """Initialize the dashboard generator"""
+    def __init__(self, output_dir: str = None, per_page: int = 12):
+        """
+        Initialize the dashboard generator
+        
+        Args:
+            output_dir: Output root holding the report directories and manifest
+            per_page: Reports shown per category on the index and on each older page
+        """
         self.base_dir = Path(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
         self.output_dir = output_dir or os.path.join(self.base_dir, 'output')
+        self.per_page = per_page
+        
+        # Report writers append to the manifest; the index is built from it instead of scanning
+        self.manifest = ReportManifest(os.path.join(self.output_dir, MANIFEST_FILE))
         
         # Define dashboard categories
         self.categories = {
@@ -48,30 +69,66 @@ class MainDashboard:
             }
         }
         
-    def scan_dashboards(self) -> Dict[str, List[Dict]]:
-        """Scan output directories for existing dashboards"""
-        dashboards = {}
+    def reconcile_manifest(self) -> Set[str]:
+        """
+        Add reports found on disk but missing from the manifest, oldest first.
+        
+        Seeds a missing manifest and picks up reports copied into the category
+        directories by hand (such as transaction histories). Only unlisted files
+        are stat-ed.
         
+        Returns:
+            Report paths found on disk, relative to the output root
+        """
+        listed = {entry['path'].split('#', 1)[0]
+                  for entries in self.manifest.entries().values() for entry in entries}
+        on_disk, found = set(), []
         for category_id, category_info in self.categories.items():
-            category_path = os.path.join(self.output_dir, category_info['dir'])
-            dashboards[category_id] = []
-            
-            if not os.path.exists(category_path):
-                continue
-                
-            # Find all HTML files
-            html_files = glob.glob(os.path.join(category_path, '*.html'))
-            
-            for html_file in html_files:
+            for html_file in glob.glob(os.path.join(self.output_dir, category_info['dir'], '*.html')):
+                path = Path(os.path.relpath(html_file, self.output_dir)).as_posix()
+                on_disk.add(path)
+                if path in listed:
+                    continue
                 file_info = self.get_file_info(html_file, category_id)
                 if file_info:
-                    dashboards[category_id].append(file_info)
-            
-            # Sort by modified time (newest first)
-            dashboards[category_id].sort(key=lambda x: x['modified'], reverse=True)
-        
+                    found.append((category_id, file_info))
+        
+        for category_id, info in sorted(found, key=lambda item: item[1]['modified']):
+            self.manifest.append(category_id, os.path.join(self.output_dir, info['path']), info['display_name'],
+                                 timestamp=datetime.fromtimestamp(info['modified']), size=info['size'])
+        if found:
+            logger.info(f"Added {len(found)} unlisted reports to the manifest")
+        return on_disk
+    
+    def load_dashboards(self, on_disk: Optional[Set[str]] = None) -> Dict[str, List[Dict]]:
+        """
+        Manifest entries by category, newest first, in the form the cards use
+        
+        Args:
+            on_disk: Report paths from reconcile_manifest(); when given, entries
+                whose report was deleted since it was listed are left out
+        """
+        dashboards = {category_id: [] for category_id in self.categories}
+        for category_id, entries in self.manifest.entries().items():
+            if category_id not in dashboards:
+                continue
+            for entry in entries:
+                if on_disk is not None and entry['path'].split('#', 1)[0] not in on_disk:
+                    continue
+                dashboards[category_id].append({
+                    'display_name': entry['title'],
+                    'path': entry['path'],
+                    'modified_str': datetime.fromisoformat(entry['timestamp']).strftime('%Y-%m-%d %H:%M:%S'),
+                    'size_str': self.format_file_size(entry['size']),
+                    'summary': entry.get('summary', {})
+                })
         return dashboards
     
+    @staticmethod
+    def page_filename(category_id: str, page: int) -> str:
+        """Index page for a category page; page 1 is the main index"""
+        return 'index.html' if page == 1 else f'index_{category_id}_{page}.html'
+    
     def get_file_info(self, file_path: str, category: str) -> Optional[Dict]:
         """Extract information about a dashboard file"""
         try:
@@ -112,6 +169,8 @@ class MainDashboard:
                 pass
         elif filename == 'titan_analysis_latest.html':
             return "Latest Titan Analysis"
+        elif filename == 'viewer.html':
+            return "Titan Report Viewer (all runs)"
         
         return name
     
@@ -144,421 +203,83 @@ class MainDashboard:
         
         return {'ETH': 0, 'WILD': 0}
     
-    def generate_html(self, dashboards: Dict[str, List[Dict]]) -> str:
-        """Generate the main index HTML"""
-        prices = self.get_latest_prices()
-        
-        html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Wilder World Crypto Analytics Hub</title>
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            background: linear-gradient(135deg, #0a0a0a 0%, #1a1a2e 100%);
-            color: #ffffff;
-            min-height: 100vh;
-            line-height: 1.6;
-        }}
-        
-        .container {{
-            max-width: 1400px;
-            margin: 0 auto;
-            padding: 20px;
-        }}
-        
-        .header {{
-            text-align: center;
-            padding: 40px 20px;
-            background: rgba(255, 255, 255, 0.05);
-            border-radius: 15px;
-            margin-bottom: 40px;
-            backdrop-filter: blur(10px);
-        }}
-        
-        .header h1 {{
-            font-size: 3em;
-            margin-bottom: 10px;
-            background: linear-gradient(45deg, #00ff88, #00aaff);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-        }}
-        
-        .header p {{
-            font-size: 1.2em;
-            color: #aaaaaa;
-        }}
-        
-        .status-bar {{
-            display: flex;
-            justify-content: center;
-            gap: 30px;
-            margin: 20px 0;
-            flex-wrap: wrap;
-        }}
-        
-        .status-item {{
-            background: rgba(255, 255, 255, 0.1);
-            padding: 10px 20px;
-            border-radius: 10px;
-            display: flex;
-            align-items: center;
-            gap: 10px;
-        }}
-        
-        .status-label {{
-            color: #888;
-            font-size: 0.9em;
-        }}
-        
-        .status-value {{
-            font-size: 1.2em;
-            font-weight: bold;
-            color: #00ff88;
-        }}
-        
-        .actions {{
-            text-align: center;
-            margin: 30px 0;
-        }}
-        
-        .btn {{
-            display: inline-block;
-            padding: 12px 30px;
-            background: linear-gradient(45deg, #00ff88, #00aaff);
-            color: #000;
-            text-decoration: none;
-            border-radius: 30px;
-            font-weight: bold;
-            margin: 0 10px;
-            transition: all 0.3s ease;
-            border: none;
-            cursor: pointer;
-            font-size: 1em;
-        }}
-        
-        .btn:hover {{
-            transform: translateY(-2px);
-            box-shadow: 0 10px 20px rgba(0, 255, 136, 0.3);
-        }}
-        
-        .btn-secondary {{
-            background: rgba(255, 255, 255, 0.1);
-            color: #fff;
-        }}
-        
-        .category {{
-            margin-bottom: 40px;
-        }}
-        
-        .category-header {{
-            display: flex;
-            align-items: center;
-            gap: 15px;
-            margin-bottom: 20px;
-            padding: 20px;
-            background: rgba(255, 255, 255, 0.05);
-            border-radius: 10px;
-        }}
-        
-        .category-icon {{
-            font-size: 2em;
-        }}
-        
-        .category-info h2 {{
-            font-size: 1.8em;
-            margin-bottom: 5px;
-        }}
-        
-        .category-info p {{
-            color: #aaa;
-            font-size: 0.9em;
-        }}
-        
-        .dashboard-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fill, minmax(350px, 1fr));
-            gap: 20px;
-        }}
-        
-        .dashboard-card {{
-            background: rgba(255, 255, 255, 0.05);
-            border: 1px solid rgba(255, 255, 255, 0.1);
-            border-radius: 10px;
-            padding: 20px;
-            transition: all 0.3s ease;
-            position: relative;
-            overflow: hidden;
-        }}
-        
-        .dashboard-card:hover {{
-            background: rgba(255, 255, 255, 0.08);
-            border-color: rgba(0, 255, 136, 0.5);
-            transform: translateY(-2px);
-        }}
-        
-        .dashboard-card::before {{
-            content: '';
-            position: absolute;
-            top: 0;
-            left: 0;
-            right: 0;
-            height: 3px;
-            background: linear-gradient(90deg, #00ff88, #00aaff);
-            transform: scaleX(0);
-            transition: transform 0.3s ease;
-        }}
-        
-        .dashboard-card:hover::before {{
-            transform: scaleX(1);
-        }}
-        
-        .dashboard-title {{
-            font-size: 1.3em;
-            margin-bottom: 10px;
-            color: #fff;
-        }}
-        
-        .dashboard-meta {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 15px;
-            font-size: 0.85em;
-            color: #888;
-        }}
-        
-        .dashboard-actions {{
-            display: flex;
-            gap: 10px;
-        }}
-        
-        .card-btn {{
-            flex: 1;
-            padding: 8px 16px;
-            background: rgba(255, 255, 255, 0.1);
-            color: #fff;
-            text-decoration: none;
-            border-radius: 5px;
-            text-align: center;
-            transition: all 0.3s ease;
-            border: 1px solid rgba(255, 255, 255, 0.1);
-        }}
-        
-        .card-btn:hover {{
-            background: rgba(0, 255, 136, 0.2);
-            border-color: rgba(0, 255, 136, 0.5);
-        }}
-        
-        .empty-state {{
-            text-align: center;
-            padding: 40px;
-            color: #666;
-        }}
-        
-        .footer {{
-            text-align: center;
-            padding: 40px 20px;
-            margin-top: 60px;
-            border-top: 1px solid rgba(255, 255, 255, 0.1);
-            color: #666;
-        }}
-        
-        .refresh-info {{
-            background: rgba(255, 255, 255, 0.05);
-            border-radius: 10px;
-            padding: 20px;
-            margin: 30px 0;
-        }}
-        
-        .refresh-info h3 {{
-            margin-bottom: 15px;
-            color: #00ff88;
-        }}
-        
-        .refresh-commands {{
-            background: rgba(0, 0, 0, 0.3);
-            padding: 15px;
-            border-radius: 5px;
-            font-family: monospace;
-            margin: 10px 0;
-        }}
-        
-        .command {{
-            display: block;
-            margin: 5px 0;
-            color: #00aaff;
-        }}
-        
-        @media (max-width: 768px) {{
-            .header h1 {{
-                font-size: 2em;
-            }}
-            
-            .dashboard-grid {{
-                grid-template-columns: 1fr;
-            }}
-            
-            .status-bar {{
-                flex-direction: column;
-                align-items: center;
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>🌟 Wilder World Analytics Hub</h1>
-            <p>Your comprehensive dashboard for WILD token and portfolio analysis</p>
-            
-            <div class="status-bar">
-                <div class="status-item">
-                    <span class="status-label">WILD Price:</span>
-                    <span class="status-value">${prices.get('WILD', 0):.4f}</span>
-                </div>
-                <div class="status-item">
-                    <span class="status-label">ETH Price:</span>
-                    <span class="status-value">${prices.get('ETH', 0):.2f}</span>
-                </div>
-                <div class="status-item">
-                    <span class="status-label">Last Update:</span>
-                    <span class="status-value">{datetime.now().strftime('%Y-%m-%d %H:%M')}</span>
-                </div>
-            </div>
-        </div>
-        
-        <div class="actions">
-            <button class="btn" onclick="refreshAll()">🔄 Refresh All Dashboards</button>
-            <a href="titan_reports/titan_analysis_latest.html" class="btn btn-secondary">📊 Latest Titan Analysis</a>
-        </div>
-"""
-        
-        # Add categories and dashboards
+    def page_context(self, dashboards: Dict[str, List[Dict]],
+                     pagination: Optional[Dict[str, Tuple[int, int]]] = None) -> Dict:
+        """
+        Variables for the index template
+        
+        Args:
+            dashboards: Cards to show by category; categories missing here are left out
+            pagination: (page, pages) by category, for the newer/older links
+        """
+        pagination = pagination or {}
+        categories = []
         for category_id, category_info in self.categories.items():
-            category_dashboards = dashboards.get(category_id, [])
-            
-            html += f"""
-        <div class="category">
-            <div class="category-header">
-                <div class="category-icon">{category_info['icon']}</div>
-                <div class="category-info">
-                    <h2>{category_info['name']}</h2>
-                    <p>{category_info['description']}</p>
-                </div>
-            </div>
-            
-            <div class="dashboard-grid">
-"""
-            
-            if category_dashboards:
-                for dashboard in category_dashboards:
-                    html += f"""
-                <div class="dashboard-card">
-                    <h3 class="dashboard-title">{dashboard['display_name']}</h3>
-                    <div class="dashboard-meta">
-                        <span>📅 {dashboard['modified_str']}</span>
-                        <span>📁 {dashboard['size_str']}</span>
-                    </div>
-                    <div class="dashboard-actions">
-                        <a href="{dashboard['path']}" class="card-btn">View Dashboard</a>
-                    </div>
-                </div>
-"""
-            else:
-                html += """
-                <div class="empty-state">
-                    <p>No dashboards found in this category.</p>
-                    <p>Run the analysis scripts to generate dashboards.</p>
-                </div>
-"""
-            
-            html += """
-            </div>
-        </div>
-"""
-        
-        # Add refresh instructions
-        html += """
-        <div class="refresh-info">
-            <h3>🔄 How to Refresh Dashboards</h3>
-            <p>You can update your dashboards using these commands:</p>
-            
-            <div class="refresh-commands">
-                <span class="command"># Refresh everything (recommended)</span>
-                <span class="command">python refresh_all_dashboards.py</span>
-            </div>
-            
-            <div class="refresh-commands">
-                <span class="command"># Update Operation Titan analysis only</span>
-                <span class="command">python run_titan_analysis.py</span>
-            </div>
-            
-            <div class="refresh-commands">
-                <span class="command"># Update wallet analysis and visualizations</span>
-                <span class="command">python test_setup.py</span>
-            </div>
-            
-            <div class="refresh-commands">
-                <span class="command"># Start automated monitoring (runs continuously)</span>
-                <span class="command">python src/titan_automation.py</span>
-            </div>
-        </div>
-        
-        <div class="footer">
-            <p>Wilder World Analytics Hub | Last generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-            <p>Made with 💚 for tracking WILD token and Operation Titan</p>
-        </div>
-    </div>
+            if category_id not in dashboards:
+                continue
+            page, pages = pagination.get(category_id, (1, 1))
+            categories.append({
+                **category_info,
+                'dashboards': dashboards[category_id],
+                'page': page,
+                'pages': pages,
+                'newer': self.page_filename(category_id, page - 1),
+                'older': self.page_filename(category_id, page + 1)
+            })
+        
+        return {
+            'prices': self.get_latest_prices(),
+            'generated_at': datetime.now(),
+            'categories': categories
+        }
     
-    <script>
-        function refreshAll() {{
-            if (confirm('This will refresh all dashboards by running the analysis scripts. Continue?')) {{
-                alert('To refresh all dashboards, run: python refresh_all_dashboards.py');
-            }}
-        }}
-        
-        // Auto-refresh page every 5 minutes
-        setTimeout(() => {{
-            location.reload();
-        }}, 300000);
-    </script>
-</body>
-</html>
-"""
-        
-        return html
+    def generate_html(self, dashboards: Dict[str, List[Dict]],
+                      pagination: Optional[Dict[str, Tuple[int, int]]] = None) -> str:
+        """Generate the main index HTML"""
+        return get_template(INDEX_TEMPLATE).render(**self.page_context(dashboards, pagination))
     
-    def generate_dashboard(self) -> str:
-        """Main method to generate the dashboard"""
+    def generate_dashboard(self, rescan: bool = False) -> str:
+        """
+        Main method to generate the dashboard
+        
+        Args:
+            rescan: Scan the report directories for reports the manifest does not
+                list and drop deleted ones; always done when there is no manifest yet
+        """
         logger.info("Generating main dashboard index...")
         
-        # Scan for existing dashboards
-        dashboards = self.scan_dashboards()
-        
-        # Generate HTML
-        html = self.generate_html(dashboards)
-        
-        # Save to file
+        # The index is built from the report catalog alone unless a rescan is asked for
+        on_disk = None
+        if rescan or not self.manifest.exists():
+            on_disk = self.reconcile_manifest()
+        dashboards = self.load_dashboards(on_disk)
+        
+        # The index shows the newest reports per category; older ones go on numbered pages
+        newest, pagination = {}, {}
+        for category_id, entries in dashboards.items():
+            newest[category_id], pages = ReportManifest.page(entries, 1, self.per_page)
+            pagination[category_id] = (1, pages)
+            for page in range(2, pages + 1):
+                page_entries, _ = ReportManifest.page(entries, page, self.per_page)
+                render_to_file(INDEX_TEMPLATE, os.path.join(self.output_dir, self.page_filename(category_id, page)),
+                               self.page_context({category_id: page_entries}, {category_id: (page, pages)}))
+        
+        # Stream the index straight to its file
         output_path = os.path.join(self.output_dir, 'index.html')
-        with open(output_path, 'w') as f:
-            f.write(html)
+        render_to_file(INDEX_TEMPLATE, output_path, self.page_context(newest, pagination))
         
         logger.info(f"Main dashboard saved to: {output_path}")
         return output_path
 
 def main():
     """Generate the main dashboard"""
+    parser = argparse.ArgumentParser(description="Generate the main dashboard index")
+    parser.add_argument('--rescan', action='store_true',
+                        help="Add reports on disk that the manifest does not list and drop deleted ones")
+    args = parser.parse_args()
+    
     dashboard = MainDashboard()
-    output_path = dashboard.generate_dashboard()
+    output_path = dashboard.generate_dashboard(rescan=args.rescan)
     print(f"\n✅ Main dashboard generated successfully!")
     print(f"📍 Location: {output_path}")
     print(f"\n🌐 Open in browser: file://{os.path.abspath(output_path)}")
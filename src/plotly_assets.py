@@ -0,0 +1,54 @@
+"""
+Shared local plotly.js bundle for generated reports.
+Writes one versioned copy of plotly.js under <output root>/assets and builds the
+relative script tag each page uses to load it, so reports stay small and still
+open offline.
+"""
+
+import os
+import logging
+from pathlib import Path
+from typing import Optional, Union
+
+import plotly
+from plotly.offline import get_plotlyjs
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+OUTPUT_ROOT = Path(__file__).parent.parent / 'output'
+
+
+def plotly_bundle_path(output_root: Optional[Union[str, Path]] = None) -> Path:
+    """Write the versioned plotly.js bundle if it is missing and return its path."""
+    assets_dir = Path(output_root or OUTPUT_ROOT) / 'assets'
+    bundle = assets_dir / f'plotly-{plotly.__version__}.min.js'
+    if not bundle.exists():
+        assets_dir.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary name first so a concurrent reader never sees a partial file
+        partial = bundle.with_suffix('.tmp')
+        partial.write_text(get_plotlyjs(), encoding='utf-8')
+        os.replace(partial, bundle)
+        logger.info(f"Wrote shared plotly.js bundle to {bundle}")
+    return bundle
+
+
+def page_output_root(page_dir: Union[str, Path]) -> Path:
+    """Output root a page directory belongs to (pages live in <root>/<category>)."""
+    return Path(page_dir).resolve().parent
+
+
+def plotly_src(page_dir: Union[str, Path], output_root: Optional[Union[str, Path]] = None) -> str:
+    """Bundle URL relative to the directory a page is written to."""
+    # Default to the page's own output root so a custom output_dir stays self-contained
+    bundle = plotly_bundle_path(output_root or page_output_root(page_dir))
+    return Path(os.path.relpath(bundle.resolve(), Path(page_dir).resolve())).as_posix()
+
+
+def plotly_script_tag(page_dir: Union[str, Path], output_root: Optional[Union[str, Path]] = None) -> str:
+    """Script tag that loads the shared bundle from a page in page_dir."""
+    return f'<script src="{plotly_src(page_dir, output_root)}" charset="utf-8"></script>'
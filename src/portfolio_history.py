@@ -0,0 +1,201 @@
+"""
+Daily portfolio history for Wilder World wallets.
+Materializes a per-wallet daily series of WILD balance, LP balance, NFT count
+and USD value from the unified transaction table, and persists it so later
+runs only append the days added since the last one.
+"""
+
+import os
+import sys
+import logging
+from pathlib import Path
+from typing import Dict, Optional, Any
+
+import numpy as np
+import pandas as pd
+
+# Add src to path so sibling modules resolve when imported as src.<module>
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from price_fetcher import PriceFetcher
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Balance measures tracked per wallet and day
+MEASURES = ('wild_balance', 'lp_balance', 'nft_count')
+
+HISTORY_COLUMNS = ['date', 'wallet', 'wild_balance', 'lp_balance', 'nft_count',
+                   'wild_price_usd', 'wild_value_usd', 'lp_value_usd', 'value_usd']
+
+
+def lp_unit_value_usd(lp_pair_state: Optional[Dict[str, Any]], wild_price: Optional[float],
+                      eth_price: Optional[float]) -> Optional[float]:
+    """USD value of one LP token from the pair's reserves, or None when any input is missing."""
+    if not lp_pair_state or not lp_pair_state.get('total_supply') or not wild_price or not eth_price:
+        return None
+    reserves_usd = lp_pair_state['wild_reserve'] * wild_price + lp_pair_state['eth_reserve'] * eth_price
+    return reserves_usd / lp_pair_state['total_supply']
+
+
+class PortfolioHistory:
+    """Builds and incrementally extends the daily portfolio series."""
+
+    def __init__(self, price_fetcher: Optional[PriceFetcher] = None, history_file: Optional[str] = None):
+        """
+        Initialize the history store.
+
+        Args:
+            price_fetcher: Price source for the daily WILD price
+            history_file: CSV the series is persisted to
+        """
+        self.price_fetcher = price_fetcher or PriceFetcher()
+        if history_file is None:
+            history_file = Path(__file__).parent.parent / 'data' / 'processed' / 'portfolio_history.csv'
+        self.history_file = Path(history_file)
+        self.history_file.parent.mkdir(parents=True, exist_ok=True)
+
+    def load(self) -> pd.DataFrame:
+        """Load the persisted series (empty if none yet)."""
+        if not self.history_file.exists():
+            return pd.DataFrame(columns=HISTORY_COLUMNS)
+        history = pd.read_csv(self.history_file, parse_dates=['date'])
+        return history
+
+    def daily_flows(self, analyzer: Any, all_data: Dict) -> Dict[str, pd.DataFrame]:
+        """
+        Net daily flow of each measure per wallet.
+
+        Returns:
+            Mapping of measure to a day x wallet frame of net flows
+        """
+        _, legs = analyzer.get_transaction_table(all_data)
+        wallets = list(all_data)
+        if legs.empty:
+            return {measure: pd.DataFrame(columns=wallets, dtype=float) for measure in MEASURES}
+
+        is_wild = (legs['leg_type'] == 'ERC20') & (legs['contract_lower'] == analyzer.contracts['wild_token'])
+        is_lp = (legs['leg_type'] == 'ERC20') & (legs['contract_lower'] == analyzer.contracts['uniswap_lp'])
+        is_nft = legs['leg_type'] == 'ERC721'
+
+        tracked = legs[is_wild | is_lp | is_nft]
+        measure = np.select([is_wild[tracked.index], is_lp[tracked.index]], ['wild_balance', 'lp_balance'],
+                            default='nft_count')
+        amount = tracked['amount'].astype(float).to_numpy()
+        day = tracked['timestamp'].dt.normalize()
+
+        # Each leg credits its recipient and debits its sender, where those are owned wallets
+        address_to_wallet = {analyzer.wallets[w]: w for w in wallets}
+        sides = []
+        for column, sign in (('to_lower', 1.0), ('from_lower', -1.0)):
+            side = pd.DataFrame({
+                'date': day.values,
+                'wallet': tracked[column].map(address_to_wallet).values,
+                'measure': measure,
+                'flow': sign * amount
+            })
+            sides.append(side.dropna(subset=['wallet']))
+        flows = pd.concat(sides, ignore_index=True)
+
+        result = {}
+        for name in MEASURES:
+            subset = flows[flows['measure'] == name]
+            table = subset.pivot_table(index='date', columns='wallet', values='flow', aggfunc='sum')
+            result[name] = table.reindex(columns=wallets).fillna(0.0)
+        return result
+
+    def update(self, analyzer: Any, all_data: Dict, end_date: Optional[pd.Timestamp] = None,
+               lp_unit_value_usd: Optional[float] = None) -> pd.DataFrame:
+        """
+        Extend the persisted series through end_date and return the full history.
+
+        The last stored day is recomputed (it may have been partial) and balances
+        carry over from the day before it; if the wallet set changed the series is
+        rebuilt from the first transfer.
+
+        Args:
+            analyzer: WilderAnalyzer providing the transaction table
+            all_data: Collected wallet data
+            end_date: Last day to materialize (defaults to today)
+            lp_unit_value_usd: USD value of one LP token at end_date. It values end_date
+                only; recomputed days keep the value recorded for them, and other days
+                holding LP tokens get an empty lp_value_usd, with value_usd covering
+                their WILD only
+
+        Returns:
+            Long-format history with one row per (date, wallet)
+        """
+        wallets = list(all_data)
+        end_date = pd.Timestamp(end_date or pd.Timestamp.now()).normalize()
+        flows = self.daily_flows(analyzer, all_data)
+
+        history = self.load()
+        first_flow = min((f.index.min() for f in flows.values() if not f.empty), default=end_date)
+        carry = np.zeros((len(MEASURES), len(wallets)))
+
+        recorded_lp_unit = pd.Series(dtype=float)
+        if not history.empty and set(history['wallet']) == set(wallets):
+            start_date = history['date'].max()
+            # Keep the LP unit value the recomputed day was recorded with
+            recomputed = history[(history['date'] >= start_date) & (history['lp_balance'] > 0)].dropna(subset=['lp_value_usd'])
+            recorded_lp_unit = (recomputed['lp_value_usd'] / recomputed['lp_balance']).groupby(recomputed['date']).first()
+            history = history[history['date'] < start_date]
+            if not history.empty:
+                previous = history[history['date'] == history['date'].max()].set_index('wallet')
+                carry = previous.reindex(wallets)[list(MEASURES)].fillna(0.0).to_numpy().T
+        else:
+            if not history.empty:
+                logger.info("Wallet set changed, rebuilding portfolio history")
+            history = pd.DataFrame(columns=HISTORY_COLUMNS)
+            start_date = first_flow
+
+        # Flows before the window are already in the carried balances
+        days = pd.date_range(min(start_date, end_date), end_date, freq='D')
+        balances = np.empty((len(MEASURES), len(days), len(wallets)))
+        for i, name in enumerate(MEASURES):
+            window = flows[name][(flows[name].index >= days[0]) & (flows[name].index <= end_date)]
+            dense = window.reindex(days, fill_value=0.0).to_numpy()
+            balances[i] = carry[i] + np.cumsum(dense, axis=0)
+
+        # Value each day at its closing price; daily closes are stamped at the last
+        # instant of the day, so look up at end of day rather than a minute before it
+        wild_price = self.price_fetcher.prices_at('WILD', pd.Series(days + pd.Timedelta(days=1) - pd.Timedelta(1, 'ns')))
+        unpriced = days[np.isnan(wild_price)]
+        if len(unpriced):
+            # Leave those days unvalued instead of charting them at $0
+            logger.warning(f"No WILD price for {len(unpriced)} of {len(days)} days "
+                           f"({unpriced.min().date()} to {unpriced.max().date()}); "
+                           f"their USD values are left empty")
+
+        new_rows = pd.DataFrame({
+            'date': np.repeat(days.values, len(wallets)),
+            'wallet': np.tile(wallets, len(days)),
+            'wild_balance': balances[0].ravel(),
+            'lp_balance': balances[1].ravel(),
+            'nft_count': balances[2].ravel().round().astype(int),
+            'wild_price_usd': np.repeat(wild_price, len(wallets))
+        })
+        new_rows['wild_value_usd'] = new_rows['wild_balance'] * new_rows['wild_price_usd']
+        
+        # LP tokens are valued only on days a unit value is known for
+        lp_unit = pd.Series(np.nan, index=days)
+        lp_unit.update(recorded_lp_unit)
+        if lp_unit_value_usd is not None:
+            lp_unit[end_date] = lp_unit_value_usd
+        new_rows['lp_value_usd'] = new_rows['lp_balance'] * np.repeat(lp_unit.to_numpy(), len(wallets))
+        new_rows.loc[new_rows['lp_balance'] == 0, 'lp_value_usd'] = 0.0
+        unvalued_lp = new_rows['lp_value_usd'].isna()
+        if unvalued_lp.any():
+            logger.warning(f"No LP token value for {new_rows.loc[unvalued_lp, 'date'].nunique()} days with LP "
+                           f"holdings; their value_usd covers WILD only")
+        new_rows['value_usd'] = new_rows['wild_value_usd'] + new_rows['lp_value_usd'].fillna(0.0)
+
+        history = pd.concat([history, new_rows], ignore_index=True) if not history.empty else new_rows
+        history.to_csv(self.history_file, index=False, date_format='%Y-%m-%d')
+        logger.info(f"Portfolio history now covers {history['date'].nunique()} days "
+                    f"({len(days)} recomputed)")
+        return history
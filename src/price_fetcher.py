@@ -12,6 +12,8 @@ from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from collections import defaultdict
 
+import numpy as np
+import pandas as pd
 from pycoingecko import CoinGeckoAPI
 from dotenv import load_dotenv
 
@@ -47,6 +49,21 @@ class PriceFetcher:
             'WILD': 'wilder-world'
         }
         
+        # Bundled daily price history (CoinMarketCap exports), by coin symbol
+        self.historical_dir = Path(__file__).parent / 'historical_pricing'
+        self.historical_files = {
+            'ETH': ['Ethereum_*.csv'],
+            'WILD': ['Wilder World_*.csv', 'wilderhistorical.csv']
+        }
+        
+        # In-memory price series used by attach_usd_values
+        self.price_series: Dict[str, pd.Series] = {}
+        
+        # ERC20 contracts whose transfers are valued by attach_usd_values
+        self.token_contracts = {
+            'WILD': os.getenv('WILD_TOKEN_CONTRACT', '0x2a3bff78b79a009976eea096a51a948a3dc00e34').lower()
+        }
+        
         # Rate limiting (CoinGecko free tier: 10-50 calls/minute)
         self.last_request_time = 0
         self.min_request_interval = 0.5  # 2 requests per second
@@ -228,6 +245,198 @@ class PriceFetcher:
             return gas_cost_eth * eth_price
         return None
     
+    def load_price_series(self, coin: str, refresh: bool = False) -> pd.Series:
+        """
+        Build a sorted USD price series for a coin.
+        
+        Combines the bundled CoinMarketCap exports (daily close, stamped at the
+        close of the day) with every CoinGecko daily price already in the price
+        cache. The series is kept in memory after the first load.
+        
+        Args:
+            coin: Coin symbol (ETH, WILD)
+            refresh: Rebuild even if the series is already loaded
+        
+        Returns:
+            Series of USD prices indexed by naive UTC timestamp
+        """
+        if coin in self.price_series and not refresh:
+            return self.price_series[coin]
+        
+        frames = []
+        for pattern in self.historical_files.get(coin, []):
+            for path in sorted(self.historical_dir.glob(pattern)):
+                # The exports come both ';'-separated and ','-separated, with a BOM
+                with open(path, 'r', encoding='utf-8-sig') as f:
+                    separator = ';' if ';' in f.readline() else ','
+                df = pd.read_csv(path, sep=separator, encoding='utf-8-sig', usecols=['timeClose', 'close'])
+                frames.append(pd.DataFrame({
+                    'time': pd.to_datetime(df['timeClose'], utc=True).dt.tz_convert(None),
+                    'price': pd.to_numeric(df['close'], errors='coerce')
+                }))
+        
+        # CoinGecko history prices are daily snapshots at 00:00 UTC
+        prefix = f"{coin}_"
+        cached = {key[len(prefix):]: price for key, price in self.price_cache.items()
+                  if key.startswith(prefix) and price is not None}
+        if cached:
+            frames.append(pd.DataFrame({
+                'time': pd.to_datetime(list(cached.keys())),
+                'price': list(cached.values())
+            }))
+        
+        if not frames:
+            logger.warning(f"No price history available for {coin}")
+            series = pd.Series(dtype=float)
+        else:
+            # Bundled files come first, so they win where sources overlap on a timestamp
+            combined = pd.concat(frames, ignore_index=True).dropna()
+            combined = combined.drop_duplicates(subset='time', keep='first').sort_values('time')
+            series = pd.Series(combined['price'].values, index=pd.DatetimeIndex(combined['time']), name=coin)
+        
+        self.price_series[coin] = series
+        logger.info(f"Loaded {len(series)} {coin} price points")
+        return series
+    
+    def load_ohlcv(self, coin: str) -> pd.DataFrame:
+        """
+        Daily OHLCV candles from the bundled CoinMarketCap exports.
+        
+        Args:
+            coin: Coin symbol (ETH, WILD)
+        
+        Returns:
+            DataFrame with open/high/low/close/volume indexed by the candle's open time
+        """
+        frames = []
+        for pattern in self.historical_files.get(coin, []):
+            for path in sorted(self.historical_dir.glob(pattern)):
+                with open(path, 'r', encoding='utf-8-sig') as f:
+                    separator = ';' if ';' in f.readline() else ','
+                df = pd.read_csv(path, sep=separator, encoding='utf-8-sig',
+                                 usecols=['timeOpen', 'open', 'high', 'low', 'close', 'volume'])
+                df['time'] = pd.to_datetime(df['timeOpen'], utc=True).dt.tz_convert(None)
+                frames.append(df.drop(columns=['timeOpen']))
+        
+        if not frames:
+            logger.warning(f"No bundled OHLCV history for {coin}")
+            return pd.DataFrame(columns=['open', 'high', 'low', 'close', 'volume'])
+        
+        candles = pd.concat(frames, ignore_index=True).drop_duplicates(subset='time', keep='first')
+        candles = candles.set_index('time').sort_index()
+        return candles.apply(pd.to_numeric, errors='coerce').dropna(subset=['close'])
+    
+    def get_hourly_candles(self, coin: str, days: int = 7) -> pd.DataFrame:
+        """
+        Hourly OHLC candles for the last few days, built from CoinGecko's hourly market chart.
+        
+        Args:
+            coin: Coin symbol (ETH, WILD)
+            days: Days of history (CoinGecko returns hourly points for 2-90 days)
+        
+        Returns:
+            Completed hourly candles indexed by open time (the current hour is dropped)
+        """
+        if coin not in self.coin_ids:
+            logger.error(f"Unknown coin: {coin}")
+            return pd.DataFrame(columns=['open', 'high', 'low', 'close', 'volume'])
+        
+        self._rate_limit_wait()
+        chart = self.cg.get_coin_market_chart_by_id(id=self.coin_ids[coin], vs_currency='usd', days=days)
+        points = pd.DataFrame(chart.get('prices', []), columns=['ms', 'price'])
+        if points.empty:
+            return pd.DataFrame(columns=['open', 'high', 'low', 'close', 'volume'])
+        
+        prices = pd.Series(points['price'].values, index=pd.to_datetime(points['ms'], unit='ms'))
+        candles = prices.resample('h').ohlc()
+        # CoinGecko only reports rolling 24h volume, which is not a per-candle figure
+        candles['volume'] = float('nan')
+        
+        current_hour = pd.Timestamp.now('UTC').tz_localize(None).floor('h')
+        return candles[candles.index < current_hour].dropna(subset=['close'])
+    
+    def prices_at(self, coin: str, timestamps: pd.Series, method: str = 'backward',
+                  tolerance: Optional[pd.Timedelta] = pd.Timedelta(days=3)) -> np.ndarray:
+        """
+        Look up USD prices for many timestamps at once.
+        
+        Args:
+            coin: Coin symbol (ETH, WILD)
+            timestamps: Naive UTC timestamps, in any order
+            method: 'backward' (last known price), 'forward', 'nearest' or 'linear'
+                (time-weighted interpolation between the surrounding points)
+            tolerance: Maximum distance to a price point for the as-of methods
+        
+        Returns:
+            Array of prices aligned with timestamps (NaN where no price applies)
+        """
+        series = self.load_price_series(coin)
+        timestamps = pd.to_datetime(pd.Series(timestamps)).reset_index(drop=True)
+        if series.empty or timestamps.empty:
+            return np.full(len(timestamps), np.nan)
+        
+        if method == 'linear':
+            x = timestamps.values.astype('datetime64[ns]').astype(np.int64).astype(float)
+            xp = series.index.values.astype('datetime64[ns]').astype(np.int64).astype(float)
+            prices = np.interp(x, xp, series.values, left=np.nan, right=np.nan)
+            prices[timestamps.isna().values] = np.nan
+            return prices
+        
+        if method not in ('backward', 'forward', 'nearest'):
+            raise ValueError(f"Unknown price interpolation method: {method}")
+        
+        # One sorted as-of join, then restore the caller's row order
+        left = pd.DataFrame({'time': timestamps, 'row': np.arange(len(timestamps))})
+        left = left.dropna(subset=['time']).sort_values('time')
+        right = pd.DataFrame({'time': series.index, 'price': series.values})
+        joined = pd.merge_asof(left, right, on='time', direction=method, tolerance=tolerance)
+        
+        prices = np.full(len(timestamps), np.nan)
+        prices[joined['row'].values] = joined['price'].values
+        return prices
+    
+    def attach_usd_values(self, df: pd.DataFrame, method: str = 'backward',
+                          tolerance: Optional[pd.Timedelta] = pd.Timedelta(days=3)) -> pd.DataFrame:
+        """
+        Attach ETH and WILD USD prices to an analyzer transfer DataFrame.
+        
+        Works on any frame with a 'timestamp' column (the legs or transactions
+        table, or a per-wallet transactions frame). Adds eth_price_usd and
+        wild_price_usd, plus gas_usd where gas_cost_eth is present and value_usd
+        for ETH and WILD transfers.
+        
+        Args:
+            df: Analyzer DataFrame with a naive UTC 'timestamp' column
+            method: Price interpolation, see prices_at
+            tolerance: Maximum distance to a price point for the as-of methods
+        
+        Returns:
+            Copy of df with the USD columns added
+        """
+        out = df.copy()
+        if out.empty or 'timestamp' not in out.columns:
+            return out
+        
+        out['eth_price_usd'] = self.prices_at('ETH', out['timestamp'], method, tolerance)
+        out['wild_price_usd'] = self.prices_at('WILD', out['timestamp'], method, tolerance)
+        
+        if 'gas_cost_eth' in out.columns:
+            out['gas_usd'] = out['gas_cost_eth'].astype(float) * out['eth_price_usd']
+        
+        value_usd = pd.Series(np.nan, index=out.index)
+        if 'leg_type' in out.columns:
+            is_eth = out['leg_type'].isin(['ETH', 'INTERNAL'])
+            value_usd[is_eth] = out.loc[is_eth, 'amount'] * out.loc[is_eth, 'eth_price_usd']
+        elif 'value_eth' in out.columns:
+            value_usd = out['value_eth'] * out['eth_price_usd']
+        
+        if 'contract_lower' in out.columns and 'value_token' in out.columns:
+            is_wild = out['contract_lower'] == self.token_contracts['WILD']
+            value_usd[is_wild] = out.loc[is_wild, 'value_token'] * out.loc[is_wild, 'wild_price_usd']
+        
+        out['value_usd'] = value_usd
+        return out
+    
     def fill_missing_prices(self, dates_needed: List[str], coin: str = 'ETH') -> Dict[str, float]:
         """
         Fill in missing prices for a list of dates.
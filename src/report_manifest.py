@@ -0,0 +1,133 @@
+"""
+Append-only catalog of generated reports.
+Report writers append one JSON line per report (category, title, path,
+timestamp, size and summary metrics) to <output root>/manifest.jsonl, so the main
+dashboard can list reports without globbing and stat-ing every output directory.
+"""
+
+import os
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = 'manifest.jsonl'
+
+
+class ReportManifest:
+    """Append-only JSON Lines index of reports under the output directory."""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the manifest.
+
+        Args:
+            path: Manifest file; report paths are stored relative to its directory
+        """
+        if path is None:
+            path = Path(__file__).parent.parent / 'output' / MANIFEST_FILE
+        self.path = Path(path)
+        self.root = self.path.parent
+
+    @classmethod
+    def for_report_dir(cls, report_dir: str) -> 'ReportManifest':
+        """Manifest of the output root a report directory belongs to (<root>/<category>)."""
+        return cls(Path(report_dir).resolve().parent / MANIFEST_FILE)
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def append(self, category: str, report_path: str, title: str,
+               summary: Optional[Dict[str, Any]] = None, timestamp: Optional[datetime] = None,
+               size: Optional[int] = None, anchor: str = '') -> Dict[str, Any]:
+        """
+        Record a written report.
+
+        Args:
+            category: Catalog category (e.g. 'titan', 'visualizations')
+            report_path: File the report was written to
+            title: Display title
+            summary: Headline metrics shown with the entry
+            timestamp: When the report was generated (defaults to now)
+            size: Report size in bytes (defaults to the file's size)
+            anchor: Fragment appended to the link, e.g. a run id for the report viewer
+
+        Returns:
+            The appended entry
+        """
+        report_path = Path(report_path)
+        entry = {
+            'category': category,
+            'title': title,
+            'path': Path(os.path.relpath(report_path.resolve(), self.root.resolve())).as_posix()
+                    + (f'#{anchor}' if anchor else ''),
+            'timestamp': (timestamp or datetime.now()).isoformat(timespec='seconds'),
+            'size': report_path.stat().st_size if size is None else size,
+            'summary': summary or {}
+        }
+        self.root.mkdir(parents=True, exist_ok=True)
+        line = json.dumps(entry, default=str) + '\n'
+        if self._ends_mid_line():
+            # Start on a fresh line after an interrupted write instead of extending it
+            line = '\n' + line
+        # One write per line in append mode, so concurrent writers never interleave entries
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line)
+        return entry
+
+    def _ends_mid_line(self) -> bool:
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) != b'\n'
+        except (FileNotFoundError, OSError):
+            # Missing or empty manifest
+            return False
+
+    def entries(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Current entries by category, newest first.
+
+        A report rewritten in place (same path) keeps only its latest entry.
+        """
+        latest: Dict[str, Dict[str, Any]] = {}
+        if not self.path.exists():
+            return {}
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A writer interrupted mid-line leaves a partial last entry
+                    logger.warning(f"Skipping malformed manifest line {line_no}")
+                    continue
+                latest.pop(entry['path'], None)
+                latest[entry['path']] = entry
+
+        by_category: Dict[str, List[Dict[str, Any]]] = {}
+        for entry in reversed(list(latest.values())):
+            by_category.setdefault(entry['category'], []).append(entry)
+        return by_category
+
+    @staticmethod
+    def page(entries: List[Dict[str, Any]], page: int = 1, per_page: int = 12) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        One page of entries and the number of pages.
+
+        Args:
+            entries: Entries of one category, newest first
+            page: 1-based page number
+            per_page: Entries per page
+        """
+        pages = max(1, -(-len(entries) // per_page))
+        start = (page - 1) * per_page
+        return entries[start:start + per_page], pages
@@ -0,0 +1,384 @@
+"""
+Compact report storage for Operation Titan runs.
+Each run is saved as one gzip-compressed, base64-encoded JSON payload (analysis
+data plus plotly figure specs) wrapped in a small script file. A single static
+viewer page loads any run's payload on demand and renders the charts
+client-side, so a run costs kilobytes instead of a full HTML report.
+"""
+
+import os
+import re
+import sys
+import gzip
+import json
+import base64
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import plotly.graph_objects as go
+
+# Add src to path so sibling modules resolve when imported as src.<module>
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from plotly_assets import plotly_script_tag
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+PAYLOAD_DIR = 'payloads'
+VIEWER_FILE = 'viewer.html'
+RUN_ID_FORMAT = '%Y%m%d_%H%M%S'
+
+_PAYLOAD_PATTERN = re.compile(r'TitanReports\.register\("([^"]+)", "([^"]*)"\);')
+
+
+def encode_payload(payload: Dict[str, Any]) -> str:
+    """Compact JSON, gzip-compressed and base64-encoded."""
+    raw = json.dumps(payload, separators=(',', ':'), default=str).encode('utf-8')
+    return base64.b64encode(gzip.compress(raw, compresslevel=9, mtime=0)).decode('ascii')
+
+
+def decode_payload(encoded: str) -> Dict[str, Any]:
+    """Inverse of encode_payload."""
+    return json.loads(gzip.decompress(base64.b64decode(encoded)).decode('utf-8'))
+
+
+def figure_spec(fig: go.Figure) -> Dict[str, Any]:
+    """Plain-JSON data and layout of a figure, as Plotly.newPlot takes them."""
+    return json.loads(fig.to_json())
+
+
+class ReportStore:
+    """Writes run payloads and the static viewer that renders them."""
+
+    def __init__(self, report_dir: Optional[str] = None):
+        """
+        Initialize the store.
+
+        Args:
+            report_dir: Directory holding the viewer and the payloads/ subdirectory
+        """
+        if report_dir is None:
+            report_dir = Path(__file__).parent.parent / 'output' / 'titan_reports'
+        self.report_dir = Path(report_dir)
+        self.payload_dir = self.report_dir / PAYLOAD_DIR
+        self.payload_dir.mkdir(parents=True, exist_ok=True)
+
+    def payload_path(self, run_id: str) -> Path:
+        """Script file holding a run's encoded payload."""
+        return self.payload_dir / f'{run_id}.js'
+
+    def runs(self) -> List[str]:
+        """Stored run ids, oldest first."""
+        return sorted(path.stem for path in self.payload_dir.glob('*.js') if path.name != 'index.js')
+
+    def new_run_id(self, when: Optional[datetime] = None) -> str:
+        """
+        Unused run id for a run started at when (defaults to now).
+
+        Ids are RUN_ID_FORMAT timestamps; runs started within the same second get
+        a numeric suffix instead of overwriting each other.
+        """
+        base = (when or datetime.now()).strftime(RUN_ID_FORMAT)
+        run_id, suffix = base, 1
+        while self.payload_path(run_id).exists():
+            suffix += 1
+            run_id = f'{base}_{suffix}'
+        return run_id
+
+    def write(self, payload: Dict[str, Any], run_id: Optional[str] = None) -> Path:
+        """
+        Store one run's payload and refresh the run index and viewer.
+
+        Args:
+            payload: JSON-serializable run data; figures go under 'figures' as figure_spec() dicts
+            run_id: Run identifier (defaults to new_run_id())
+
+        Returns:
+            Path to the viewer page
+
+        Raises:
+            FileExistsError: A payload with this run id is already stored
+        """
+        run_id = run_id or self.new_run_id()
+        if self.payload_path(run_id).exists():
+            raise FileExistsError(f"Report payload for run {run_id} already exists")
+        encoded = encode_payload({'run_id': run_id, **payload})
+        self._write_atomic(self.payload_path(run_id), f'TitanReports.register("{run_id}", "{encoded}");\n')
+        self._write_atomic(self.payload_dir / 'index.js', f'TitanReports.index({json.dumps(self.runs())});\n')
+        logger.info(f"Saved report payload {run_id} ({len(encoded) / 1024:.1f} KB)")
+        return self.write_viewer()
+
+    def load(self, run_id: str) -> Dict[str, Any]:
+        """Decode a stored run's payload."""
+        match = _PAYLOAD_PATTERN.search(self.payload_path(run_id).read_text(encoding='utf-8'))
+        if match is None:
+            raise ValueError(f"Malformed report payload for run {run_id}")
+        return decode_payload(match.group(2))
+
+    def write_viewer(self) -> Path:
+        """Write the viewer page if it is missing or out of date."""
+        viewer = self.report_dir / VIEWER_FILE
+        html = VIEWER_TEMPLATE.replace('{{ plotly_script }}', plotly_script_tag(self.report_dir))
+        if not viewer.exists() or viewer.read_text(encoding='utf-8') != html:
+            self._write_atomic(viewer, html)
+        return viewer
+
+    @staticmethod
+    def _write_atomic(path: Path, text: str):
+        partial = path.with_suffix(path.suffix + '.tmp')
+        partial.write_text(text, encoding='utf-8')
+        os.replace(partial, path)
+
+
+VIEWER_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Operation Titan Reports</title>
+    {{ plotly_script }}
+    <style>
+        body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+               background-color: #0a0a0a; color: #ffffff; margin: 0; line-height: 1.6; }
+        .container { max-width: 1400px; margin: 0 auto; padding: 20px; }
+        .header { background: linear-gradient(135deg, #2a3bff 0%, #00d4ff 100%); padding: 30px 40px;
+                  border-radius: 16px; margin-bottom: 30px; display: flex; justify-content: space-between;
+                  align-items: center; flex-wrap: wrap; gap: 20px; }
+        .header h1 { margin: 0; font-size: 2.2em; }
+        select { background: #1a1a1a; color: #ffffff; border: 1px solid #333; border-radius: 8px;
+                 padding: 10px; font-size: 1em; }
+        .metrics { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px;
+                   margin-bottom: 30px; }
+        .metric { background: #1a1a1a; border-radius: 12px; padding: 20px; border: 1px solid #333; }
+        .metric .label { color: #999; font-size: 0.9em; }
+        .metric .value { font-size: 1.6em; font-weight: bold; color: #00d4ff; }
+        .chart { background: #1a1a1a; border-radius: 12px; padding: 20px; margin-bottom: 30px;
+                 border: 1px solid #333; }
+        .section { background: #1a1a1a; border: 1px solid #333; border-radius: 12px; padding: 30px;
+                   margin-bottom: 20px; }
+        .section h2 { color: #00d4ff; margin-top: 0; border-bottom: 2px solid #333; padding-bottom: 10px; }
+        .section .chart { padding: 0; border: none; margin: 20px 0; }
+        .metric .change { font-size: 0.9em; color: #00ff88; }
+        .alert { padding: 15px 20px; border-radius: 8px; margin: 20px 0; border-left: 4px solid; }
+        .alert-warning { background: rgba(255, 183, 0, 0.1); border-color: #ffb700; color: #ffb700; }
+        .alert-success { background: rgba(0, 255, 136, 0.1); border-color: #00ff88; color: #00ff88; }
+        .signal-box { background: #252525; border: 2px solid #888; border-radius: 12px; padding: 30px;
+                      text-align: center; margin: 30px 0; }
+        .signal-bullish { border-color: #00ff88; }
+        .signal-bearish { border-color: #ff3b3b; }
+        .rationale { text-align: left; background: rgba(0,0,0,0.3); padding: 15px; border-radius: 8px; }
+        table { width: 100%; border-collapse: collapse; margin: 20px 0; }
+        th, td { padding: 12px; text-align: left; border-bottom: 1px solid #333; }
+        th { background: #252525; color: #00d4ff; }
+        .tag { display: inline-block; padding: 4px 12px; border-radius: 16px; font-size: 0.85em; font-weight: 600; }
+        .tag-success { background: rgba(0, 255, 136, 0.2); color: #00ff88; }
+        .tag-warning { background: rgba(255, 183, 0, 0.2); color: #ffb700; }
+        .tag-danger { background: rgba(255, 59, 59, 0.2); color: #ff3b3b; }
+        .status { color: #999; }
+        .error { color: #ff3b3b; }
+    </style>
+</head>
+<body>
+<div class="container">
+    <div class="header">
+        <h1>Operation Titan Analysis</h1>
+        <select id="run"></select>
+    </div>
+    <div id="status" class="status">Loading report index...</div>
+    <div id="report"></div>
+</div>
+<script>
+window.TitanReports = {
+    runs: [],
+    payloads: {},
+    index: function(runs) { this.runs = runs; },
+    register: function(runId, encoded) { this.payloads[runId] = encoded; }
+};
+
+function loadScript(src) {
+    return new Promise(function(resolve, reject) {
+        var script = document.createElement('script');
+        script.src = src;
+        script.onload = resolve;
+        script.onerror = function() { reject(new Error('Could not load ' + src)); };
+        document.head.appendChild(script);
+    });
+}
+
+function decode(encoded) {
+    var bytes = Uint8Array.from(atob(encoded), function(c) { return c.charCodeAt(0); });
+    var stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+    return new Response(stream).text().then(JSON.parse);
+}
+
+function money(value) {
+    return typeof value === 'number' ? '$' + value.toFixed(4) : 'n/a';
+}
+
+function escape(text) {
+    return String(text).replace(/[&<>"]/g, function(c) {
+        return {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'}[c];
+    });
+}
+
+function metric(label, value, change) {
+    return '<div class="metric"><div class="label">' + escape(label) + '</div><div class="value">' + escape(value) +
+        '</div>' + (change ? '<div class="change">' + escape(change) + '</div>' : '') + '</div>';
+}
+
+function metrics(items) {
+    return '<div class="metrics">' + items.join('') + '</div>';
+}
+
+function list(items) {
+    return '<ul>' + items.map(function(item) { return '<li>' + escape(item) + '</li>'; }).join('') + '</ul>';
+}
+
+function section(title, body) {
+    return '<div class="section"><h2>' + title + '</h2>' + body + '</div>';
+}
+
+// Placeholder filled with the named figure once the report HTML is in place
+function chart(name) {
+    return '<div class="chart" data-figure="' + name + '"></div>';
+}
+
+function daoStatus(progress) {
+    if (progress > 50) { return '<span class="tag tag-success">Active</span>'; }
+    if (progress > 0) { return '<span class="tag tag-warning">Started</span>'; }
+    return '<span class="tag tag-danger">Pending</span>';
+}
+
+// Same sections as the standalone dashboard, from the formatted values in payload.context
+function sections(c) {
+    var phase = c.phase_status || {};
+    var targets = c.price_targets || {};
+    var daoRows = (c.dao_details || []).map(function(row) {
+        var info = row[1];
+        return '<tr><td>' + escape(row[0]) + '</td><td>' + escape(info.eth_allocation) + ' ETH</td><td>' +
+            escape(info.eth_remaining) + ' ETH</td><td>' + escape(info.wild_balance) + '</td><td>' +
+            escape(info.progress_str) + '%</td><td>' + daoStatus(info.progress) + '</td></tr>';
+    }).join('');
+    return [
+        section('Executive Summary', metrics([
+            metric('Generated', c.timestamp),
+            metric('Current Phase', phase.current_phase || 'n/a', (phase.days_since_phase2_greenlit || 0) + ' days since Phase 2'),
+            metric('Total ETH Allocated', c.total_eth_allocation + ' ETH', '$' + c.total_usd_value),
+            metric('Expected WILD Buyback', c.total_expected_wild + 'M', c.supply_reduction_pct + '% supply reduction'),
+            metric('Overall Progress', c.overall_progress + '%', c.execution_status)
+        ]) + '<div class="signal-box signal-' + escape(c.signal_sentiment) + '"><h3>Trading Signal: ' +
+            escape(c.signal_action) + '</h3><p>Confidence: ' + escape(c.signal_confidence) + '</p>' +
+            '<div class="rationale"><strong>Rationale:</strong>' + list(c.signal_rationale || []) + '</div></div>'),
+        section('DAO Buyback Progress', chart('dao_progress') +
+            '<table><thead><tr><th>DAO Name</th><th>ETH Allocated</th><th>ETH Remaining</th><th>WILD Balance</th>' +
+            '<th>Progress</th><th>Status</th></tr></thead><tbody>' + daoRows + '</tbody></table>'),
+        section('Supply Dynamics &amp; Deflationary Mechanics', chart('supply_dynamics') + metrics([
+            metric('Circulating Supply', c.circulating_supply + 'M'),
+            metric('OTC Locked', c.otc_locked + 'M'),
+            metric('Annual Deflation Rate', c.annual_deflation + '%')
+        ])),
+        section('Price Impact &amp; Targets', chart('price_impact') +
+            '<div class="alert alert-success"><strong>Price Targets Summary:</strong><br>Conservative: $' +
+            escape(targets.conservative) + ' | Base Case: $' + escape(targets.base_case) + ' | Optimistic: $' +
+            escape(targets.optimistic) + ' | 1 Year: $' + escape(targets.one_year) + '</div>'),
+        section('Risk Assessment', chart('risk_matrix') + ((c.risk_concerns || []).length ?
+            '<div class="alert alert-warning"><strong>Key Risk Factors:</strong>' + list(c.risk_concerns) + '</div>' : '')),
+        section('Operation Titan Timeline', chart('timeline')),
+        section('Your Portfolio Exposure', chart('wallet_exposure') + metrics([
+            metric('Total WILD Holdings', c.total_wild_holdings),
+            metric('LP Token Exposure', c.lp_exposure),
+            metric('Potential Gain (Base Case)', '$' + c.potential_gain)
+        ])),
+        section('Technical Analysis', chart('technical_analysis')),
+        section('Recommendations &amp; Next Steps', '<h3>Monitoring Checklist:</h3>' + list([
+            'Daily: Check DAO wallet balances for ETH outflows',
+            'Daily: Monitor Uniswap V3 pool for large WILD/ETH swaps',
+            'Weekly: Review burn rate from in-game activities',
+            'Weekly: Update price targets based on buyback progress'
+        ]) + '<h3>Action Items:</h3>' + list([
+            'Set alerts for DAO wallet transactions > 10 ETH',
+            'Monitor WILD price for entry points below conservative target',
+            'Track Wiami.Fun activity for burn rate acceleration',
+            'Review weekly for Phase 2 execution confirmation'
+        ]))
+    ].join('');
+}
+
+// Payloads written before the report context was stored carry only the headline numbers
+function headline(payload) {
+    var titan = payload.titan_data || {};
+    var impact = payload.titan_impact || {};
+    var targets = impact.price_targets || {};
+    var signals = impact.trading_signals || {};
+    var phase = titan.phase_status || {};
+    return metrics([
+        metric('Generated', (payload.timestamp || payload.run_id).replace('T', ' ').slice(0, 19)),
+        metric('Current Phase', phase.current_phase || 'n/a'),
+        metric('WILD Price', money(targets.current_price)),
+        metric('Base Case Target', money(targets.base_case)),
+        metric('1 Year Target', money(targets['1_year_target'])),
+        metric('Signal', (signals.action || 'n/a').toUpperCase() + (signals.confidence ? ' (' + signals.confidence + ')' : ''))
+    ]);
+}
+
+function render(payload) {
+    var report = document.getElementById('report');
+    report.innerHTML = payload.context ? sections(payload.context) : headline(payload);
+
+    var figures = payload.figures || {};
+    Object.keys(figures).forEach(function(name) {
+        var div = report.querySelector('[data-figure="' + name + '"]');
+        if (!div) {
+            div = document.createElement('div');
+            div.className = 'chart';
+            report.appendChild(div);
+        }
+        Plotly.newPlot(div, figures[name].data, figures[name].layout, {responsive: true});
+    });
+}
+
+function show(runId) {
+    var status = document.getElementById('status');
+    status.className = 'status';
+    status.textContent = 'Loading ' + runId + '...';
+    var loaded = TitanReports.payloads[runId] ? Promise.resolve() : loadScript('payloads/' + runId + '.js');
+    loaded.then(function() { return decode(TitanReports.payloads[runId]); })
+        .then(function(payload) { render(payload); status.textContent = ''; })
+        .catch(function(error) { status.className = 'error'; status.textContent = error.message; });
+}
+
+// The index changes every run, so bypass the browser cache for it; payloads never change
+loadScript('payloads/index.js?' + Date.now()).then(function() {
+    var select = document.getElementById('run');
+    var runs = TitanReports.runs.slice().reverse();
+    if (!runs.length) {
+        document.getElementById('status').textContent = 'No reports yet.';
+        return;
+    }
+    select.innerHTML = runs.map(function(runId) {
+        return '<option value="' + runId + '">' + runId.replace(/^(\\d{4})(\\d{2})(\\d{2})_(\\d{2})(\\d{2})(\\d{2})$/, '$1-$2-$3 $4:$5:$6') + '</option>';
+    }).join('');
+    var requested = window.location.hash.slice(1);
+    select.value = runs.indexOf(requested) >= 0 ? requested : runs[0];
+    select.onchange = function() { window.location.hash = select.value; };
+    window.onhashchange = function() {
+        var runId = window.location.hash.slice(1);
+        if (runs.indexOf(runId) >= 0) { select.value = runId; show(runId); }
+    };
+    show(select.value);
+}).catch(function(error) {
+    var status = document.getElementById('status');
+    status.className = 'error';
+    status.textContent = error.message;
+});
+</script>
+</body>
+</html>
+"""
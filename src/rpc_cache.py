@@ -0,0 +1,193 @@
+"""
+Immutable JSON-RPC result cache.
+Results of block-pinned eth_call / eth_getBlockByNumber requests never change, so
+they are cached by (method, block, call parameters) in an LRU memory tier in front
+of an SQLite on-disk tier. 'latest' is resolved to a concrete block number first.
+"""
+
+import json
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Block tags that must be resolved to a number before a result can be cached
+MOVING_BLOCK_TAGS = ('latest', 'pending', 'safe', 'finalized')
+
+
+class ImmutableCallCache:
+    """Two-tier cache for RPC results pinned to a block."""
+
+    def __init__(self, cache_dir: Optional[str] = None, memory_size: int = 4096,
+                 confirmations: int = 12, head_ttl: float = 6.0):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory for the SQLite file
+            memory_size: Maximum entries in the LRU memory tier
+            confirmations: Only blocks at least this deep are written to disk (reorg safety)
+            head_ttl: Seconds a resolved 'latest' block number is reused
+        """
+        if cache_dir is None:
+            cache_dir = Path(__file__).parent.parent / 'data' / 'cache'
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.cache_dir / 'rpc_cache.sqlite'
+
+        self.memory_size = memory_size
+        self.confirmations = confirmations
+        self.head_ttl = head_ttl
+
+        self.memory: 'OrderedDict[str, Any]' = OrderedDict()
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.db.execute('CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+        self.db.commit()
+
+        self.head_block: Optional[int] = None
+        self.head_fetched_at = 0.0
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+
+    @staticmethod
+    def make_key(method: str, params: List[Any]) -> Optional[Tuple[str, int]]:
+        """Build a cache key for a request, or None if its result can change.
+
+        Returns:
+            (key, block_number) tuple
+        """
+        if method == 'eth_call' and len(params) >= 2:
+            block = params[1]
+            if isinstance(block, str) and block.startswith('0x'):
+                call = json.dumps(params[0], sort_keys=True, separators=(',', ':'))
+                return f"eth_call:{int(block, 16)}:{call.lower()}", int(block, 16)
+        elif method == 'eth_getBlockByNumber' and params:
+            block = params[0]
+            if isinstance(block, str) and block.startswith('0x'):
+                full = bool(params[1]) if len(params) > 1 else False
+                return f"eth_getBlockByNumber:{int(block, 16)}:{int(full)}", int(block, 16)
+        return None
+
+    def get(self, key: str) -> Optional[Any]:
+        """Look a key up in memory, then on disk."""
+        with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return self.memory[key]
+
+            row = self.db.execute('SELECT value FROM results WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self.stats['misses'] += 1
+                return None
+
+            value = json.loads(row[0])
+            self.stats['disk_hits'] += 1
+            self._remember(key, value)
+            return value
+
+    def put(self, key: str, value: Any, block: Optional[int] = None):
+        """
+        Store a result; blocks shallower than the confirmation depth stay in memory only.
+
+        While the head is unknown the depth of a block cannot be checked, so block-pinned
+        results are kept in memory only until resolve_head() has run.
+        """
+        with self.lock:
+            self._remember(key, value)
+            if block is None or (self.head_block is not None and block <= self.head_block - self.confirmations):
+                self.db.execute('INSERT OR REPLACE INTO results (key, value) VALUES (?, ?)',
+                                (key, json.dumps(value)))
+                self.db.commit()
+
+    def _remember(self, key: str, value: Any):
+        """Insert into the LRU memory tier, evicting the oldest entry when full."""
+        self.memory[key] = value
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_size:
+            self.memory.popitem(last=False)
+
+    def resolve_head(self, fetch_head: Callable[[], int]) -> int:
+        """Return the head block, refetching at most once per head_ttl seconds."""
+        now = time.time()
+        if self.head_block is None or now - self.head_fetched_at > self.head_ttl:
+            self.head_block = fetch_head()
+            self.head_fetched_at = now
+        return self.head_block
+
+    def resolve_params(self, method: str, params: List[Any], fetch_head: Callable[[], int]) -> List[Any]:
+        """Replace a moving block tag with the concrete head block number."""
+        params = list(params)
+        position = {'eth_call': 1, 'eth_getBlockByNumber': 0}.get(method)
+        if position is None:
+            return params
+
+        if len(params) <= position:
+            params.append('latest')
+        if params[position] in MOVING_BLOCK_TAGS:
+            params[position] = hex(self.resolve_head(fetch_head))
+        return params
+
+    def clear_memory(self):
+        """Drop the memory tier (the disk tier is kept)."""
+        with self.lock:
+            self.memory.clear()
+
+
+def construct_immutable_cache_middleware(cache: ImmutableCallCache):
+    """
+    Build a web3 middleware that serves block-pinned calls from the cache.
+
+    Inject it at the innermost layer so it sees and stores raw JSON results:
+        w3.middleware_onion.inject(construct_immutable_cache_middleware(cache), 'immutable_cache', layer=0)
+    """
+    def immutable_cache_middleware(make_request, w3):
+        chain_id: Dict[str, Any] = {}
+
+        def fetch_head() -> int:
+            return int(make_request('eth_blockNumber', [])['result'], 16)
+
+        def middleware(method, params):
+            # The chain id of an endpoint never changes; web3 asks for it before every eth_call
+            if method == 'eth_chainId':
+                if 'response' in chain_id:
+                    return chain_id['response']
+                response = make_request(method, params)
+                if response.get('error') is None:
+                    chain_id['response'] = response
+                return response
+
+            if method not in ('eth_call', 'eth_getBlockByNumber'):
+                return make_request(method, params)
+
+            params = cache.resolve_params(method, params, fetch_head)
+            cache_key = cache.make_key(method, params)
+            if cache_key is None:
+                return make_request(method, params)
+
+            key, block = cache_key
+            cached = cache.get(key)
+            if cached is not None:
+                return {'jsonrpc': '2.0', 'id': 0, 'result': cached}
+
+            response = make_request(method, params)
+            if response.get('error') is None and response.get('result') is not None:
+                if cache.head_block is None:
+                    # Learn the head so a deep enough block can go to disk
+                    cache.resolve_head(fetch_head)
+                cache.put(key, response['result'], block)
+            return response
+
+        return middleware
+
+    return immutable_cache_middleware
@@ -0,0 +1,152 @@
+"""
+Minimal Ethereum JSON-RPC client.
+Talks directly to any node (Infura, a local node, or a local dev chain such as
+anvil/hardhat) and supports batched requests, which web3.py 6 does not expose.
+"""
+
+import os
+import time
+import itertools
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+from dotenv import load_dotenv
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Load environment variables
+load_dotenv(Path(__file__).parent.parent / 'config' / '.env')
+
+# Local node / dev chain default (anvil, hardhat and geth --dev all listen here)
+LOCAL_RPC_URL = 'http://127.0.0.1:8545'
+
+# Error fragments nodes and gateways use when throttling a caller (HTTP 429 included)
+RATE_LIMIT_HINTS = (
+    'rate limit', 'too many requests', 'request rate', 'requests per second', 'exceeded the rate'
+)
+
+
+class RPCError(Exception):
+    """Raised when a JSON-RPC call returns an error object or fails in transport."""
+
+    def __init__(self, message: str, code: Optional[int] = None):
+        super().__init__(message)
+        self.code = code
+
+
+def is_rate_limited(error: RPCError) -> bool:
+    """Check whether an RPC error means the caller is being throttled."""
+    message = str(error).lower()
+    return error.code == 429 or any(hint in message for hint in RATE_LIMIT_HINTS)
+
+
+def default_rpc_url() -> str:
+    """Resolve the RPC endpoint from the environment.
+
+    ETH_RPC_URL wins, then Infura (INFURA_PROJECT_ID), then a local node.
+    """
+    url = os.getenv('ETH_RPC_URL')
+    if url:
+        return url
+    project_id = os.getenv('INFURA_PROJECT_ID')
+    if project_id:
+        return f"https://mainnet.infura.io/v3/{project_id}"
+    return LOCAL_RPC_URL
+
+
+class JsonRpcClient:
+    """Thin HTTP JSON-RPC client with batch support."""
+
+    def __init__(self, url: Optional[str] = None, timeout: float = 30.0,
+                 max_retries: int = 4, backoff: float = 0.5):
+        """
+        Initialize the client for a single endpoint.
+
+        Args:
+            url: Endpoint URL (defaults to default_rpc_url())
+            timeout: Per-request timeout in seconds
+            max_retries: Retries of a rate-limited request before giving up
+            backoff: Seconds before the first retry; doubles on each further one
+        """
+        self.url = url or default_rpc_url()
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.session = requests.Session()
+        self._ids = itertools.count(1)
+
+    def _post(self, payload: Any) -> Any:
+        """POST a payload and return the decoded JSON body."""
+        try:
+            response = self.session.post(self.url, json=payload, timeout=self.timeout)
+            response.raise_for_status()
+            return response.json()
+        except requests.RequestException as e:
+            raise RPCError(f"Transport error talking to {self.url}: {e}")
+        except ValueError as e:
+            raise RPCError(f"Invalid JSON from {self.url}: {e}")
+
+    def _with_backoff(self, request: Callable[[], Any]) -> Any:
+        """Run a request, retrying with exponential backoff while the endpoint rate-limits it."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                return request()
+            except RPCError as e:
+                if attempt == self.max_retries or not is_rate_limited(e):
+                    raise
+                delay = self.backoff * 2 ** attempt
+                logger.warning(f"Rate limited by {self.url}, retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+    @staticmethod
+    def _unwrap(reply: Dict[str, Any]) -> Any:
+        """Return the result of a reply or raise its error."""
+        if 'error' in reply and reply['error'] is not None:
+            error = reply['error']
+            raise RPCError(error.get('message', str(error)), error.get('code'))
+        return reply.get('result')
+
+    def call(self, method: str, params: Optional[List[Any]] = None) -> Any:
+        """Issue a single JSON-RPC call and return its result."""
+        payload = {'jsonrpc': '2.0', 'id': next(self._ids), 'method': method, 'params': params or []}
+        return self._with_backoff(lambda: self._unwrap(self._post(payload)))
+
+    def batch(self, calls: List[Tuple[str, List[Any]]]) -> List[Any]:
+        """
+        Issue several calls in one HTTP round trip.
+
+        Args:
+            calls: List of (method, params) tuples
+
+        Returns:
+            Results in the same order as calls; raises RPCError if any call failed
+        """
+        if not calls:
+            return []
+
+        payload = []
+        for method, params in calls:
+            payload.append({'jsonrpc': '2.0', 'id': next(self._ids), 'method': method, 'params': params})
+        return self._with_backoff(lambda: self._send_batch(payload))
+
+    def _send_batch(self, payload: List[Dict[str, Any]]) -> List[Any]:
+        replies = self._post(payload)
+        if isinstance(replies, dict):
+            # Some nodes answer a rejected batch with a single error object
+            self._unwrap(replies)
+            raise RPCError(f"Unexpected non-batch reply from {self.url}")
+
+        by_id = {reply.get('id'): reply for reply in replies}
+        return [self._unwrap(by_id.get(entry['id'], {'error': {'message': 'missing reply'}}))
+                for entry in payload]
+
+    def block_number(self) -> int:
+        """Return the current head block number."""
+        return int(self.call('eth_blockNumber'), 16)
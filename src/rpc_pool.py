@@ -0,0 +1,280 @@
+"""
+JSON-RPC provider pool.
+Spreads calls over several endpoints (Infura, a local node, any other URL),
+tracking rolling latency percentiles and error rates per endpoint. Each call
+goes to the fastest healthy endpoint and fails over to the next one;
+latency-critical reads are hedged across the two fastest endpoints.
+"""
+
+import os
+import sys
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+from web3.providers.base import JSONBaseProvider
+
+# Add src to path so sibling modules resolve when imported as src.<module>
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from rpc_client import JsonRpcClient, RPCError, LOCAL_RPC_URL
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Load environment variables
+load_dotenv(Path(__file__).parent.parent / 'config' / '.env')
+
+# Small reads on the alert path; hedging them costs little and cuts tail latency
+HEDGED_METHODS = (
+    'eth_blockNumber', 'eth_getBalance', 'eth_call', 'eth_getBlockByNumber', 'eth_chainId'
+)
+
+
+def default_endpoints() -> List[str]:
+    """Collect endpoints from the environment.
+
+    ETH_RPC_URLS (comma-separated) and ETH_RPC_URL come first, then Infura
+    (INFURA_PROJECT_ID), then a local node as the last resort.
+    """
+    urls = [u.strip() for u in os.getenv('ETH_RPC_URLS', '').split(',') if u.strip()]
+    if os.getenv('ETH_RPC_URL'):
+        urls.append(os.getenv('ETH_RPC_URL'))
+    if os.getenv('INFURA_PROJECT_ID'):
+        urls.append(f"https://mainnet.infura.io/v3/{os.getenv('INFURA_PROJECT_ID')}")
+    urls.append(LOCAL_RPC_URL)
+
+    # Keep the first occurrence of each URL
+    return list(dict.fromkeys(urls))
+
+
+class RPCEndpoint:
+    """One endpoint with a rolling window of latencies and outcomes."""
+
+    def __init__(self, url: str, timeout: float, window: int, error_horizon: float = 300.0):
+        self.url = url
+        self.client = JsonRpcClient(url, timeout=timeout)
+        self.latencies = deque(maxlen=window)
+        # (time, ok) pairs; outcomes older than error_horizon no longer count toward the error rate
+        self.outcomes = deque(maxlen=window)
+        self.error_horizon = error_horizon
+        self.cooldown_until = 0.0
+        self.lock = threading.Lock()
+
+    def record(self, latency: float, ok: bool):
+        """Record the outcome of one request."""
+        with self.lock:
+            self.outcomes.append((time.time(), ok))
+            if ok:
+                self.latencies.append(latency)
+
+    def percentile(self, q: float) -> float:
+        """Rolling latency percentile in seconds (0 until measured, so new endpoints get probed)."""
+        with self.lock:
+            if not self.latencies:
+                return 0.0
+            return float(np.percentile(list(self.latencies), q))
+
+    @property
+    def error_rate(self) -> float:
+        """
+        Share of failed requests in the rolling window within the error horizon.
+
+        Decaying by time matters because an endpoint ranked last gets no traffic
+        to refresh its window: once its bad spell ages out it is healthy again.
+        """
+        with self.lock:
+            since = time.time() - self.error_horizon
+            recent = [ok for at, ok in self.outcomes if at >= since]
+            if not recent:
+                return 0.0
+            return 1 - sum(recent) / len(recent)
+
+    def stats(self) -> Dict[str, Any]:
+        """Summary of the rolling window."""
+        return {
+            'url': self.url,
+            'p50_ms': round(self.percentile(50) * 1000, 1),
+            'p95_ms': round(self.percentile(95) * 1000, 1),
+            'error_rate': round(self.error_rate, 3),
+            'requests': len(self.outcomes),
+            'cooling_down': time.time() < self.cooldown_until
+        }
+
+
+class RPCProviderPool:
+    """Routes JSON-RPC calls across several endpoints by measured latency and health.
+
+    Exposes the same call/batch/block_number interface as JsonRpcClient, so it
+    can back TransferLogIndexer, SupplyTracker and HolderIndex, and a web3
+    provider via web3_provider().
+    """
+
+    def __init__(self, urls: Optional[List[str]] = None, timeout: float = 10.0,
+                 window: int = 100, max_error_rate: float = 0.3, cooldown: float = 30.0,
+                 error_horizon: float = 300.0,
+                 hedge_methods: Tuple[str, ...] = HEDGED_METHODS,
+                 min_hedge_delay: float = 0.05):
+        """
+        Initialize the pool.
+
+        Args:
+            urls: Endpoint URLs (defaults to default_endpoints())
+            timeout: Per-request timeout in seconds
+            window: Number of recent requests kept per endpoint
+            max_error_rate: Endpoints above this error rate are skipped while others are healthy
+            cooldown: Seconds an endpoint is skipped after a transport failure
+            error_horizon: Seconds a failure counts toward an endpoint's error rate
+            hedge_methods: Methods raced against a second endpoint when the first is slow
+            min_hedge_delay: Lower bound in seconds on the wait before sending the hedge
+        """
+        self.endpoints = [RPCEndpoint(url, timeout, window, error_horizon) for url in (urls or default_endpoints())]
+        if not self.endpoints:
+            raise ValueError("RPCProviderPool needs at least one endpoint")
+
+        self.max_error_rate = max_error_rate
+        self.cooldown = cooldown
+        self.hedge_methods = set(hedge_methods)
+        self.min_hedge_delay = min_hedge_delay
+        self.executor = ThreadPoolExecutor(max_workers=max(4, 2 * len(self.endpoints)),
+                                           thread_name_prefix='rpc-pool')
+
+        # Shown in log messages that reference client.url
+        self.url = ', '.join(e.url for e in self.endpoints)
+
+    def _healthy(self, endpoint: RPCEndpoint) -> bool:
+        """Check whether an endpoint should receive traffic."""
+        return time.time() >= endpoint.cooldown_until and endpoint.error_rate <= self.max_error_rate
+
+    def ranked_endpoints(self) -> List[RPCEndpoint]:
+        """Healthy endpoints by p50 latency, then degraded ones as a last resort."""
+        healthy = sorted((e for e in self.endpoints if self._healthy(e)), key=lambda e: e.percentile(50))
+        degraded = sorted((e for e in self.endpoints if not self._healthy(e)), key=lambda e: e.error_rate)
+        return healthy + degraded
+
+    def _timed(self, endpoint: RPCEndpoint, request: Callable[[JsonRpcClient], Any]) -> Any:
+        """Run a request against one endpoint, recording latency and outcome.
+
+        Transport failures (RPCError without a code) put the endpoint in cooldown.
+        JSON-RPC error replies mean the node is up, so they count as healthy
+        responses and propagate to the caller unchanged.
+        """
+        started = time.monotonic()
+        try:
+            result = request(endpoint.client)
+        except RPCError as e:
+            if e.code is None:
+                endpoint.record(time.monotonic() - started, ok=False)
+                endpoint.cooldown_until = time.time() + self.cooldown
+                logger.warning(f"RPC endpoint {endpoint.url} failed, cooling down for {self.cooldown}s: {e}")
+            else:
+                endpoint.record(time.monotonic() - started, ok=True)
+            raise
+        endpoint.record(time.monotonic() - started, ok=True)
+        return result
+
+    def _with_failover(self, request: Callable[[JsonRpcClient], Any],
+                       endpoints: List[RPCEndpoint]) -> Any:
+        """Try endpoints in order until one answers."""
+        last_error = None
+        for endpoint in endpoints:
+            try:
+                return self._timed(endpoint, request)
+            except RPCError as e:
+                if e.code is not None:
+                    raise
+                last_error = e
+        raise RPCError(f"All RPC endpoints failed: {last_error}")
+
+    def _hedged(self, request: Callable[[JsonRpcClient], Any], endpoints: List[RPCEndpoint]) -> Any:
+        """
+        Send to the fastest endpoint and, if it has not answered within its own
+        p95 latency, race the same request on the runner-up. The first success
+        wins; if both fail the remaining endpoints are tried in order.
+        """
+        primary, backup = endpoints[0], endpoints[1]
+        hedge_delay = max(self.min_hedge_delay, primary.percentile(95))
+
+        tried = 1
+        pending = {self.executor.submit(self._timed, primary, request)}
+        done, _ = wait(pending, timeout=hedge_delay)
+        if not done:
+            pending.add(self.executor.submit(self._timed, backup, request))
+            tried = 2
+
+        last_error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    return future.result()
+                except RPCError as e:
+                    if e.code is not None:
+                        raise
+                    last_error = e
+
+        remaining = endpoints[tried:]
+        if not remaining:
+            raise RPCError(f"All RPC endpoints failed: {last_error}")
+        return self._with_failover(request, remaining)
+
+    def call(self, method: str, params: Optional[List[Any]] = None) -> Any:
+        """Issue a single JSON-RPC call on the best available endpoint."""
+        endpoints = self.ranked_endpoints()
+        request = lambda client: client.call(method, params)
+
+        healthy = [e for e in endpoints if self._healthy(e)]
+        if method in self.hedge_methods and len(healthy) > 1:
+            return self._hedged(request, endpoints)
+        return self._with_failover(request, endpoints)
+
+    def batch(self, calls: List[Tuple[str, List[Any]]]) -> List[Any]:
+        """Issue a batch on the best available endpoint, failing over as a whole."""
+        return self._with_failover(lambda client: client.batch(calls), self.ranked_endpoints())
+
+    def block_number(self) -> int:
+        """Return the current head block number."""
+        return int(self.call('eth_blockNumber'), 16)
+
+    def endpoint_stats(self) -> List[Dict[str, Any]]:
+        """Rolling latency and error statistics for every endpoint."""
+        return [e.stats() for e in self.endpoints]
+
+    def web3_provider(self) -> 'PooledProvider':
+        """Wrap the pool as a web3 provider."""
+        return PooledProvider(self)
+
+
+class PooledProvider(JSONBaseProvider):
+    """web3 provider that sends every request through an RPCProviderPool."""
+
+    def __init__(self, pool: RPCProviderPool):
+        super().__init__()
+        self.pool = pool
+
+    def make_request(self, method: str, params: Any) -> Dict[str, Any]:
+        try:
+            result = self.pool.call(method, list(params))
+        except RPCError as e:
+            return {'jsonrpc': '2.0', 'id': 0,
+                    'error': {'code': e.code if e.code is not None else -32000, 'message': str(e)}}
+        return {'jsonrpc': '2.0', 'id': 0, 'result': result}
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        try:
+            self.pool.block_number()
+            return True
+        except RPCError:
+            if show_traceback:
+                raise
+            return False
@@ -0,0 +1,155 @@
+"""
+Monte Carlo scenario engine for WILD price targets.
+Simulates price paths by block-bootstrapping the bundled historical daily WILD
+log returns and adding the remaining Operation Titan buyback as an impact term,
+then reports percentile targets and probability bands per horizon.
+"""
+
+import os
+import sys
+import logging
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+# Add src to path so sibling modules resolve when imported as src.<module>
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from price_fetcher import PriceFetcher
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Percentiles reported for every horizon
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# Price multiples of the current price reported as probabilities
+PROBABILITY_LEVELS = (0.5, 0.75, 1.0, 1.25, 1.5, 2.0)
+
+
+class ScenarioEngine:
+    """Simulates WILD price paths from bootstrapped historical returns plus buyback impact."""
+
+    def __init__(self, price_fetcher: Optional[PriceFetcher] = None, n_paths: int = 100000,
+                 horizons: Sequence[int] = (30, 90, 365), block_size: int = 5,
+                 execution_days: int = 30, impact_uncertainty: float = 0.5, seed: int = 42):
+        """
+        Initialize the engine.
+
+        Args:
+            price_fetcher: Source of the historical WILD price series
+            n_paths: Number of simulated paths
+            horizons: Horizons in days to report
+            block_size: Days per bootstrap block (keeps short-run volatility clustering)
+            execution_days: Days over which the remaining buyback impact is realized
+            impact_uncertainty: Per-path impact is scaled by a uniform draw in [1 - u, 1 + u]
+            seed: Random seed; identical inputs and seed give identical results
+        """
+        self.price_fetcher = price_fetcher or PriceFetcher()
+        self.n_paths = n_paths
+        self.horizons = sorted(set(horizons))
+        self.block_size = block_size
+        self.execution_days = execution_days
+        self.impact_uncertainty = impact_uncertainty
+        self.seed = seed
+
+    def historical_returns(self) -> np.ndarray:
+        """Daily WILD log returns from the bundled price history."""
+        series = self.price_fetcher.load_price_series('WILD')
+        daily = series.resample('D').last().dropna()
+        daily = daily[daily > 0]
+        return np.diff(np.log(daily.to_numpy(dtype=float)))
+
+    def latest_price(self) -> Optional[float]:
+        """Last known WILD close, used when no live price is available."""
+        series = self.price_fetcher.load_price_series('WILD')
+        return float(series.iloc[-1]) if not series.empty else None
+
+    def buyback_impact(self, titan_data: Dict[str, Any], completion_pct: float = 0.0) -> float:
+        """Expected log price impact of the buyback volume still to be executed."""
+        impact_pct = titan_data.get('price_impact', {}).get('estimated_price_impact_pct', 0)
+        remaining = max(0.0, 1 - completion_pct / 100)
+        return float(np.log1p(impact_pct / 100 * remaining))
+
+    def simulate(self, returns: np.ndarray, impact: float = 0.0) -> Dict[int, np.ndarray]:
+        """
+        Simulate cumulative log returns at each horizon.
+
+        Paths are built from blocks of consecutive historical returns; block sums
+        come from a prefix sum, so each block costs one draw per path.
+
+        Returns:
+            Mapping of horizon (days) to an array of n_paths cumulative log returns
+        """
+        block = min(self.block_size, len(returns))
+        if block < 1:
+            raise ValueError("No historical returns to bootstrap from")
+
+        rng = np.random.default_rng(self.seed)
+        prefix = np.concatenate([[0.0], np.cumsum(returns)])
+        n_starts = len(returns) - block + 1
+
+        # Buyback impact accrues linearly over the execution window, scaled per path
+        impact_scale = impact * rng.uniform(1 - self.impact_uncertainty, 1 + self.impact_uncertainty, self.n_paths)
+
+        results = {}
+        total = np.zeros(self.n_paths)
+        day = 0
+        pending = list(self.horizons)
+        while pending:
+            starts = rng.integers(0, n_starts, self.n_paths)
+            while pending and pending[0] <= day + block:
+                horizon = pending.pop(0)
+                partial = prefix[starts + horizon - day] - prefix[starts]
+                realized = min(horizon, self.execution_days) / self.execution_days if self.execution_days else 1.0
+                results[horizon] = total + partial + impact_scale * realized
+            total += prefix[starts + block] - prefix[starts]
+            day += block
+
+        return results
+
+    def price_targets(self, titan_data: Dict[str, Any], current_price: Optional[float] = None,
+                      completion_pct: float = 0.0) -> Dict[str, Any]:
+        """
+        Percentile price targets and probability bands for every horizon.
+
+        Args:
+            titan_data: TitanTracker summary report (supplies the buyback impact estimate)
+            current_price: Starting price (defaults to the last historical close)
+            completion_pct: Share of the buyback already executed
+
+        Returns:
+            Dict with the starting price, the impact term and per-horizon scenarios
+        """
+        current_price = current_price or self.latest_price()
+        if not current_price:
+            raise ValueError("No current WILD price available for the scenario engine")
+
+        returns = self.historical_returns()
+        impact = self.buyback_impact(titan_data, completion_pct)
+        simulated = self.simulate(returns, impact)
+
+        scenarios = {}
+        for horizon, log_returns in simulated.items():
+            prices = current_price * np.exp(log_returns)
+            scenarios[horizon] = {
+                'percentiles': dict(zip([f"p{q}" for q in PERCENTILES],
+                                        np.percentile(prices, PERCENTILES).round(6).tolist())),
+                'mean': float(prices.mean()),
+                'probabilities': {f"above_{level:g}x": float((prices > current_price * level).mean())
+                                  for level in PROBABILITY_LEVELS}
+            }
+
+        logger.info(f"Simulated {self.n_paths:,} WILD paths over {len(returns)} historical returns "
+                    f"(buyback impact {np.expm1(impact) * 100:.2f}%)")
+        return {
+            'current_price': current_price,
+            'buyback_impact_pct': float(np.expm1(impact) * 100),
+            'n_paths': self.n_paths,
+            'seed': self.seed,
+            'scenarios': scenarios
+        }
@@ -0,0 +1,239 @@
+"""
+WILD supply ledger - on-chain burn and circulating supply tracking.
+Indexes WILD Transfers to the zero/dead addresses and to or from a configurable
+excluded-address set (treasury, DAOs, vesting), persisting the running totals
+so each refresh only processes blocks added since the last one.
+"""
+
+import os
+import sys
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Optional, Any
+
+from dotenv import load_dotenv
+
+# Add src to path so sibling modules resolve when imported as src.<module>
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from rpc_client import JsonRpcClient, RPCError
+from log_indexer import TransferLogIndexer, topic_to_address
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Load environment variables
+load_dotenv(Path(__file__).parent.parent / 'config' / '.env')
+
+ZERO_ADDRESS = '0x0000000000000000000000000000000000000000'
+DEAD_ADDRESS = '0x000000000000000000000000000000000000dead'
+
+# totalSupply() selector
+TOTAL_SUPPLY_SELECTOR = '0x18160ddd'
+
+# Fallback start block, used only when the creation block cannot be located (a
+# node without archive state cannot answer historical eth_getCode). It is an
+# unverified mid-2021 estimate, not a sourced figure; set WILD_DEPLOY_BLOCK to the
+# contract's creation block from a block explorer to replay from the exact start.
+DEFAULT_DEPLOY_BLOCK = 12500000
+
+
+def deploy_block(client: JsonRpcClient, token_address: str, cache_dir: Optional[Path] = None) -> int:
+    """
+    Block a contract was created in.
+
+    WILD_DEPLOY_BLOCK wins; otherwise the block is found once by binary search on
+    eth_getCode (about 25 calls against an archive node) and cached in
+    deploy_blocks.json. Falls back to DEFAULT_DEPLOY_BLOCK if the search fails.
+    """
+    if os.getenv('WILD_DEPLOY_BLOCK'):
+        return int(os.getenv('WILD_DEPLOY_BLOCK'))
+
+    token = token_address.lower()
+    cache_file = Path(cache_dir or Path(__file__).parent.parent / 'data' / 'cache') / 'deploy_blocks.json'
+    cached = json.loads(cache_file.read_text()) if cache_file.exists() else {}
+    if token in cached:
+        return cached[token]
+
+    try:
+        low, high = 0, client.block_number()
+        if client.call('eth_getCode', [token, hex(high)]) in (None, '0x'):
+            raise RPCError(f"No contract code at {token}")
+        # Smallest block whose state holds the contract's code
+        while low < high:
+            middle = (low + high) // 2
+            if client.call('eth_getCode', [token, hex(middle)]) in (None, '0x'):
+                low = middle + 1
+            else:
+                high = middle
+    except RPCError as e:
+        logger.warning(f"Could not locate the creation block of {token}, starting at {DEFAULT_DEPLOY_BLOCK}: {e}")
+        return DEFAULT_DEPLOY_BLOCK
+
+    cached[token] = low
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    cache_file.write_text(json.dumps(cached, indent=2))
+    logger.info(f"Contract {token} was created in block {low}")
+    return low
+
+
+class SupplyTracker:
+    """Maintains an incremental WILD supply ledger from Transfer logs."""
+
+    def __init__(self, token_address: str, excluded_addresses: Dict[str, str],
+                 client: Optional[JsonRpcClient] = None, cache_dir: Optional[str] = None,
+                 start_block: Optional[int] = None, confirmations: int = 12):
+        """
+        Initialize the tracker.
+
+        Args:
+            token_address: WILD token contract
+            excluded_addresses: Mapping of address to label for balances that are not circulating
+            client: JSON-RPC client (defaults to ETH_RPC_URL / Infura / local node)
+            cache_dir: Directory for the persisted ledger
+            start_block: First block to index (defaults to the token's creation block)
+            confirmations: Blocks behind head to stop at so reorgs never touch the ledger
+        """
+        self.token = token_address.lower()
+        self.excluded = {address.lower(): label for address, label in excluded_addresses.items()}
+        self.client = client or JsonRpcClient()
+        self.indexer = TransferLogIndexer(self.client)
+        # Resolved only when a new ledger has to start from the beginning
+        self.start_block = start_block
+        self.confirmations = confirmations
+
+        if cache_dir is None:
+            cache_dir = Path(__file__).parent.parent / 'data' / 'cache'
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ledger_file = self.cache_dir / 'supply_ledger.json'
+
+        self.ledger = self._load_ledger()
+
+    def _empty_ledger(self) -> Dict[str, Any]:
+        """Create a ledger that starts before the deployment block."""
+        if self.start_block is None:
+            self.start_block = deploy_block(self.client, self.token, self.cache_dir)
+        return {
+            'token': self.token,
+            'excluded_addresses': sorted(self.excluded),
+            'last_block': self.start_block - 1,
+            'minted': 0,
+            'burned_to_zero': 0,
+            'burned_to_dead': 0,
+            'burn_count': 0,
+            'excluded_balances': {address: 0 for address in self.excluded}
+        }
+
+    def _load_ledger(self) -> Dict[str, Any]:
+        """Load the persisted ledger, starting over if the token or excluded set changed."""
+        if self.ledger_file.exists():
+            with open(self.ledger_file, 'r') as f:
+                stored = json.load(f)
+
+            if stored.get('token') == self.token and stored.get('excluded_addresses') == sorted(self.excluded):
+                # Amounts are stored as strings since they exceed JSON's safe integer range
+                for key in ('minted', 'burned_to_zero', 'burned_to_dead'):
+                    stored[key] = int(stored[key])
+                stored['excluded_balances'] = {a: int(v) for a, v in stored['excluded_balances'].items()}
+                logger.info(f"Loaded supply ledger at block {stored['last_block']}")
+                return stored
+
+            logger.info("Excluded address set changed, rebuilding supply ledger")
+
+        return self._empty_ledger()
+
+    def _save_ledger(self):
+        """Persist the ledger."""
+        stored = dict(self.ledger)
+        for key in ('minted', 'burned_to_zero', 'burned_to_dead'):
+            stored[key] = str(stored[key])
+        stored['excluded_balances'] = {a: str(v) for a, v in self.ledger['excluded_balances'].items()}
+
+        with open(self.ledger_file, 'w') as f:
+            json.dump(stored, f, indent=2)
+        logger.debug(f"Saved supply ledger to {self.ledger_file}")
+
+    def refresh(self, to_block: Optional[int] = None) -> int:
+        """
+        Apply Transfers from blocks added since the last refresh.
+
+        Returns:
+            Number of Transfer logs applied
+        """
+        if to_block is None:
+            to_block = self.client.block_number() - self.confirmations
+
+        from_block = self.ledger['last_block'] + 1
+        if from_block > to_block:
+            return 0
+
+        tracked = [ZERO_ADDRESS, DEAD_ADDRESS] + list(self.excluded)
+        logs = self.indexer.fetch_transfer_logs(tracked, from_block, to_block, contracts=[self.token])
+
+        balances = self.ledger['excluded_balances']
+        for log in logs:
+            sender = topic_to_address(log['topics'][1])
+            receiver = topic_to_address(log['topics'][2])
+            amount = int(log['data'], 16) if log.get('data') not in (None, '0x') else 0
+
+            if sender == ZERO_ADDRESS:
+                self.ledger['minted'] += amount
+            if receiver == ZERO_ADDRESS:
+                self.ledger['burned_to_zero'] += amount
+                self.ledger['burn_count'] += 1
+            elif receiver == DEAD_ADDRESS:
+                self.ledger['burned_to_dead'] += amount
+                self.ledger['burn_count'] += 1
+
+            if sender in balances:
+                balances[sender] -= amount
+            if receiver in balances:
+                balances[receiver] += amount
+
+        self.ledger['last_block'] = to_block
+        self._save_ledger()
+
+        logger.info(f"Supply ledger applied {len(logs)} transfers from blocks {from_block}-{to_block}")
+        return len(logs)
+
+    def get_total_supply(self, block: Optional[int] = None) -> int:
+        """Read totalSupply() in base units at a block (defaults to the ledger block)."""
+        block = self.ledger['last_block'] if block is None else block
+        result = self.client.call('eth_call', [{'to': self.token, 'data': TOTAL_SUPPLY_SELECTOR}, hex(block)])
+        return int(result, 16)
+
+    def get_supply_snapshot(self) -> Dict[str, Any]:
+        """
+        Refresh the ledger and return supply figures in whole WILD.
+
+        Tokens sent to the zero address are already gone from totalSupply; tokens
+        sent to the dead address are not, so they are subtracted along with the
+        excluded balances to get circulating supply.
+        """
+        self.refresh()
+
+        total_supply = self.get_total_supply() / 1e18
+        burned_to_zero = self.ledger['burned_to_zero'] / 1e18
+        burned_to_dead = self.ledger['burned_to_dead'] / 1e18
+        excluded_balances = {
+            address: balance / 1e18 for address, balance in self.ledger['excluded_balances'].items()
+        }
+
+        return {
+            'as_of_block': self.ledger['last_block'],
+            'total_supply': total_supply,
+            'burned_to_zero': burned_to_zero,
+            'burned_to_dead': burned_to_dead,
+            'total_burned': burned_to_zero + burned_to_dead,
+            'burn_count': self.ledger['burn_count'],
+            'excluded_balances': excluded_balances,
+            'excluded_by_label': {self.excluded[a]: b for a, b in excluded_balances.items()},
+            'total_excluded': sum(excluded_balances.values()),
+            'circulating_supply': total_supply - burned_to_dead - sum(excluded_balances.values())
+        }
@@ -0,0 +1,80 @@
+"""
+Shared Jinja environment for generated pages.
+Templates under src/templates are compiled once per process (and the bytecode
+cached on disk across runs), rendered as a stream straight into the output
+file, and 'latest' aliases are links to the newest report rather than copies.
+"""
+
+import os
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = Path(__file__).parent / 'templates'
+BYTECODE_CACHE_DIR = Path(__file__).parent.parent / 'data' / 'cache' / 'templates'
+
+_environment: Optional[Environment] = None
+
+
+def environment() -> Environment:
+    """The process-wide template environment, created on first use."""
+    global _environment
+    if _environment is None:
+        BYTECODE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _environment = Environment(
+            loader=FileSystemLoader(str(TEMPLATE_DIR)),
+            bytecode_cache=FileSystemBytecodeCache(str(BYTECODE_CACHE_DIR)),
+            # Pages embed pre-rendered chart HTML, as the inline templates did
+            autoescape=False,
+            # Compiled templates stay in memory; restart long-running services after editing a template
+            auto_reload=False
+        )
+    return _environment
+
+
+def get_template(name: str) -> Template:
+    return environment().get_template(name)
+
+
+def render_to_file(name: str, path: Union[str, Path], context: Dict[str, Any]) -> Path:
+    """
+    Stream a rendered template into path without building the page in memory.
+
+    The page is written under a temporary name and moved into place, so readers
+    never see a partial file.
+    """
+    path = Path(path)
+    partial = path.with_name(path.name + '.tmp')
+    get_template(name).stream(**context).dump(str(partial), encoding='utf-8')
+    os.replace(partial, path)
+    return path
+
+
+def link_latest(target: Union[str, Path], latest: Union[str, Path]) -> Path:
+    """
+    Point latest at target: a hard link where supported, else a relative symlink, else a copy.
+
+    The alias is replaced atomically, so it always names a complete report.
+    """
+    target, latest = Path(target), Path(latest)
+    partial = latest.with_name(latest.name + '.tmp')
+    partial.unlink(missing_ok=True)
+    try:
+        os.link(target, partial)
+    except OSError:
+        try:
+            os.symlink(os.path.relpath(target, latest.parent), partial)
+        except OSError:
+            logger.warning(f"Could not link {latest} to {target}, copying instead")
+            partial.write_bytes(target.read_bytes())
+    os.replace(partial, latest)
+    return latest
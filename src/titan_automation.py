@@ -10,12 +10,16 @@ import json
 import time
 import schedule
 import logging
+import threading
+from collections import deque
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from email.mime.base import MIMEBase
+from email import encoders
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -24,6 +28,9 @@ from src.titan_tracker import TitanTracker
 from src.analysis_functions import WilderAnalyzer
 from src.titan_dashboard import TitanDashboard
 from src.price_fetcher import PriceFetcher
+from src.dao_stream_monitor import DAOStreamMonitor
+from src.live_server import LiveDashboardServer
+from src.image_export import MIME_TYPES, ImageExporter
 
 # Set up logging
 logging.basicConfig(
@@ -39,7 +46,6 @@ class TitanAutomation:
         """Initialize automation with configuration"""
         self.tracker = TitanTracker()
         self.analyzer = WilderAnalyzer()
-        self.dashboard = TitanDashboard()
         self.price_fetcher = PriceFetcher()
         
         # Load configuration
@@ -47,17 +53,38 @@ class TitanAutomation:
             config_path = os.path.join(os.path.dirname(__file__), '..', 'config', 'automation_config.json')
         
         self.config = self.load_config(config_path)
+        self.dashboard = TitanDashboard(render_workers=self.config['reports']['render_workers'],
+                                        parallel_min_misses=self.config['reports']['render_min_misses'])
         
         # State tracking
         self.state_file = os.path.join(os.path.dirname(__file__), '..', 'data', 'automation_state.json')
         self.state = self.load_state()
         
+        # Alerts and state are written from both the schedule loop and the stream monitor thread
+        self.lock = threading.RLock()
+        self.stream_monitor = None
+        
+        # Latest cycle results, published to the live dashboard server when it is running
+        self.live_server = None
+        self.recent_alerts = deque(maxlen=20)
+        self.latest_titan_data = None
+        self.latest_completion = None
+        self.latest_prices = {}
+        
+        # Chart renderer for email attachments, started on first use and kept warm;
+        # rendering holds its own lock so it never blocks monitoring
+        self.image_exporter = None
+        self.export_lock = threading.Lock()
+        
     def load_config(self, config_path: str) -> Dict[str, Any]:
         """Load automation configuration"""
         default_config = {
             'monitoring': {
+                'mode': 'poll',  # 'poll' checks DAO balances on the schedule, 'stream' subscribes over WebSocket
+                'ws_url': '',  # defaults to ETH_WS_URL, then ws://127.0.0.1:8545
                 'check_interval_minutes': 60,
                 'dao_transaction_threshold_eth': 10,
+                'dao_wild_threshold': 100000,  # WILD moved into or out of a DAO that raises an alert
                 'price_change_threshold_pct': 5,
                 'volume_spike_threshold_pct': 200
             },
@@ -69,7 +96,10 @@ class TitanAutomation:
                     'smtp_port': 587,
                     'from_address': '',
                     'to_addresses': [],
-                    'password': ''
+                    'password': '',
+                    'attach_charts': True,  # latest Titan charts as images; needs kaleido
+                    'chart_format': 'png',
+                    'charts': ['dao_progress', 'supply_dynamics', 'timeline']
                 },
                 'webhook': {
                     'enabled': False,
@@ -83,7 +113,14 @@ class TitanAutomation:
             'reports': {
                 'weekly_day': 0,  # Monday
                 'weekly_hour': 9,  # 9 AM
-                'auto_open_browser': False
+                'auto_open_browser': False,
+                'render_workers': 0,  # worker processes for rebuilding charts; 0 renders in-process
+                'render_min_misses': 2  # fewest changed charts sent to the workers
+            },
+            'live_server': {
+                'enabled': False,  # serve the latest cycle at http://host:port/ with SSE updates
+                'host': '127.0.0.1',
+                'port': 8050
             }
         }
         
@@ -117,9 +154,10 @@ class TitanAutomation:
     
     def save_state(self):
         """Save automation state"""
-        os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
-        with open(self.state_file, 'w') as f:
-            json.dump(self.state, f, indent=2, default=str)
+        with self.lock:
+            os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+            with open(self.state_file, 'w') as f:
+                json.dump(self.state, f, indent=2, default=str)
     
     def check_dao_activity(self) -> List[Dict[str, Any]]:
         """Check for significant DAO activity"""
@@ -128,6 +166,7 @@ class TitanAutomation:
         previous_balances = self.state.get('dao_balances', {})
         
         threshold_eth = self.config['monitoring']['dao_transaction_threshold_eth']
+        threshold_wild = self.config['monitoring']['dao_wild_threshold']
         
         for dao_name, current in current_balances.items():
             if 'error' in current:
@@ -151,7 +190,7 @@ class TitanAutomation:
             # Check for WILD inflows
             if previous and 'wild_balance' in previous:
                 wild_change = current['wild_balance'] - previous['wild_balance']
-                if wild_change > 100000:  # 100k WILD threshold
+                if wild_change > threshold_wild:
                     alerts.append({
                         'type': 'dao_wild_inflow',
                         'severity': 'medium',
@@ -174,6 +213,7 @@ class TitanAutomation:
             current_prices = self.price_fetcher.get_current_prices()
             if not current_prices or 'WILD' not in current_prices:
                 return alerts
+            self.latest_prices = current_prices
                 
             current_price = current_prices['WILD']
             previous_price = self.state.get('last_wild_price', current_price)
@@ -219,6 +259,7 @@ class TitanAutomation:
         
         # Check for completion milestones
         completion = self.analyzer.calculate_buyback_completion(titan_data)
+        self.latest_titan_data, self.latest_completion = titan_data, completion
         overall_completion = completion.get('overall', 0)
         
         # Alert at 25%, 50%, 75%, 100% milestones
@@ -241,7 +282,17 @@ class TitanAutomation:
         """Send alerts through configured channels"""
         if not alerts or not self.config['alerts']['enabled']:
             return
-            
+        
+        # Render chart attachments before taking the state lock
+        attachments = self.alert_chart_attachments() if self.config['alerts']['email']['enabled'] else []
+        with self.lock:
+            self._send_alerts(alerts, attachments)
+            self.recent_alerts.extend(alerts)
+            if self.live_server:
+                self.live_server.publish({'alerts': list(self.recent_alerts)})
+    
+    def _send_alerts(self, alerts: List[Dict[str, Any]], attachments: Optional[List[MIMEBase]] = None):
+        """Write alerts to every enabled channel"""
         # File alerts (always enabled as fallback)
         if self.config['alerts']['file']['enabled']:
             alert_dir = os.path.join(os.path.dirname(__file__), '..', 
@@ -267,14 +318,14 @@ class TitanAutomation:
         
         # Email alerts
         if self.config['alerts']['email']['enabled']:
-            self.send_email_alerts(alerts)
+            self.send_email_alerts(alerts, attachments)
         
         # Webhook alerts (for Discord, Slack, etc.)
         if self.config['alerts']['webhook']['enabled']:
             self.send_webhook_alerts(alerts)
     
-    def send_email_alerts(self, alerts: List[Dict[str, Any]]):
-        """Send email alerts"""
+    def send_email_alerts(self, alerts: List[Dict[str, Any]], attachments: Optional[List[MIMEBase]] = None):
+        """Send email alerts, with chart attachments from alert_chart_attachments()"""
         try:
             email_config = self.config['alerts']['email']
             if not email_config['from_address'] or not email_config['to_addresses']:
@@ -297,6 +348,8 @@ class TitanAutomation:
             msg['To'] = ', '.join(email_config['to_addresses'])
             msg['Subject'] = subject
             msg.attach(MIMEText(body, 'plain'))
+            for attachment in attachments or []:
+                msg.attach(attachment)
             
             with smtplib.SMTP(email_config['smtp_server'], email_config['smtp_port']) as server:
                 server.starttls()
@@ -308,6 +361,35 @@ class TitanAutomation:
         except Exception as e:
             logger.error(f"Failed to send email alerts: {e}")
     
+    def alert_chart_attachments(self) -> List[MIMEBase]:
+        """Latest Titan charts as email attachments, rendered in one batch by the warm exporter"""
+        email_config = self.config['alerts']['email']
+        titan_data = self.latest_titan_data
+        if not email_config.get('attach_charts') or not titan_data:
+            return []
+        
+        fmt = email_config.get('chart_format', 'png')
+        try:
+            with self.export_lock:
+                if self.image_exporter is None:
+                    self.image_exporter = ImageExporter().start()
+                # The alert charts read only tracker data, so no impact analysis is needed
+                figures = self.dashboard.figures(titan_data, {}, email_config.get('charts'))
+                images = self.image_exporter.to_images(figures, fmt)
+        except Exception as e:
+            logger.warning(f"Sending alert email without charts: {e}")
+            return []
+        
+        attachments = []
+        maintype, subtype = MIME_TYPES[fmt].split('/')
+        for name, image in images.items():
+            part = MIMEBase(maintype, subtype)
+            part.set_payload(image)
+            encoders.encode_base64(part)
+            part.add_header('Content-Disposition', 'attachment', filename=f'{name}.{fmt}')
+            attachments.append(part)
+        return attachments
+    
     def send_webhook_alerts(self, alerts: List[Dict[str, Any]]):
         """Send webhook alerts (Discord/Slack format)"""
         try:
@@ -360,8 +442,9 @@ class TitanAutomation:
         
         alerts = []
         
-        # Check DAO activity
-        alerts.extend(self.check_dao_activity())
+        # Check DAO activity (in stream mode the stream monitor alerts on it as blocks land)
+        if self.config['monitoring'].get('mode') != 'stream':
+            alerts.extend(self.check_dao_activity())
         
         # Check price movements
         alerts.extend(self.check_price_movements())
@@ -378,6 +461,38 @@ class TitanAutomation:
         self.state['last_check'] = datetime.now()
         self.save_state()
         
+        if self.live_server:
+            self.publish_cycle()
+        
+    def publish_cycle(self):
+        """Push the latest cycle results to open live dashboard pages"""
+        titan_data = self.latest_titan_data or {}
+        changes = {
+            'titan': {key: titan_data.get(key) for key in ('phase_status', 'dao_balances', 'supply_dynamics',
+                                                             'buyback_patterns', 'price_impact')},
+            'completion': self.latest_completion,
+            'prices': self.latest_prices,
+            'last_check': self.state['last_check']
+        }
+        try:
+            if titan_data:
+                changes['trading_signals'] = self.analyzer.generate_titan_trading_signals(titan_data)
+        except Exception as e:
+            logger.warning(f"Live update without trading signals: {e}")
+        
+        with self.lock:
+            self.live_server.publish(changes)
+    
+    def start_live_server(self) -> Optional[LiveDashboardServer]:
+        """Start the local live dashboard server in a background thread"""
+        settings = self.config['live_server']
+        try:
+            self.live_server = LiveDashboardServer(host=settings['host'], port=settings['port']).start()
+        except OSError as e:
+            logger.error(f"Could not start live dashboard server on {settings['host']}:{settings['port']}: {e}")
+            self.live_server = None
+        return self.live_server
+    
     def generate_weekly_report(self):
         """Generate weekly analysis report"""
         logger.info("Generating weekly report...")
@@ -416,6 +531,30 @@ class TitanAutomation:
             }
             self.send_alerts([alert])
     
+    def save_stream_checkpoint(self, block: int):
+        """Persist the last block the stream monitor fully processed"""
+        with self.lock:
+            self.state['stream_last_block'] = block
+            self.save_state()
+    
+    def start_stream_monitor(self) -> DAOStreamMonitor:
+        """Start the WebSocket DAO monitor in a background thread"""
+        monitoring = self.config['monitoring']
+        self.stream_monitor = DAOStreamMonitor(
+            self.tracker,
+            alert_callback=self.send_alerts,
+            ws_url=monitoring.get('ws_url') or None,
+            eth_threshold=monitoring['dao_transaction_threshold_eth'],
+            wild_threshold=monitoring['dao_wild_threshold'],
+            start_block=self.state.get('stream_last_block'),
+            checkpoint_callback=self.save_stream_checkpoint
+        )
+        
+        thread = threading.Thread(target=self.stream_monitor.run, name='dao-stream-monitor', daemon=True)
+        thread.start()
+        logger.info(f"Streaming DAO activity from {self.stream_monitor.ws_url}")
+        return self.stream_monitor
+    
     def setup_schedule(self):
         """Set up automated scheduling"""
         # Monitoring cycles
@@ -439,6 +578,14 @@ class TitanAutomation:
         """Run the automation service"""
         logger.info("Starting Operation Titan automation service...")
         
+        # DAO activity streams continuously; the schedule still covers prices, progress and reports
+        if self.config['monitoring'].get('mode') == 'stream':
+            self.start_stream_monitor()
+        
+        # Open pages receive each cycle's results as it finishes
+        if self.config['live_server']['enabled']:
+            self.start_live_server()
+        
         # Run initial cycle
         self.run_monitoring_cycle()
         
@@ -456,6 +603,9 @@ class TitanAutomation:
         except Exception as e:
             logger.error(f"Automation service error: {e}")
             raise
+        finally:
+            if self.image_exporter:
+                self.image_exporter.close()
 
 def main():
     """Main entry point for automation"""
@@ -4,20 +4,56 @@ Creates comprehensive HTML reports with interactive visualizations
 """
 
 import os
+import sys
 import json
+import logging
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Sequence, Tuple
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
-from jinja2 import Template
+
+# Add src to path so sibling modules resolve when imported as src.<module>
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from indicators import IndicatorEngine
+from plotly_assets import plotly_script_tag
+from chart_cache import ChartCache, PARALLEL_MIN_MISSES
+from report_store import RUN_ID_FORMAT, ReportStore, figure_spec
+from report_manifest import ReportManifest
+from templating import get_template, link_latest, render_to_file
+from image_export import ImageExporter
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Charts are embedded as fragments; the page loads plotly.js once
+CHART_HTML_OPTIONS = {'full_html': False, 'include_plotlyjs': False}
+
+# Page template under src/templates
+DASHBOARD_TEMPLATE = 'titan_dashboard.html'
 
 class TitanDashboard:
     """Generates HTML dashboard for Operation Titan analysis"""
     
-    def __init__(self, output_dir: Optional[str] = None):
-        """Initialize dashboard generator"""
+    def __init__(self, output_dir: Optional[str] = None, render_workers: int = 0,
+                 parallel_min_misses: int = PARALLEL_MIN_MISSES):
+        """
+        Initialize dashboard generator
+        
+        Args:
+            output_dir: Directory for generated reports
+            render_workers: Worker processes that build changed charts concurrently
+                (0 or 1 builds them in this process)
+            parallel_min_misses: Fewest changed charts sent to the workers; fewer
+                are built in this process
+        """
         if output_dir is None:
             self.output_dir = os.path.join(os.path.dirname(__file__), '..', 'output', 'titan_reports')
         else:
@@ -47,38 +83,162 @@ class TitanDashboard:
             'Wilder World DAO': '#00B894'
         }
         
+        # Technical indicators, created on first use and refreshed with new candles per render
+        self.indicator_engine = None
+        
+        # Rendered chart fragments keyed by a fingerprint of each chart's inputs
+        self.chart_cache = ChartCache()
+        self.render_workers = render_workers
+        self.parallel_min_misses = parallel_min_misses
+        
+        # Compressed per-run payloads rendered by one static viewer page
+        self.report_store = ReportStore(self.output_dir)
+        
+        # Catalog entry per report for the main dashboard
+        self.manifest = ReportManifest.for_report_dir(self.output_dir)
+        
     def generate_dashboard(self, titan_data: Dict[str, Any], analyzer_data: Dict[str, Any]) -> str:
         """Generate complete HTML dashboard"""
-        # Create all visualizations
-        charts = {
-            'dao_progress': self.create_dao_progress_chart(titan_data),
-            'supply_dynamics': self.create_supply_dynamics_chart(titan_data),
-            'price_impact': self.create_price_impact_chart(titan_data, analyzer_data),
-            'risk_matrix': self.create_risk_matrix(analyzer_data),
-            'timeline': self.create_buyback_timeline(titan_data),
-            'wallet_exposure': self.create_wallet_exposure_chart(analyzer_data),
-            'technical_analysis': self.create_technical_analysis_chart(analyzer_data)
-        }
-        
-        # Generate HTML report
-        html_content = self.render_html_template(titan_data, analyzer_data, charts)
+        # Create all visualizations, reusing fragments whose inputs are unchanged
+        self.chart_cache.stats = {'hits': 0, 'misses': 0}
+        specs = [(name, builder, args, extra)
+                 for name, (builder, args, extra) in self.chart_specs(titan_data, analyzer_data).items()]
+        if self.render_workers > 1:
+            # Workers receive only each chart's argument slices and return its HTML fragment
+            with ProcessPoolExecutor(max_workers=min(self.render_workers, len(specs))) as pool:
+                charts = self.chart_cache.render_many(specs, CHART_HTML_OPTIONS, executor=pool,
+                                                         min_parallel=self.parallel_min_misses)
+        else:
+            charts = self.chart_cache.render_many(specs, CHART_HTML_OPTIONS)
+        self.chart_cache.prune()
+        logger.info(f"Charts rebuilt: {self.chart_cache.stats['misses']}, reused: {self.chart_cache.stats['hits']}")
         
-        # Save to file
+        # Stream the HTML report straight to its file
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         filename = f'titan_analysis_{timestamp}.html'
         filepath = os.path.join(self.output_dir, filename)
-        
-        with open(filepath, 'w') as f:
-            f.write(html_content)
+        render_to_file(DASHBOARD_TEMPLATE, filepath, self.template_context(titan_data, analyzer_data, charts))
             
-        # Also save latest version
+        # The latest version is a link to this report, not a second copy
         latest_path = os.path.join(self.output_dir, 'titan_analysis_latest.html')
-        with open(latest_path, 'w') as f:
-            f.write(html_content)
+        link_latest(filepath, latest_path)
             
+        self.manifest.append('titan', filepath, f"Titan Analysis - {datetime.now().strftime('%B %d, %Y at %I:%M %p')}",
+                             self.report_summary(titan_data, analyzer_data))
         return filepath
     
-    def create_dao_progress_chart(self, titan_data: Dict[str, Any]) -> str:
+    def generate_payload(self, titan_data: Dict[str, Any], analyzer_data: Dict[str, Any],
+                         extra: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Save the run as a compressed data payload for the static report viewer.
+        
+        Args:
+            titan_data: TitanTracker summary report
+            analyzer_data: Titan impact analysis with trading signals
+            extra: Further JSON-serializable run data, such as current prices
+            
+        Returns:
+            Path to the viewer page
+        """
+        figures = {name: figure_spec(fig) for name, fig in self.figures(titan_data, analyzer_data)}
+        now = datetime.now()
+        run_id = self.report_store.new_run_id(now)
+        payload = {
+            'timestamp': now.isoformat(),
+            'titan_data': titan_data,
+            'titan_impact': analyzer_data,
+            'context': self.report_context(titan_data, analyzer_data),
+            **(extra or {}),
+            'figures': figures
+        }
+        viewer = self.report_store.write(payload, run_id)
+        
+        self.manifest.append('titan', viewer, f"Titan Analysis - {now.strftime('%B %d, %Y at %I:%M %p')}",
+                             self.report_summary(titan_data, analyzer_data), timestamp=now,
+                             size=self.report_store.payload_path(run_id).stat().st_size, anchor=run_id)
+        return str(viewer)
+    
+    def report_summary(self, titan_data: Dict[str, Any], analyzer_data: Dict[str, Any]) -> Dict[str, str]:
+        """Headline metrics shown with the report in the main dashboard catalog"""
+        targets = analyzer_data.get('price_targets', {})
+        signals = analyzer_data.get('trading_signals', {})
+        summary = {'Phase': titan_data.get('phase_status', {}).get('current_phase', 'Unknown')}
+        if 'current_price' in targets:
+            summary['WILD Price'] = f"${targets['current_price']:.4f}"
+        if 'base_case' in targets:
+            summary['Base Case'] = f"${targets['base_case']:.4f}"
+        if 'action' in signals:
+            summary['Signal'] = signals['action'].upper()
+        return summary
+    
+    def chart_specs(self, titan_data: Dict[str, Any], analyzer_data: Dict[str, Any],
+                    names: Optional[Iterable[str]] = None) -> Dict[str, tuple]:
+        """
+        Builder, arguments and implicit inputs for every chart.
+        
+        Each builder gets only the slices of titan_data/analyzer_data it reads, so
+        its cache key changes only when those slices do.
+        
+        Args:
+            titan_data: TitanTracker summary report
+            analyzer_data: Titan impact analysis with trading signals
+            names: Charts to include (all by default)
+        """
+        titan = lambda *keys: {key: titan_data.get(key) for key in keys if key in titan_data}
+        analysis = lambda *keys: {key: analyzer_data.get(key) for key in keys if key in analyzer_data}
+        
+        specs = {
+            'dao_progress': (self.create_dao_progress_chart, (titan('dao_balances'),), (self.colors, self.dao_colors)),
+            'supply_dynamics': (self.create_supply_dynamics_chart, (titan('supply_dynamics'),), (self.colors,)),
+            'price_impact': (self.create_price_impact_chart,
+                             (titan('price_impact'), analysis('price_targets', 'trading_signals')), (self.colors,)),
+            'risk_matrix': (self.create_risk_matrix, (analysis('risk_assessment'),), (self.colors,)),
+            # The timeline marks today's date
+            'timeline': (self.create_buyback_timeline, (titan('phase_status'),),
+                         (self.colors, datetime.now().date())),
+            'wallet_exposure': (self.create_wallet_exposure_chart, (analysis('portfolio_exposure'),), (self.colors,))
+        }
+        if names is not None:
+            names = list(names)
+            specs = {name: specs[name] for name in names if name in specs}
+        # Refreshing the candles is the one costly input, so skip it when the chart is not wanted
+        if names is None or 'technical_analysis' in names:
+            specs['technical_analysis'] = (self.create_technical_analysis_chart,
+                                           (analysis('price_targets'), self.technical_candles()), (self.colors,))
+        return specs
+    
+    def figures(self, titan_data: Dict[str, Any], analyzer_data: Dict[str, Any],
+                names: Optional[Iterable[str]] = None) -> Iterator[Tuple[str, go.Figure]]:
+        """Build the charts one at a time, as (name, figure) pairs"""
+        for name, (builder, args, _) in self.chart_specs(titan_data, analyzer_data, names).items():
+            yield name, builder(*args)
+    
+    def export_images(self, titan_data: Dict[str, Any], analyzer_data: Dict[str, Any],
+                      formats: Sequence[str] = ('png',), names: Optional[Iterable[str]] = None,
+                      exporter: Optional[ImageExporter] = None, run_id: Optional[str] = None) -> Dict[str, Dict[str, str]]:
+        """
+        Export the run's charts as static images in one batch.
+        
+        Args:
+            titan_data: TitanTracker summary report
+            analyzer_data: Titan impact analysis with trading signals
+            formats: Image formats, e.g. ('png', 'svg')
+            names: Charts to export (all by default)
+            exporter: Running exporter to reuse; a temporary one is started otherwise
+            run_id: Subdirectory of images/ to write to (defaults to the current time)
+            
+        Returns:
+            Image paths by chart name and format
+        """
+        directory = os.path.join(self.output_dir, 'images', run_id or datetime.now().strftime(RUN_ID_FORMAT))
+        if exporter is None:
+            with ImageExporter() as exporter:
+                written = exporter.write_images(self.figures(titan_data, analyzer_data, names), directory, formats)
+        else:
+            written = exporter.write_images(self.figures(titan_data, analyzer_data, names), directory, formats)
+        return {name: {fmt: str(path) for fmt, path in paths.items()} for name, paths in written.items()}
+    
+    def create_dao_progress_chart(self, titan_data: Dict[str, Any]) -> go.Figure:
         """Create DAO buyback progress visualization"""
         dao_balances = titan_data.get('dao_balances', {})
         
@@ -157,9 +317,9 @@ class TitanDashboard:
         fig.update_xaxes(title_text='ETH Allocated', row=2, col=2)
         fig.update_yaxes(title_text='ETH Spent', row=2, col=2)
         
-        return fig.to_html(include_plotlyjs='cdn', div_id='dao_progress')
+        return fig
     
-    def create_supply_dynamics_chart(self, titan_data: Dict[str, Any]) -> str:
+    def create_supply_dynamics_chart(self, titan_data: Dict[str, Any]) -> go.Figure:
         """Create supply dynamics visualization"""
         supply = titan_data.get('supply_dynamics', {})
         
@@ -207,9 +367,9 @@ class TitanDashboard:
         fig.update_xaxes(title_text='Months', row=1, col=2)
         fig.update_yaxes(title_text='Supply Reduction %', row=1, col=2)
         
-        return fig.to_html(include_plotlyjs='cdn', div_id='supply_dynamics')
+        return fig
     
-    def create_price_impact_chart(self, titan_data: Dict[str, Any], analyzer_data: Dict[str, Any]) -> str:
+    def create_price_impact_chart(self, titan_data: Dict[str, Any], analyzer_data: Dict[str, Any]) -> go.Figure:
         """Create price impact and targets visualization"""
         price_impact = titan_data.get('price_impact', {})
         price_targets = analyzer_data.get('price_targets', {})
@@ -305,9 +465,9 @@ class TitanDashboard:
         fig.update_yaxes(title_text='Impact %', row=1, col=1)
         fig.update_yaxes(title_text='Price (USD)', row=1, col=2)
         
-        return fig.to_html(include_plotlyjs='cdn', div_id='price_impact')
+        return fig
     
-    def create_risk_matrix(self, analyzer_data: Dict[str, Any]) -> str:
+    def create_risk_matrix(self, analyzer_data: Dict[str, Any]) -> go.Figure:
         """Create risk assessment matrix"""
         risks = analyzer_data.get('risk_assessment', {})
         
@@ -368,9 +528,9 @@ class TitanDashboard:
             yaxis_title='Risk Category'
         )
         
-        return fig.to_html(include_plotlyjs='cdn', div_id='risk_matrix')
+        return fig
     
-    def create_buyback_timeline(self, titan_data: Dict[str, Any]) -> str:
+    def create_buyback_timeline(self, titan_data: Dict[str, Any]) -> go.Figure:
         """Create timeline visualization of buyback phases"""
         phase_status = titan_data.get('phase_status', {})
         
@@ -426,9 +586,9 @@ class TitanDashboard:
             showlegend=False
         )
         
-        return fig.to_html(include_plotlyjs='cdn', div_id='timeline')
+        return fig
     
-    def create_wallet_exposure_chart(self, analyzer_data: Dict[str, Any]) -> str:
+    def create_wallet_exposure_chart(self, analyzer_data: Dict[str, Any]) -> go.Figure:
         """Create wallet exposure visualization"""
         exposure = analyzer_data.get('portfolio_exposure', {})
         
@@ -473,40 +633,70 @@ class TitanDashboard:
             template='plotly_dark'
         )
         
-        return fig.to_html(include_plotlyjs='cdn', div_id='wallet_exposure')
+        return fig
     
-    def create_technical_analysis_chart(self, analyzer_data: Dict[str, Any]) -> str:
-        """Create technical analysis visualization"""
-        # This would integrate with actual price data
-        # For now, creating a placeholder structure
+    def technical_candles(self, bars: int = 180) -> pd.DataFrame:
+        """Fold new candles into the indicator engine and return the latest WILD daily bars"""
+        if self.indicator_engine is None:
+            # Only the series the chart plots; the hourly ones would cost CoinGecko calls
+            self.indicator_engine = IndicatorEngine(series=(('WILD', '1d'),))
+        self.indicator_engine.refresh()
+        return self.indicator_engine.frame('WILD', '1d').tail(bars)
+    
+    def create_technical_analysis_chart(self, analyzer_data: Dict[str, Any],
+                                        candles: Optional[pd.DataFrame] = None) -> go.Figure:
+        """Create technical analysis visualization from the incremental indicator engine"""
+        # Last 180 daily candles keep the chart readable
+        if candles is None:
+            candles = self.technical_candles()
+        latest_atr = candles['atr'].iloc[-1] if not candles.empty else None
+        atr_text = f" (ATR14 ${latest_atr:.4f})" if pd.notna(latest_atr) else ''
         
         fig = make_subplots(
-            rows=2, cols=1,
-            row_heights=[0.7, 0.3],
+            rows=3, cols=1,
+            row_heights=[0.55, 0.2, 0.25],
             shared_xaxes=True,
-            subplot_titles=('WILD/USD Price Action', 'Volume')
+            vertical_spacing=0.05,
+            subplot_titles=(f'WILD/USD Price Action{atr_text}', 'Volume', 'RSI (14)')
         )
         
-        # Generate sample data (would be real price data)
-        import numpy as np
-        dates = pd.date_range(start='2025-07-01', end='2025-07-31', freq='D')
-        prices = 0.38 + np.random.randn(len(dates)) * 0.02
-        volumes = np.random.randint(1000000, 5000000, len(dates))
+        # Bollinger band envelope behind the candles
+        fig.add_trace(
+            go.Scatter(x=candles.index, y=candles['bb_upper'], mode='lines',
+                      line=dict(color=self.colors['light'], width=1, dash='dot'),
+                      name='BB Upper'),
+            row=1, col=1
+        )
+        fig.add_trace(
+            go.Scatter(x=candles.index, y=candles['bb_lower'], mode='lines',
+                      line=dict(color=self.colors['light'], width=1, dash='dot'),
+                      fill='tonexty', fillcolor='rgba(245, 245, 245, 0.05)',
+                      name='BB Lower'),
+            row=1, col=1
+        )
         
-        # Price candlestick
         fig.add_trace(
-            go.Scatter(x=dates, y=prices, mode='lines',
-                      line=dict(color=self.colors['primary'], width=2),
-                      name='WILD/USD'),
+            go.Candlestick(x=candles.index, open=candles['open'], high=candles['high'],
+                          low=candles['low'], close=candles['close'], name='WILD/USD'),
+            row=1, col=1
+        )
+        fig.add_trace(
+            go.Scatter(x=candles.index, y=candles['sma'], mode='lines',
+                      line=dict(color=self.colors['success'], width=1.5), name='SMA 20'),
+            row=1, col=1
+        )
+        fig.add_trace(
+            go.Scatter(x=candles.index, y=candles['ema'], mode='lines',
+                      line=dict(color=self.colors['warning'], width=1.5), name='EMA 50'),
             row=1, col=1
         )
         
         # Add price targets as horizontal lines
         price_targets = analyzer_data.get('price_targets', {})
         target_levels = [
-            ('Conservative', price_targets.get('conservative', 0.40), self.colors['success']),
-            ('Base Case', price_targets.get('base_case', 0.42), self.colors['primary']),
-            ('Optimistic', price_targets.get('optimistic', 0.45), self.colors['warning'])
+            ('Conservative', price_targets.get('conservative', 0), self.colors['success']),
+            ('Base Case', price_targets.get('base_case', 0), self.colors['primary']),
+            ('Optimistic', price_targets.get('optimistic', 0), self.colors['warning'])
         ]
         
         for name, level, color in target_levels:
@@ -517,425 +707,61 @@ class TitanDashboard:
         
         # Volume bars
         fig.add_trace(
-            go.Bar(x=dates, y=volumes, name='Volume',
+            go.Bar(x=candles.index, y=candles['volume'], name='Volume',
                    marker_color=self.colors['primary'], opacity=0.5),
             row=2, col=1
         )
         
+        # RSI with overbought/oversold bands
+        fig.add_trace(
+            go.Scatter(x=candles.index, y=candles['rsi'], mode='lines',
+                      line=dict(color=self.colors['primary'], width=1.5), name='RSI'),
+            row=3, col=1
+        )
+        for level, color in ((70, self.colors['danger']), (30, self.colors['success'])):
+            fig.add_hline(y=level, line_dash='dot', line_color=color, row=3, col=1)
+        
         fig.update_layout(
             title='WILD Token Technical Analysis',
-            height=600,
+            height=800,
             template='plotly_dark',
-            xaxis2_title='Date',
+            xaxis_rangeslider_visible=False,
+            xaxis3_title='Date',
             yaxis_title='Price (USD)',
             yaxis2_title='Volume',
+            yaxis3_title='RSI',
+            yaxis3_range=[0, 100],
             showlegend=False
         )
         
-        return fig.to_html(include_plotlyjs='cdn', div_id='technical_analysis')
+        return fig
     
     def render_html_template(self, titan_data: Dict[str, Any], 
                            analyzer_data: Dict[str, Any], 
                            charts: Dict[str, str]) -> str:
         """Render the complete HTML template"""
-        
-        template_str = """
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Operation Titan Analysis - {{ timestamp }}</title>
-    <style>
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            background-color: #0a0a0a;
-            color: #ffffff;
-            margin: 0;
-            padding: 0;
-            line-height: 1.6;
-        }
-        .container {
-            max-width: 1400px;
-            margin: 0 auto;
-            padding: 20px;
-        }
-        .header {
-            background: linear-gradient(135deg, #2a3bff 0%, #00d4ff 100%);
-            padding: 40px;
-            border-radius: 16px;
-            margin-bottom: 30px;
-            box-shadow: 0 8px 32px rgba(42, 59, 255, 0.3);
-        }
-        .header h1 {
-            margin: 0;
-            font-size: 2.5em;
-            font-weight: 700;
-        }
-        .header p {
-            margin: 10px 0 0 0;
-            opacity: 0.9;
-            font-size: 1.1em;
-        }
-        .section {
-            background: #1a1a1a;
-            border: 1px solid #333;
-            border-radius: 12px;
-            padding: 30px;
-            margin-bottom: 20px;
-            box-shadow: 0 4px 16px rgba(0, 0, 0, 0.3);
-        }
-        .section h2 {
-            color: #00d4ff;
-            margin-top: 0;
-            font-size: 1.8em;
-            border-bottom: 2px solid #333;
-            padding-bottom: 10px;
-        }
-        .metrics-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-            gap: 20px;
-            margin: 20px 0;
-        }
-        .metric-card {
-            background: #252525;
-            border: 1px solid #444;
-            border-radius: 8px;
-            padding: 20px;
-            text-align: center;
-        }
-        .metric-label {
-            color: #888;
-            font-size: 0.9em;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-        }
-        .metric-value {
-            font-size: 2em;
-            font-weight: 700;
-            margin: 10px 0;
-            color: #00d4ff;
-        }
-        .metric-change {
-            font-size: 0.9em;
-            color: #00ff88;
-        }
-        .metric-change.negative {
-            color: #ff3b3b;
-        }
-        .chart-container {
-            margin: 20px 0;
-            border-radius: 8px;
-            overflow: hidden;
-        }
-        .alert {
-            padding: 15px 20px;
-            border-radius: 8px;
-            margin: 20px 0;
-            border-left: 4px solid;
-        }
-        .alert-warning {
-            background: rgba(255, 183, 0, 0.1);
-            border-color: #ffb700;
-            color: #ffb700;
-        }
-        .alert-danger {
-            background: rgba(255, 59, 59, 0.1);
-            border-color: #ff3b3b;
-            color: #ff3b3b;
-        }
-        .alert-success {
-            background: rgba(0, 255, 136, 0.1);
-            border-color: #00ff88;
-            color: #00ff88;
-        }
-        .signal-box {
-            background: #252525;
-            border: 2px solid;
-            border-radius: 12px;
-            padding: 30px;
-            text-align: center;
-            margin: 30px 0;
-        }
-        .signal-bullish {
-            border-color: #00ff88;
-            box-shadow: 0 0 20px rgba(0, 255, 136, 0.3);
-        }
-        .signal-bearish {
-            border-color: #ff3b3b;
-            box-shadow: 0 0 20px rgba(255, 59, 59, 0.3);
-        }
-        .signal-neutral {
-            border-color: #888;
-        }
-        .footer {
-            text-align: center;
-            padding: 40px;
-            color: #666;
-            font-size: 0.9em;
-        }
-        table {
-            width: 100%;
-            border-collapse: collapse;
-            margin: 20px 0;
-        }
-        th, td {
-            padding: 12px;
-            text-align: left;
-            border-bottom: 1px solid #333;
-        }
-        th {
-            background: #252525;
-            color: #00d4ff;
-            font-weight: 600;
-        }
-        tr:hover {
-            background: rgba(42, 59, 255, 0.1);
-        }
-        .tag {
-            display: inline-block;
-            padding: 4px 12px;
-            border-radius: 16px;
-            font-size: 0.85em;
-            font-weight: 600;
-            margin: 2px;
-        }
-        .tag-success {
-            background: rgba(0, 255, 136, 0.2);
-            color: #00ff88;
-        }
-        .tag-warning {
-            background: rgba(255, 183, 0, 0.2);
-            color: #ffb700;
-        }
-        .tag-danger {
-            background: rgba(255, 59, 59, 0.2);
-            color: #ff3b3b;
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>🚀 Operation Titan Analysis Dashboard</h1>
-            <p>Comprehensive WILD Token Buyback & Market Impact Analysis</p>
-            <p style="font-size: 0.9em; opacity: 0.7;">Generated: {{ timestamp }}</p>
-        </div>
-
-        <!-- Executive Summary -->
-        <div class="section">
-            <h2>📊 Executive Summary</h2>
-            <div class="metrics-grid">
-                <div class="metric-card">
-                    <div class="metric-label">Current Phase</div>
-                    <div class="metric-value">{{ phase_status.current_phase }}</div>
-                    <div class="metric-change">{{ phase_status.days_since_phase2_greenlit }} days since Phase 2</div>
-                </div>
-                <div class="metric-card">
-                    <div class="metric-label">Total ETH Allocated</div>
-                    <div class="metric-value">{{ total_eth_allocation }} ETH</div>
-                    <div class="metric-change">${{ total_usd_value }}</div>
-                </div>
-                <div class="metric-card">
-                    <div class="metric-label">Expected WILD Buyback</div>
-                    <div class="metric-value">{{ total_expected_wild }}M</div>
-                    <div class="metric-change">{{ supply_reduction_pct }}% supply reduction</div>
-                </div>
-                <div class="metric-card">
-                    <div class="metric-label">Overall Progress</div>
-                    <div class="metric-value">{{ overall_progress }}%</div>
-                    <div class="metric-change">{{ execution_status }}</div>
-                </div>
-            </div>
-
-            <!-- Trading Signal -->
-            <div class="signal-box signal-{{ signal_sentiment }}">
-                <h3 style="margin-top: 0; font-size: 1.5em;">Trading Signal: {{ signal_action }}</h3>
-                <p style="margin: 10px 0; opacity: 0.8;">Confidence: {{ signal_confidence }}</p>
-                <div style="text-align: left; background: rgba(0,0,0,0.3); padding: 15px; border-radius: 8px;">
-                    <strong>Rationale:</strong>
-                    <ul style="margin: 10px 0; padding-left: 20px;">
-                        {% for reason in signal_rationale %}
-                        <li>{{ reason }}</li>
-                        {% endfor %}
-                    </ul>
-                </div>
-            </div>
-        </div>
-
-        <!-- DAO Progress -->
-        <div class="section">
-            <h2>🏛️ DAO Buyback Progress</h2>
-            <div class="chart-container">
-                {{ dao_progress_chart }}
-            </div>
-            
-            <!-- DAO Details Table -->
-            <table>
-                <thead>
-                    <tr>
-                        <th>DAO Name</th>
-                        <th>ETH Allocated</th>
-                        <th>ETH Remaining</th>
-                        <th>WILD Balance</th>
-                        <th>Progress</th>
-                        <th>Status</th>
-                    </tr>
-                </thead>
-                <tbody>
-                    {% for dao_name, dao_info in dao_details %}
-                    <tr>
-                        <td>{{ dao_name }}</td>
-                        <td>{{ dao_info.eth_allocation }} ETH</td>
-                        <td>{{ dao_info.eth_remaining }} ETH</td>
-                        <td>{{ dao_info.wild_balance }}</td>
-                        <td>{{ dao_info.progress_str }}%</td>
-                        <td>
-                            {% if dao_info.progress > 50 %}
-                            <span class="tag tag-success">Active</span>
-                            {% elif dao_info.progress > 0 %}
-                            <span class="tag tag-warning">Started</span>
-                            {% else %}
-                            <span class="tag tag-danger">Pending</span>
-                            {% endif %}
-                        </td>
-                    </tr>
-                    {% endfor %}
-                </tbody>
-            </table>
-        </div>
-
-        <!-- Supply Dynamics -->
-        <div class="section">
-            <h2>🔥 Supply Dynamics & Deflationary Mechanics</h2>
-            <div class="chart-container">
-                {{ supply_dynamics_chart }}
-            </div>
-            
-            <div class="metrics-grid">
-                <div class="metric-card">
-                    <div class="metric-label">Circulating Supply</div>
-                    <div class="metric-value">{{ circulating_supply }}M</div>
-                </div>
-                <div class="metric-card">
-                    <div class="metric-label">OTC Locked</div>
-                    <div class="metric-value">{{ otc_locked }}M</div>
-                </div>
-                <div class="metric-card">
-                    <div class="metric-label">Annual Deflation Rate</div>
-                    <div class="metric-value">{{ annual_deflation }}%</div>
-                </div>
-            </div>
-        </div>
-
-        <!-- Price Analysis -->
-        <div class="section">
-            <h2>💰 Price Impact & Targets</h2>
-            <div class="chart-container">
-                {{ price_impact_chart }}
-            </div>
-            
-            <div class="alert alert-success">
-                <strong>Price Targets Summary:</strong><br>
-                Conservative: ${{ price_targets.conservative }} | 
-                Base Case: ${{ price_targets.base_case }} | 
-                Optimistic: ${{ price_targets.optimistic }} | 
-                1 Year: ${{ price_targets.one_year }}
-            </div>
-        </div>
-
-        <!-- Risk Assessment -->
-        <div class="section">
-            <h2>⚠️ Risk Assessment</h2>
-            <div class="chart-container">
-                {{ risk_matrix_chart }}
-            </div>
-            
-            {% if risk_concerns %}
-            <div class="alert alert-warning">
-                <strong>Key Risk Factors:</strong>
-                <ul style="margin: 10px 0; padding-left: 20px;">
-                    {% for concern in risk_concerns %}
-                    <li>{{ concern }}</li>
-                    {% endfor %}
-                </ul>
-            </div>
-            {% endif %}
-        </div>
-
-        <!-- Timeline -->
-        <div class="section">
-            <h2>📅 Operation Titan Timeline</h2>
-            <div class="chart-container">
-                {{ timeline_chart }}
-            </div>
-        </div>
-
-        <!-- Portfolio Exposure -->
-        <div class="section">
-            <h2>💼 Your Portfolio Exposure</h2>
-            <div class="chart-container">
-                {{ wallet_exposure_chart }}
-            </div>
-            
-            <div class="metrics-grid">
-                <div class="metric-card">
-                    <div class="metric-label">Total WILD Holdings</div>
-                    <div class="metric-value">{{ total_wild_holdings }}</div>
-                </div>
-                <div class="metric-card">
-                    <div class="metric-label">LP Token Exposure</div>
-                    <div class="metric-value">{{ lp_exposure }}</div>
-                </div>
-                <div class="metric-card">
-                    <div class="metric-label">Potential Gain (Base Case)</div>
-                    <div class="metric-value">${{ potential_gain }}</div>
-                </div>
-            </div>
-        </div>
-
-        <!-- Technical Analysis -->
-        <div class="section">
-            <h2>📈 Technical Analysis</h2>
-            <div class="chart-container">
-                {{ technical_analysis_chart }}
-            </div>
-        </div>
-
-        <!-- Recommendations -->
-        <div class="section">
-            <h2>🎯 Recommendations & Next Steps</h2>
-            
-            <h3>Monitoring Checklist:</h3>
-            <ul>
-                <li>✅ Daily: Check DAO wallet balances for ETH outflows</li>
-                <li>✅ Daily: Monitor Uniswap V3 pool for large WILD/ETH swaps</li>
-                <li>✅ Weekly: Review burn rate from in-game activities</li>
-                <li>✅ Weekly: Update price targets based on buyback progress</li>
-            </ul>
+        return get_template(DASHBOARD_TEMPLATE).render(**self.template_context(titan_data, analyzer_data, charts))
+    
+    def template_context(self, titan_data: Dict[str, Any],
+                         analyzer_data: Dict[str, Any],
+                         charts: Dict[str, str]) -> Dict[str, Any]:
+        """Variables for the dashboard template"""
+        return {
+            **self.report_context(titan_data, analyzer_data),
             
-            <h3>Action Items:</h3>
-            <ol>
-                <li>Set alerts for DAO wallet transactions > 10 ETH</li>
-                <li>Monitor WILD price for entry points below conservative target</li>
-                <li>Track Wiami.Fun activity for burn rate acceleration</li>
-                <li>Review weekly for Phase 2 execution confirmation</li>
-            </ol>
-        </div>
-
-        <div class="footer">
-            <p>Operation Titan Analysis Dashboard v1.0 | Auto-generated report</p>
-            <p>Data sources: Etherscan API, CoinGecko, On-chain Analysis</p>
-            <p style="opacity: 0.6;">Disclaimer: This analysis is for informational purposes only. Not financial advice.</p>
-        </div>
-    </div>
-</body>
-</html>
-        """
-        
-        template = Template(template_str)
-        
+            # Charts
+            'plotly_script': plotly_script_tag(self.output_dir),
+            'dao_progress_chart': charts['dao_progress'],
+            'supply_dynamics_chart': charts['supply_dynamics'],
+            'price_impact_chart': charts['price_impact'],
+            'risk_matrix_chart': charts['risk_matrix'],
+            'timeline_chart': charts['timeline'],
+            'wallet_exposure_chart': charts['wallet_exposure'],
+            'technical_analysis_chart': charts['technical_analysis']
+        }
+    
+    def report_context(self, titan_data: Dict[str, Any], analyzer_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Formatted report values shared by the HTML dashboard and the payload viewer"""
         # Prepare template variables
         supply = titan_data.get('supply_dynamics', {})
         price_impact = titan_data.get('price_impact', {})
@@ -1000,16 +826,7 @@ class TitanDashboard:
             # Portfolio exposure
             'total_wild_holdings': f"{exposure.get('total_wild_holdings', 0):,.0f}",
             'lp_exposure': f"{exposure.get('lp_exposure', 0):,.0f}",
-            'potential_gain': f"{exposure.get('total_exposure_wild', 0) * (price_targets.get('base_case', 0.42) - price_targets.get('current_price', 0.38)):,.0f}",
-            
-            # Charts
-            'dao_progress_chart': charts['dao_progress'],
-            'supply_dynamics_chart': charts['supply_dynamics'],
-            'price_impact_chart': charts['price_impact'],
-            'risk_matrix_chart': charts['risk_matrix'],
-            'timeline_chart': charts['timeline'],
-            'wallet_exposure_chart': charts['wallet_exposure'],
-            'technical_analysis_chart': charts['technical_analysis']
+            'potential_gain': f"{exposure.get('total_exposure_wild', 0) * (price_targets.get('base_case', 0.42) - price_targets.get('current_price', 0.38)):,.0f}"
         }
         
-        return template.render(**context)
\ No newline at end of file
+        return context
\ No newline at end of file
@@ -4,6 +4,7 @@ Tracks 9 DAO wallets, DEX activity, burn mechanisms, and price impact
 """
 
 import os
+import sys
 import json
 import logging
 from typing import Dict, List, Optional, Tuple, Any
@@ -16,6 +17,16 @@ from etherscan import Etherscan
 from dotenv import load_dotenv
 import requests
 
+# Add src to path so sibling modules resolve when imported as src.<module>
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from rpc_client import RPCError
+from rpc_pool import RPCProviderPool
+from log_indexer import TransferLogIndexer
+from supply_tracker import SupplyTracker
+from holder_index import HolderIndex
+from rpc_cache import ImmutableCallCache, construct_immutable_cache_middleware
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -26,6 +37,20 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', 'config', '.env'))
 
+# Blocks per pinned LP snapshot (~1 hour), so repeated renders reuse cached pair reads
+LP_STATE_BLOCK_INTERVAL = 300
+
+# Uniswap V2 pair methods needed to decompose LP tokens into underlying reserves
+UNISWAP_V2_PAIR_ABI = [
+    {"constant": True, "inputs": [], "name": "token0",
+     "outputs": [{"name": "", "type": "address"}], "type": "function"},
+    {"constant": True, "inputs": [], "name": "getReserves",
+     "outputs": [{"name": "reserve0", "type": "uint112"}, {"name": "reserve1", "type": "uint112"},
+                 {"name": "blockTimestampLast", "type": "uint32"}], "type": "function"},
+    {"constant": True, "inputs": [], "name": "totalSupply",
+     "outputs": [{"name": "", "type": "uint256"}], "type": "function"}
+]
+
 class TitanTracker:
     """Tracks Operation Titan buyback activities and market impact"""
     
@@ -33,7 +58,21 @@ class TitanTracker:
         """Initialize the tracker with DAO addresses and configurations"""
         self.api_key = os.getenv('ETHERSCAN_API_KEY')
         self.eth = Etherscan(self.api_key)
-        self.w3 = Web3(Web3.HTTPProvider(f"https://mainnet.infura.io/v3/{os.getenv('INFURA_PROJECT_ID', '')}"))
+        
+        # Every endpoint from ETH_RPC_URLS / ETH_RPC_URL / Infura / local node, routed by latency with failover
+        self.rpc_pool = RPCProviderPool()
+        self.w3 = Web3(self.rpc_pool.web3_provider())
+        
+        # Block-pinned eth_call/eth_getBlockByNumber results never change; serve repeats from cache
+        self.call_cache = ImmutableCallCache()
+        self.w3.middleware_onion.inject(
+            construct_immutable_cache_middleware(self.call_cache), 'immutable_cache', layer=0
+        )
+        
+        # 'etherscan' issues per-DAO account queries; 'logs' pulls WILD Transfers
+        # for every monitored address with one topic-filtered eth_getLogs query per side
+        self.monitor_mode = os.getenv('TITAN_MONITOR_MODE', 'etherscan').lower()
+        self.log_indexer = TransferLogIndexer(self.rpc_pool)
         
         # WILD token contract
         self.wild_token = '0x2a3bff78b79a009976eea096a51a948a3dc00e34'
@@ -90,6 +129,9 @@ class TitanTracker:
         # Project treasury for OTC purchases
         self.project_treasury = '0x24089292d5e5b4e487b07c8df44f973a0aab7d7b'
         
+        # Uniswap V2 WILD/WETH pair held as LP tokens by the portfolio wallets
+        self.uniswap_v2_pair = (os.getenv('UNISWAP_V2_WILD_ETH_LP') or '').lower() or None
+        
         # Uniswap V3 WILD/ETH pool (to be verified)
         self.uniswap_v3_pool = None  # Will detect dynamically
         
@@ -97,6 +139,16 @@ class TitanTracker:
         self.total_eth_allocation = 911
         self.total_expected_wild = 8010000
         
+        # On-chain supply ledger (treasury, DAOs and configured vesting wallets are non-circulating)
+        self.supply_tracker = SupplyTracker(
+            self.wild_token,
+            self.get_excluded_supply_addresses(),
+            client=self.log_indexer.client
+        )
+        
+        # Full holder balance index, built on first use (replays all WILD history once)
+        self.holder_index = None
+        
         # Phase timeline
         self.phase_dates = {
             'otc_start': datetime(2024, 1, 1),
@@ -114,8 +166,8 @@ class TitanTracker:
         for dao_name, dao_info in self.dao_wallets.items():
             address = dao_info['address']
             try:
-                # Get ETH balance
-                eth_balance_wei = self.eth.get_eth_balance(address)
+                # Get ETH balance (through the provider pool so a degraded endpoint does not stall the cycle)
+                eth_balance_wei = self.w3.eth.get_balance(Web3.to_checksum_address(address))
                 eth_balance = float(eth_balance_wei) / 1e18
                 
                 # Get WILD token balance
@@ -137,8 +189,8 @@ class TitanTracker:
                 
         return balances
     
-    def get_token_balance(self, address: str, token_contract: str) -> float:
-        """Get ERC20 token balance for an address"""
+    def get_token_balance(self, address: str, token_contract: str, block_identifier: Any = 'latest') -> float:
+        """Get ERC20 token balance for an address, optionally at a historical block"""
         try:
             # Define minimal ERC20 ABI for balanceOf
             erc20_abi = [
@@ -158,13 +210,44 @@ class TitanTracker:
             )
             
             # Get balance
-            balance = contract.functions.balanceOf(Web3.to_checksum_address(address)).call()
+            balance = contract.functions.balanceOf(Web3.to_checksum_address(address)).call(
+                block_identifier=block_identifier
+            )
             return balance / 1e18  # WILD has 18 decimals
             
         except Exception as e:
             logger.error(f"Error getting token balance: {e}")
             return 0.0
     
+    def get_lp_pair_state(self, block_identifier: Optional[int] = None) -> Dict[str, Any]:
+        """Read the Uniswap V2 WILD/WETH pair's reserves and LP supply at a pinned block
+        
+        By default the block is pinned below the confirmation depth and rounded down
+        to LP_STATE_BLOCK_INTERVAL, so every render within that window reads the same
+        block and the four eth_calls are served from the immutable call cache.
+        """
+        if not self.uniswap_v2_pair:
+            raise ValueError("UNISWAP_V2_WILD_ETH_LP is not configured")
+        
+        if block_identifier is None:
+            safe_block = self.w3.eth.block_number - self.call_cache.confirmations
+            block_identifier = safe_block - safe_block % LP_STATE_BLOCK_INTERVAL
+        
+        pair = self.w3.eth.contract(address=Web3.to_checksum_address(self.uniswap_v2_pair), abi=UNISWAP_V2_PAIR_ABI)
+        token0 = pair.functions.token0().call(block_identifier=block_identifier).lower()
+        reserve0, reserve1, _ = pair.functions.getReserves().call(block_identifier=block_identifier)
+        total_supply = pair.functions.totalSupply().call(block_identifier=block_identifier)
+        
+        # WILD and WETH both have 18 decimals, as does the LP token
+        wild_reserve, eth_reserve = (reserve0, reserve1) if token0 == self.wild_token else (reserve1, reserve0)
+        return {
+            'pair': self.uniswap_v2_pair,
+            'block': block_identifier,
+            'wild_reserve': wild_reserve / 1e18,
+            'eth_reserve': eth_reserve / 1e18,
+            'total_supply': total_supply / 1e18
+        }
+    
     def get_dao_transactions(self, dao_name: str, start_date: Optional[datetime] = None) -> Dict[str, List[Dict]]:
         """Get all transactions for a specific DAO wallet"""
         dao_info = self.dao_wallets.get(dao_name)
@@ -232,20 +315,98 @@ class TitanTracker:
             
         return transactions
     
+    def get_monitored_addresses(self) -> Dict[str, str]:
+        """Map lowercase addresses of all DAO wallets and the project treasury to their names"""
+        addresses = {info['address'].lower(): dao_name for dao_name, info in self.dao_wallets.items()}
+        addresses[self.project_treasury.lower()] = 'Project Treasury'
+        return addresses
+    
+    def get_excluded_supply_addresses(self) -> Dict[str, str]:
+        """Addresses whose WILD is not circulating: monitored wallets plus WILD_EXCLUDED_ADDRESSES
+        
+        WILD_EXCLUDED_ADDRESSES is a comma-separated list of `label=address` or bare addresses
+        (e.g. vesting contracts).
+        """
+        excluded = self.get_monitored_addresses()
+        for i, entry in enumerate(filter(None, os.getenv('WILD_EXCLUDED_ADDRESSES', '').split(','))):
+            label, _, address = entry.strip().rpartition('=')
+            excluded[address.strip().lower()] = label.strip() or f'Excluded {i + 1}'
+        return excluded
+    
+    def get_all_dao_wild_transfers(self, start_block: int, end_block: Optional[int] = None) -> Dict[str, Dict[str, List[Dict]]]:
+        """Get WILD transfers for every DAO and the treasury in one multi-address log query
+        
+        The full address list goes into topics[1] (senders) and topics[2] (recipients),
+        so each block window costs the same number of eth_getLogs calls no matter how
+        many DAOs are tracked. Results are demultiplexed into the get_dao_transactions
+        layout per wallet name; ETH outflows are not visible in token logs and stay empty.
+        """
+        monitored = self.get_monitored_addresses()
+        transactions = {
+            name: {'eth_outflows': [], 'wild_inflows': [], 'wild_outflows': []}
+            for name in monitored.values()
+        }
+        
+        logs = self.log_indexer.fetch_transfer_logs(
+            monitored.keys(),
+            from_block=start_block,
+            to_block=end_block,
+            contracts=[self.wild_token]
+        )
+        
+        for row in self.log_indexer.decode_logs(logs):
+            tx_data = {
+                'hash': row['hash'],
+                'timestamp': datetime.fromtimestamp(int(row['timeStamp'])),
+                'block': int(row['blockNumber']),
+                'value_wild': float(row['value']) / 1e18,
+                'gas_used': 0
+            }
+            
+            # A transfer between two monitored wallets is an outflow for one and an inflow for the other
+            receiver = monitored.get(row['to'])
+            if receiver:
+                transactions[receiver]['wild_inflows'].append({**tx_data, 'from': row['from']})
+            sender = monitored.get(row['from'])
+            if sender:
+                transactions[sender]['wild_outflows'].append({**tx_data, 'to': row['to']})
+        
+        return transactions
+    
     def get_block_by_timestamp(self, timestamp: int) -> int:
-        """Get block number by timestamp (approximate)"""
+        """Get the first block mined at or after a timestamp
+        
+        Bisects over a fixed block range so the probed blocks are the same on every
+        run and come from the immutable call cache after the first lookup; answers
+        for timestamps safely behind head are cached as well.
+        """
+        cache_key = f"block_by_timestamp:{timestamp}"
+        cached = self.call_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            # Ethereum average block time is ~12 seconds
             current_block = self.w3.eth.block_number
             current_timestamp = self.w3.eth.get_block(current_block)['timestamp']
+            if timestamp >= current_timestamp:
+                return current_block
             
-            blocks_diff = (current_timestamp - timestamp) // 12
-            estimated_block = current_block - blocks_diff
+            low, high = 0, 1 << 25
+            while low < high:
+                mid = (low + high) // 2
+                if mid > current_block or self.w3.eth.get_block(mid)['timestamp'] >= timestamp:
+                    high = mid
+                else:
+                    low = mid + 1
             
-            return max(1, estimated_block)
-        except:
-            # Fallback to a recent block if calculation fails
-            return 17900000  # Approximate block for July 2025
+            if low <= current_block - self.call_cache.confirmations:
+                self.call_cache.put(cache_key, low)
+            return max(1, low)
+        except Exception as e:
+            # A guessed block would silently shift every block-ranged query, so fail loudly instead
+            logger.error(f"Block lookup for timestamp {timestamp} failed on all RPC endpoints: {e}; "
+                         f"endpoint stats: {self.rpc_pool.endpoint_stats()}")
+            raise RPCError(f"Could not resolve block for timestamp {timestamp}: {e}")
     
     def analyze_dex_activity(self, hours: int = 24) -> Dict[str, Any]:
         """Analyze WILD/ETH DEX trading activity"""
@@ -259,29 +420,85 @@ class TitanTracker:
             'dao_related_trades': []
         }
     
-    def calculate_supply_dynamics(self) -> Dict[str, float]:
-        """Calculate current supply dynamics including burns and locks"""
-        total_supply = 500000000  # 500M total supply
-        
-        # Estimate circulating supply (this would need real data)
-        circulating_supply = 200000000  # Estimated 200M circulating
+    def calculate_supply_dynamics(self) -> Dict[str, Any]:
+        """Calculate current supply dynamics including burns and locks
         
-        # Calculate locked/burned amounts
-        otc_locked = 20000000  # 20M from OTC phase
+        Figures come from the incremental on-chain supply ledger; if the node is
+        unreachable the previous static estimates are used and flagged as such.
+        """
         dao_buyback_target = self.total_expected_wild
         
-        # Estimate burn rate (would need to track actual burns)
-        estimated_burns = 0  # Placeholder for actual burn tracking
+        try:
+            snapshot = self.supply_tracker.get_supply_snapshot()
+        except Exception as e:
+            logger.error(f"Error reading on-chain supply, using static estimates: {e}")
+            snapshot = None
+        
+        if snapshot is None:
+            total_supply = 500000000  # 500M total supply
+            circulating_supply = 200000000  # Estimated 200M circulating
+            otc_locked = 20000000  # 20M from OTC phase
+            return {
+                'total_supply': total_supply,
+                'circulating_supply': circulating_supply,
+                'otc_locked': otc_locked,
+                'dao_buyback_target': dao_buyback_target,
+                'total_locked': otc_locked + dao_buyback_target,
+                'estimated_burns': 0,
+                'effective_circulating': circulating_supply - otc_locked - dao_buyback_target,
+                'supply_reduction_pct': ((otc_locked + dao_buyback_target) / circulating_supply) * 100,
+                'source': 'estimate'
+            }
+        
+        # OTC purchases sit in the project treasury; DAO balances count toward their buyback target
+        excluded = snapshot['excluded_balances']
+        otc_locked = excluded.get(self.project_treasury.lower(), 0)
+        dao_holdings = sum(excluded.get(info['address'].lower(), 0) for info in self.dao_wallets.values())
+        
+        # Excluded balances are already out of circulating supply, so only the
+        # buyback still outstanding reduces it further
+        circulating_supply = snapshot['circulating_supply']
+        outstanding_buyback = max(0, dao_buyback_target - dao_holdings)
+        float_before_locks = circulating_supply + otc_locked + dao_holdings
         
         return {
-            'total_supply': total_supply,
+            'total_supply': snapshot['total_supply'],
             'circulating_supply': circulating_supply,
             'otc_locked': otc_locked,
+            'dao_holdings': dao_holdings,
             'dao_buyback_target': dao_buyback_target,
             'total_locked': otc_locked + dao_buyback_target,
-            'estimated_burns': estimated_burns,
-            'effective_circulating': circulating_supply - otc_locked - dao_buyback_target,
-            'supply_reduction_pct': ((otc_locked + dao_buyback_target) / circulating_supply) * 100
+            'estimated_burns': snapshot['total_burned'],
+            'burned_to_dead': snapshot['burned_to_dead'],
+            'burned_to_zero': snapshot['burned_to_zero'],
+            'excluded_supply': snapshot['total_excluded'],
+            'effective_circulating': circulating_supply - outstanding_buyback,
+            'supply_reduction_pct': ((otc_locked + dao_buyback_target) / float_before_locks) * 100 if float_before_locks > 0 else 0,
+            'as_of_block': snapshot['as_of_block'],
+            'source': 'onchain'
+        }
+    
+    def analyze_holder_concentration(self, top_n: int = 20) -> Dict[str, Any]:
+        """Report WILD holder concentration and whale moves since Phase 2
+        
+        Treasury, DAO and other excluded wallets are left out of the holder metrics.
+        """
+        if self.holder_index is None:
+            self.holder_index = HolderIndex(self.wild_token, client=self.log_indexer.client)
+        self.holder_index.refresh()
+        
+        excluded = list(self.get_excluded_supply_addresses())
+        try:
+            phase2_block = self.get_block_by_timestamp(int(self.phase_dates['phase2_greenlit'].timestamp()))
+        except Exception as e:
+            # Listing every recorded whale move beats dropping the holder report
+            logger.warning(f"Could not resolve the Phase 2 block, listing whale moves since deployment: {e}")
+            phase2_block = self.holder_index.start_block
+        
+        return {
+            'metrics': self.holder_index.concentration_metrics(exclude=excluded),
+            'top_holders': self.holder_index.top_holders(top_n, exclude=excluded),
+            'whale_moves_since_phase2': self.holder_index.get_whale_moves(from_block=phase2_block)
         }
     
     def detect_buyback_patterns(self) -> Dict[str, Any]:
@@ -292,9 +509,18 @@ class TitanTracker:
             'anomalies': []
         }
         
+        # Pull all DAO activity at once in log mode, otherwise query each DAO
+        all_txns = {}
+        if self.monitor_mode == 'logs':
+            try:
+                start_block = self.get_block_by_timestamp(int(self.phase_dates['phase2_greenlit'].timestamp()))
+                all_txns = self.get_all_dao_wild_transfers(start_block)
+            except Exception as e:
+                logger.error(f"Error getting DAO transfer logs, falling back to per-DAO queries: {e}")
+        
         # Check each DAO for recent activity
         for dao_name in self.dao_wallets:
-            txns = self.get_dao_transactions(dao_name)
+            txns = all_txns.get(dao_name) or self.get_dao_transactions(dao_name)
             
             if txns['eth_outflows'] or txns['wild_inflows']:
                 patterns['dao_activity'][dao_name] = {
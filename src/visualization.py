@@ -4,8 +4,10 @@ Creates charts and visualizations using plotly and matplotlib.
 """
 
 import os
+import sys
 import logging
-from typing import Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
 from datetime import datetime
 import pandas as pd
 import numpy as np
@@ -15,6 +17,15 @@ from plotly.subplots import make_subplots
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+# Add src to path so sibling modules resolve when imported as src.<module>
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from plotly_assets import plotly_src
+from chart_cache import ChartCache, PARALLEL_MIN_MISSES
+from report_manifest import ReportManifest
+from downsampling import POINT_BUDGET, RELAYOUT_SCRIPT, add_downsampled_trace, bucket_counts
+from image_export import ImageExporter
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -29,8 +40,18 @@ sns.set_palette("husl")
 class WilderVisualizer:
     """Creates visualizations for Wilder World portfolio analysis."""
     
-    def __init__(self, output_dir: Optional[str] = None):
-        """Initialize the visualizer with output directory."""
+    def __init__(self, output_dir: Optional[str] = None, render_workers: int = 0,
+                 parallel_min_misses: int = PARALLEL_MIN_MISSES):
+        """
+        Initialize the visualizer with output directory.
+        
+        Args:
+            output_dir: Directory for the chart pages
+            render_workers: Worker processes that build changed charts concurrently
+                (0 or 1 builds them in this process)
+            parallel_min_misses: Fewest changed charts sent to the workers; fewer
+                are built in this process
+        """
         if output_dir is None:
             self.output_dir = os.path.join(os.path.dirname(__file__), '..', 'output', 'visualizations')
         else:
@@ -59,6 +80,35 @@ class WilderVisualizer:
             'moto': '#C0392B',
             'pals_gens': '#D35400'
         }
+        
+        # Rendered pages keyed by a fingerprint of each chart's inputs
+        self.chart_cache = ChartCache()
+        self.render_workers = render_workers
+        self.parallel_min_misses = parallel_min_misses
+        
+        # Catalog entry per chart page for the main dashboard
+        self.manifest = ReportManifest.for_report_dir(self.output_dir)
+    
+    @staticmethod
+    def _without_transactions(holdings: Dict) -> Dict:
+        """Holdings without the per-position transaction frames, which no chart reads."""
+        if not isinstance(holdings, dict):
+            return holdings
+        return {key: WilderVisualizer._without_transactions(value)
+                for key, value in holdings.items() if key != 'transactions'}
+    
+    @staticmethod
+    def _timeline_inputs(all_data: Dict) -> Dict:
+        """The timestamps create_transaction_timeline reads, without the rest of each transaction."""
+        stamps = lambda txns: [{'timeStamp': txn['timeStamp']} for txn in txns]
+        return {
+            wallet_name: {
+                'normal_txns': stamps(wallet_data.get('normal_txns', [])),
+                'token_txns': {'all': stamps(wallet_data.get('token_txns', {}).get('all', []))},
+                'nft_txns': {'all': stamps(wallet_data.get('nft_txns', {}).get('all', []))}
+            }
+            for wallet_name, wallet_data in all_data.items()
+        }
     
     def create_portfolio_composition_chart(self, wild_holdings: Dict, nft_holdings: Dict, 
                                          lp_positions: Dict, prices: Dict) -> go.Figure:
@@ -163,24 +213,27 @@ class WilderVisualizer:
         
         fig = go.Figure()
         
+        # Wallets without a txlist have no gas data; label them instead of showing a zero bar as fact
+        labels = [w if gas_costs[w].get('gas_known', True) else f'{w} (gas unknown)' for w in wallets]
+        
         # Add bars for each transaction type
         fig.add_trace(go.Bar(
             name='Normal Transactions',
-            x=wallets,
+            x=labels,
             y=[gas_costs[w]['normal_txns'] for w in wallets],
             marker_color='#3498DB'
         ))
         
         fig.add_trace(go.Bar(
             name='Token Transactions',
-            x=wallets,
+            x=labels,
             y=[gas_costs[w]['token_txns'] for w in wallets],
             marker_color='#2ECC71'
         ))
         
         fig.add_trace(go.Bar(
             name='NFT Transactions',
-            x=wallets,
+            x=labels,
             y=[gas_costs[w]['nft_txns'] for w in wallets],
             marker_color='#E74C3C'
         ))
@@ -196,7 +249,7 @@ class WilderVisualizer:
         
         return fig
     
-    def create_transaction_timeline(self, all_data: Dict) -> go.Figure:
+    def create_transaction_timeline(self, all_data: Dict, point_budget: int = POINT_BUDGET) -> go.Figure:
         """Create a timeline visualization of all transactions."""
         fig = make_subplots(
             rows=len(all_data),
@@ -238,27 +291,24 @@ class WilderVisualizer:
             if all_txns:
                 combined_df = pd.concat(all_txns, ignore_index=True)
                 
-                # Group by date and type
-                daily_counts = combined_df.groupby([combined_df['timestamp'].dt.date, 'type']).size().reset_index(name='count')
-                
-                # Add scatter plots for each type
+                # Daily counts per type; series beyond the point budget are thinned and drawn with WebGL
                 for tx_type in ['ETH', 'Token', 'NFT']:
-                    type_data = daily_counts[daily_counts['type'] == tx_type]
-                    if not type_data.empty:
-                        fig.add_trace(
-                            go.Scatter(
-                                x=type_data['timestamp'],
-                                y=type_data['count'],
-                                mode='markers',
-                                name=tx_type,
-                                marker=dict(
-                                    size=10,
-                                    color={'ETH': '#3498DB', 'Token': '#2ECC71', 'NFT': '#E74C3C'}[tx_type]
-                                ),
-                                showlegend=(row == 1)
-                            ),
+                    daily_counts = bucket_counts(combined_df.loc[combined_df['type'] == tx_type, 'timestamp'], 'D')
+                    if not daily_counts.empty:
+                        add_downsampled_trace(
+                            fig,
+                            daily_counts.index,
+                            daily_counts.values,
+                            budget=point_budget,
                             row=row,
-                            col=1
+                            col=1,
+                            mode='markers',
+                            name=tx_type,
+                            marker=dict(
+                                size=10,
+                                color={'ETH': '#3498DB', 'Token': '#2ECC71', 'NFT': '#E74C3C'}[tx_type]
+                            ),
+                            showlegend=(row == 1)
                         )
             
             row += 1
@@ -338,42 +388,112 @@ class WilderVisualizer:
         
         return fig
     
+    def create_portfolio_value_history(self, history: pd.DataFrame) -> go.Figure:
+        """Create a stacked area chart of daily portfolio value by wallet, with WILD balances below."""
+        fig = make_subplots(
+            rows=2, cols=1,
+            shared_xaxes=True,
+            vertical_spacing=0.08,
+            row_heights=[0.65, 0.35],
+            subplot_titles=('Portfolio Value (USD)', 'WILD Balance')
+        )
+        
+        for wallet, series in history.groupby('wallet', sort=False):
+            color = self.wallet_colors.get(wallet, '#95A5A6')
+            fig.add_trace(
+                go.Scatter(
+                    x=series['date'],
+                    y=series['value_usd'],
+                    name=wallet.title(),
+                    stackgroup='value',
+                    # Bridge unpriced days rather than stacking them as zero
+                    stackgaps='interpolate',
+                    line=dict(color=color)
+                ),
+                row=1, col=1
+            )
+            fig.add_trace(
+                go.Scatter(
+                    x=series['date'],
+                    y=series['wild_balance'],
+                    name=wallet.title(),
+                    line=dict(color=color),
+                    showlegend=False
+                ),
+                row=2, col=1
+            )
+        
+        fig.update_layout(
+            title='Daily Portfolio Value History',
+            hovermode='x unified',
+            height=800,
+            width=1200
+        )
+        
+        return fig
+    
     def save_all_visualizations(self, wild_holdings: Dict, nft_holdings: Dict,
                                lp_positions: Dict, gas_costs: Dict,
                                inter_wallet_transfers: pd.DataFrame,
-                               all_data: Dict, prices: Dict):
-        """Generate and save all visualizations."""
+                               all_data: Dict, prices: Dict,
+                               portfolio_history: Optional[pd.DataFrame] = None,
+                               image_formats: Sequence[str] = ()):
+        """
+        Generate and save all visualizations.
+        
+        Args:
+            image_formats: Also export every chart as static images in these formats
+                (e.g. ('png', 'svg')) under images/; needs kaleido
+        """
         logger.info("Creating visualizations...")
         
-        # 1. Portfolio composition
-        fig = self.create_portfolio_composition_chart(wild_holdings, nft_holdings, lp_positions, prices)
-        fig.write_html(os.path.join(self.output_dir, 'portfolio_composition.html'))
-        logger.info("Saved portfolio composition chart")
-        
-        # 2. WILD holdings by wallet
-        fig = self.create_wild_holdings_by_wallet(wild_holdings)
-        fig.write_html(os.path.join(self.output_dir, 'wild_holdings_by_wallet.html'))
-        logger.info("Saved WILD holdings chart")
-        
-        # 3. NFT holdings heatmap
-        fig = self.create_nft_holdings_heatmap(nft_holdings)
-        fig.write_html(os.path.join(self.output_dir, 'nft_holdings_heatmap.html'))
-        logger.info("Saved NFT holdings heatmap")
-        
-        # 4. Gas cost breakdown
-        fig = self.create_gas_cost_breakdown(gas_costs)
-        fig.write_html(os.path.join(self.output_dir, 'gas_cost_breakdown.html'))
-        logger.info("Saved gas cost breakdown")
-        
-        # 5. Transaction timeline
-        fig = self.create_transaction_timeline(all_data)
-        fig.write_html(os.path.join(self.output_dir, 'transaction_timeline.html'))
-        logger.info("Saved transaction timeline")
-        
-        # 6. Inter-wallet transfers
-        fig = self.create_inter_wallet_flow_diagram(inter_wallet_transfers)
-        fig.write_html(os.path.join(self.output_dir, 'inter_wallet_transfers.html'))
-        logger.info("Saved inter-wallet transfer diagram")
+        # Every page loads the one shared plotly.js bundle instead of embedding its own copy
+        plotly_js = plotly_src(self.output_dir)
+        colors = (self.wallet_colors, self.collection_colors)
+        
+        # Builders get compact inputs: these are hashed for the cache key and pickled to workers
+        wild_holdings = self._without_transactions(wild_holdings)
+        nft_holdings = self._without_transactions(nft_holdings)
+        lp_positions = self._without_transactions(lp_positions)
+        
+        charts = [
+            ('portfolio_composition', self.create_portfolio_composition_chart,
+             (wild_holdings, nft_holdings, lp_positions, prices)),
+            ('wild_holdings_by_wallet', self.create_wild_holdings_by_wallet, (wild_holdings,)),
+            ('nft_holdings_heatmap', self.create_nft_holdings_heatmap, (nft_holdings,)),
+            ('gas_cost_breakdown', self.create_gas_cost_breakdown, (gas_costs,)),
+            ('transaction_timeline', self.create_transaction_timeline, (self._timeline_inputs(all_data),)),
+            ('inter_wallet_transfers', self.create_inter_wallet_flow_diagram, (inter_wallet_transfers,))
+        ]
+        if portfolio_history is not None and not portfolio_history.empty:
+            charts.append(('portfolio_value_history', self.create_portfolio_value_history, (portfolio_history,)))
+        charts = [(name, builder, args, (colors, plotly_js)) for name, builder, args in charts]
+        
+        # Figures are rebuilt only when their inputs changed; cached pages are rewritten as-is
+        self.chart_cache.stats = {'hits': 0, 'misses': 0}
+        # The relayout script swaps resolution levels of downsampled traces on zoom
+        html_options = {'include_plotlyjs': plotly_js, 'post_script': RELAYOUT_SCRIPT}
+        if self.render_workers > 1:
+            with ProcessPoolExecutor(max_workers=min(self.render_workers, len(charts))) as pool:
+                pages = self.chart_cache.render_many(charts, html_options, executor=pool,
+                                                       min_parallel=self.parallel_min_misses)
+        else:
+            pages = self.chart_cache.render_many(charts, html_options)
+        
+        for name, html in pages.items():
+            page_path = os.path.join(self.output_dir, f'{name}.html')
+            with open(page_path, 'w', encoding='utf-8') as f:
+                f.write(html)
+            self.manifest.append('visualizations', page_path, name.replace('_', ' ').title())
+        self.chart_cache.prune()
+        logger.info(f"Saved {len(charts)} charts ({self.chart_cache.stats['misses']} rebuilt, "
+                    f"{self.chart_cache.stats['hits']} unchanged)")
+        
+        if image_formats:
+            # Figures are built one at a time while the renderer works through the previous ones
+            figures = ((name, builder(*args)) for name, builder, args, _ in charts)
+            with ImageExporter() as exporter:
+                exporter.write_images(figures, os.path.join(self.output_dir, 'images'), image_formats)
         
         logger.info("All visualizations saved successfully!")
     